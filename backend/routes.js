@@ -1,195 +1,201 @@
 const express = require('express');
 const axios = require('axios');
+const http = require('http');
+const NodeCache = require('node-cache');
 
 const router = express.Router();
 
-router.get('/get_circuits', async (req, res) => {
-    try {
-        const response = await axios.get('http://localhost:8000/api/f1/get_circuits');
-        res.json(response.data);
-    } catch (err) {
-        console.error(err);
-        res.status(500).json({ error: 'Failed to fetch information from API' });
+// One pooled keep-alive connection set to the Flask service. Bodies are kept
+// as sent (compressed or not) and every status is handed back to the client
+const api = axios.create({
+    baseURL: process.env.F1_API_URL || 'http://localhost:8000/api/f1',
+    httpAgent: new http.Agent({ keepAlive: true, maxSockets: 64 }),
+    timeout: 30000,
+    responseType: 'arraybuffer',
+    decompress: false,
+    validateStatus: () => true,
+});
+
+// Responses keyed by encoding and upstream path, fresh for the upstream
+// max-age and kept a while longer so they can be revalidated with their ETag
+const REVALIDATE_WINDOW = 3600;
+const MAX_ENTRIES = parseInt(process.env.F1_PROXY_MAX_ENTRIES || '2000', 10);
+const cache = new NodeCache({ checkperiod: 120, useClones: false, maxKeys: MAX_ENTRIES });
+
+// Query parameters the Flask routes read; others are dropped so they can't
+// multiply cache entries
+const FORWARDED_PARAMS = ['format', 'sessions'];
+
+// Upstream response headers passed on to the client
+const PASSED_HEADERS = ['content-type', 'content-encoding', 'etag', 'last-modified', 'vary', 'x-data-stale'];
+
+// Upstream requests currently in flight, keyed like the cache
+const inFlight = new Map();
+
+function maxAge(headers) {
+    const cacheControl = headers['cache-control'] || '';
+    if (/no-cache|no-store|private/.test(cacheControl)) {
+        return 0;
+    }
+    const match = cacheControl.match(/max-age=(\d+)/);
+    return match ? parseInt(match[1], 10) : 0;
+}
+
+function encodingOf(req) {
+    const accepted = req.headers['accept-encoding'] || '';
+    if (/\bbr\b/.test(accepted)) {
+        return 'br';
+    }
+    return /\bgzip\b/.test(accepted) ? 'gzip' : 'identity';
+}
+
+function queryOf(req) {
+    const params = new URLSearchParams();
+    for (const name of FORWARDED_PARAMS) {
+        if (typeof req.query[name] === 'string') {
+            params.set(name, req.query[name]);
+        }
+    }
+    const query = params.toString();
+    return query ? `?${query}` : '';
+}
+
+async function fetchUpstream(key, path, encoding) {
+    const cached = cache.get(key);
+    const headers = { 'Accept-Encoding': encoding };
+    if (cached && cached.headers.etag) {
+        headers['If-None-Match'] = cached.headers.etag;
+    }
+    const response = await api.get(path, { headers });
+
+    let entry;
+    if (response.status === 304 && cached) {
+        entry = { ...cached, headers: { ...cached.headers } };
+        delete entry.headers['x-data-stale'];
+        if (response.headers['x-data-stale']) {
+            entry.headers['x-data-stale'] = response.headers['x-data-stale'];
+        }
+    } else if (response.status === 304) {
+        // Can only answer a revalidation; ask again without a validator
+        return fetchUpstream(key, path, encoding);
+    } else {
+        const passed = {};
+        for (const name of PASSED_HEADERS) {
+            if (response.headers[name]) {
+                passed[name] = response.headers[name];
+            }
+        }
+        entry = {
+            status: response.status,
+            body: Buffer.from(response.data),
+            headers: passed,
+            cacheControl: response.headers['cache-control'],
+        };
     }
-});
 
-router.get('/get_constructor_points/:year', async (req, res) => {
-    const { year } = req.params;
-    try {
-        const response = await axios.get(`http://localhost:8000/api/f1/get_constructor_points/${year}`);
-        res.json(response.data);
-    } catch (err) {
-        console.error(err);
-        res.status(500).json({ error: 'Failed to fetch information from API' });
+    const ttl = maxAge(response.headers);
+    entry.freshUntil = Date.now() + ttl * 1000;
+    if (entry.status === 200 && (ttl > 0 || entry.headers.etag)) {
+        try {
+            cache.set(key, entry, ttl + REVALIDATE_WINDOW);
+        } catch (err) {
+            // Full: serve without caching until entries expire
+        }
     }
-});
+    return entry;
+}
 
-router.get('/get_constructor_standings', async (req, res) => {
-    try {
-        const response = await axios.get('http://localhost:8000/api/f1/get_constructor_standings');
-        res.json(response.data);
-    } catch (err) {
-        console.error(err);
-        res.status(500).json({ error: 'Failed to fetch information from API' });
+function getCached(key, path, encoding) {
+    const cached = cache.get(key);
+    if (cached && Date.now() < cached.freshUntil) {
+        return Promise.resolve(cached);
     }
-});
 
-router.get('/get_constructor_stats', async (req, res) => {
-    try {
-        const response = await axios.get('http://localhost:8000/api/f1/get_constructor_stats');
-        res.json(response.data);
-    } catch (err) {
-        console.error(err);
-        res.status(500).json({ error: 'Failed to fetch information from API' });
+    // Identical requests share one upstream call
+    if (!inFlight.has(key)) {
+        inFlight.set(key, fetchUpstream(key, path, encoding).finally(() => inFlight.delete(key)));
     }
-});
+    return inFlight.get(key);
+}
 
-router.get('/get_driver_points/:year', async (req, res) => {
-    const { year } = req.params;
-    try {
-        const response = await axios.get(`http://localhost:8000/api/f1/get_driver_points/${year}`);
-        res.json(response.data);
-    } catch (err) {
-        console.error(err);
-        res.status(500).json({ error: 'Failed to fetch information from API' });
+function send(req, res, entry) {
+    res.set(entry.headers);
+    res.vary('Accept-Encoding');
+    if (entry.cacheControl) {
+        // Count down the max-age while the entry sits in this cache
+        const remaining = Math.max(Math.ceil((entry.freshUntil - Date.now()) / 1000), 0);
+        res.set('Cache-Control', entry.cacheControl.replace(/max-age=\d+/, `max-age=${remaining}`));
     }
-});
 
-router.get('/get_driver_standings', async (req, res) => {
-    try {
-        const response = await axios.get('http://localhost:8000/api/f1/get_driver_standings');
-        res.json(response.data);
-    } catch (err) {
-        console.error(err);
-        res.status(500).json({ error: 'Failed to fetch information from API' });
+    // The client already holds this representation
+    if (entry.status === 200 && req.fresh) {
+        res.status(304).end();
+        return;
     }
-});
+    res.status(entry.status).end(entry.body);
+}
 
-router.get('/get_driver_stats', async (req, res) => {
-    try {
-        const response = await axios.get('http://localhost:8000/api/f1/get_driver_stats');
-        res.json(response.data);
-    } catch (err) {
-        console.error(err);
-        res.status(500).json({ error: 'Failed to fetch information from API' });
-    }
-});
+function forward(path) {
+    return async (req, res) => {
+        const target = (typeof path === 'function' ? path(req.params) : path) + queryOf(req);
+        const encoding = encodingOf(req);
+        try {
+            send(req, res, await getCached(`${encoding} ${target}`, target, encoding));
+        } catch (err) {
+            console.error(err);
+            res.status(502).json({ error: 'Failed to fetch information from API' });
+        }
+    };
+}
 
-router.get('/get_drivers', async (req, res) => {
-    try {
-        const response = await axios.get('http://localhost:8000/api/f1/get_drivers');
-        res.json(response.data);
-    } catch (err) {
-        console.error(err);
-        res.status(500).json({ error: 'Failed to fetch information from API' });
-    }
-});
+router.get('/get_circuits', forward('/get_circuits'));
 
-router.get('/get_event/:year/:event', async (req, res) => {
-    const { year, event } = req.params;
-    try {
-        const response = await axios.get(`http://localhost:8000/api/f1/get_drivers/${year}/${event}`);
-        res.json(response.data);
-    } catch (err) {
-        console.error(err);
-        res.status(500).json({ error: 'Failed to fetch information from API' });
-    }
-});
+router.get('/get_constructor_points/:year', forward(({ year }) => `/get_constructor_points/${year}`));
 
-router.get('/get_next_event_countdown', async (req, res) => {
-    try {
-        const response = await axios.get('http://localhost:8000/api/f1/get_next_event_countdown');
-        res.json(response.data);
-    } catch (err) {
-        console.error(err);
-        res.status(500).json({ error: 'Failed to fetch information from API' });
-    }
-});
+router.get('/get_constructor_standings', forward('/get_constructor_standings'));
 
-router.get('/get_next_event', async (req, res) => {
-    try {
-        const response = await axios.get('http://localhost:8000/api/f1/get_next_event');
-        res.json(response.data);
-    } catch (err) {
-        console.error(err);
-        res.status(500).json({ error: 'Failed to fetch information from API' });
-    }
-});
+router.get('/get_constructor_stats', forward('/get_constructor_stats'));
 
-router.get('/get_previous_champions', async (req, res) => {
-    try {
-        const response = await axios.get('http://localhost:8000/api/f1/get_previous_champions');
-        res.json(response.data);
-    } catch (err) {
-        console.error(err);
-        res.status(500).json({ error: 'Failed to fetch information from API' });
-    }
-});
+router.get('/get_constructor_stats/:year', forward(({ year }) => `/get_constructor_stats/${year}`));
 
-router.get('/get_qualifying_results/:year/:round', async (req, res) => {
-    const { year, round } = req.params;
-    try {
-        const response = await axios.get(`http://localhost:8000/api/f1/get_qualifying_results/${year}/${round}`);
-        res.json(response.data);
-    } catch (err) {
-        console.error(err);
-        res.status(500).json({ error: 'Failed to fetch information from API' });
-    }
-});
+router.get('/get_constructor_career_stats', forward('/get_constructor_career_stats'));
 
-router.get('/get_race_calendar/:year', async (req, res) => {
-    const { year } = req.params;
-    try {
-        const response = await axios.get(`http://localhost:8000/api/f1/get_race_calendar/${year}`);
-        res.json(response.data);
-    } catch (err) {
-        console.error(err);
-        res.status(500).json({ error: 'Failed to fetch information from API' });
-    }
-});
+router.get('/get_constructor_career_stats/:constructorId', forward(({ constructorId }) => `/get_constructor_career_stats/${encodeURIComponent(constructorId)}`));
 
-router.get('/get_race_results/:year/:round', async (req, res) => {
-    const { year, round } = req.params;
-    try {
-        const response = await axios.get(`http://localhost:8000/api/f1/get_race_results/${year}/${round}`);
-        res.json(response.data);
-    } catch (err) {
-        console.error(err);
-        res.status(500).json({ error: 'Failed to fetch information from API' });
-    }
-});
+router.get('/get_driver_points/:year', forward(({ year }) => `/get_driver_points/${year}`));
 
+router.get('/get_driver_standings', forward('/get_driver_standings'));
 
-router.get('/get_recent_rWinners', async (req, res) => {
-    try {
-        const response = await axios.get('http://localhost:8000/api/f1/get_recent_rWinners');
-        res.json(response.data);
-    } catch (err) {
-        console.error(err);
-        res.status(500).json({ error: 'Failed to fetch information from API' });
-    }
-});
+router.get('/get_driver_stats', forward('/get_driver_stats'));
 
+router.get('/get_driver_stats/:year', forward(({ year }) => `/get_driver_stats/${year}`));
 
-router.get('/get_seasons', async (req, res) => {
-    try {
-        const response = await axios.get('http://localhost:8000/api/f1/get_seasons');
-        res.json(response.data);
-    } catch (err) {
-        console.error(err);
-        res.status(500).json({ error: 'Failed to fetch information from API' });
-    }
-});
+router.get('/get_driver_career_stats', forward('/get_driver_career_stats'));
 
-router.get('/get_sprint_results/:year/:round', async (req, res) => {
-    const { year, round } = req.params;
-    try {
-        const response = await axios.get(`http://localhost:8000/api/f1/get_sprint_results/${year}/${round}`);
-        res.json(response.data);
-    } catch (err) {
-        console.error(err);
-        res.status(500).json({ error: 'Failed to fetch information from API' });
-    }
-});
+router.get('/get_driver_career_stats/:driverId', forward(({ driverId }) => `/get_driver_career_stats/${encodeURIComponent(driverId)}`));
+
+router.get('/get_drivers', forward('/get_drivers'));
+
+router.get('/get_event/:year/:event', forward(({ year, event }) => `/get_drivers/${year}/${event}`));
+
+router.get('/get_next_event_countdown', forward('/get_next_event_countdown'));
+
+router.get('/get_next_event', forward('/get_next_event'));
+
+router.get('/get_previous_champions', forward('/get_previous_champions'));
+
+router.get('/get_qualifying_results/:year/:round', forward(({ year, round }) => `/get_qualifying_results/${year}/${round}`));
+
+router.get('/get_race_calendar/:year', forward(({ year }) => `/get_race_calendar/${year}`));
+
+router.get('/get_race_results/:year/:round', forward(({ year, round }) => `/get_race_results/${year}/${round}`));
+
+router.get('/get_recent_rWinners', forward('/get_recent_rWinners'));
+
+router.get('/get_seasons', forward('/get_seasons'));
+
+router.get('/get_sprint_results/:year/:round', forward(({ year, round }) => `/get_sprint_results/${year}/${round}`));
+
+router.get('/season/:year/results', forward(({ year }) => `/season/${year}/results`));
 
 module.exports = router;
@@ -0,0 +1,99 @@
+"""
+Compares the per-row cost of building result payloads with DataFrame.iterrows
+against the column-wise helpers in serialize.py, on synthetic race results.
+
+Usage:
+    python fastf1/benchmarks/bench_serialize.py [--rows 20 200 2000] [--repeat 50]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from serialize import column, dumps, floats, full_names, ints, records, texts  # noqa: E402
+
+
+def synthetic_results(rows, seed=0):
+    """Builds a race results frame shaped like the Ergast one."""
+    rng = np.random.default_rng(seed)
+    positions = np.arange(1, rows + 1, dtype=float)
+    positions[rng.random(rows) < 0.1] = np.nan
+    return pd.DataFrame({
+        "position": positions,
+        "givenName": [f"Driver{i}" for i in range(rows)],
+        "familyName": [f"Family{i}" for i in range(rows)],
+        "driverCode": [f"D{i:02d}"[:3] for i in range(rows)],
+        "constructorName": rng.choice(["Red Bull", "Ferrari", "Mercedes", "McLaren"], rows),
+        "laps": rng.integers(0, 70, rows).astype(float),
+        "raceTime": pd.to_timedelta(rng.integers(5000, 6000, rows), unit="s"),
+        "grid": rng.integers(0, 21, rows),
+        "points": rng.choice([25.0, 18.0, 15.0, 0.0], rows),
+    })
+
+
+def build_iterrows(df):
+    """The original row-by-row route code."""
+    results = []
+    for _, row in df.iterrows():
+        results.append({
+            "position": int(row["position"]) if pd.notna(row["position"]) else None,
+            "driver": f"{row.get('givenName', '')} {row.get('familyName', '')}".strip(),
+            "id": row.get("driverCode", ""),
+            "team": row.get("constructorName", ""),
+            "laps": int(row["laps"]) if pd.notna(row["laps"]) else None,
+            "time": str(row.get("raceTime")) if "raceTime" in row else None,
+            "grid": int(row["grid"]) if pd.notna(row["grid"]) else None,
+            "points": float(row["points"]) if pd.notna(row["points"]) else None,
+        })
+    return json.dumps(results).encode()
+
+
+def build_columnar(df):
+    """The column-wise route code."""
+    results = records(
+        position=ints(column(df, "position")),
+        driver=full_names(df),
+        id=texts(column(df, "driverCode", "")),
+        team=texts(column(df, "constructorName", "")),
+        laps=ints(column(df, "laps")),
+        time=texts(column(df, "raceTime")),
+        grid=ints(column(df, "grid")),
+        points=floats(column(df, "points")),
+    )
+    return dumps(results)
+
+
+def measure(build, df, repeat):
+    """Returns the median time per call in seconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        build(df)
+        timings.append(time.perf_counter() - started)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[20, 200, 2000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'rows':>6} {'iterrows us/row':>16} {'columnar us/row':>16} {'speedup':>8}")
+    for rows in args.rows:
+        df = synthetic_results(rows)
+        assert json.loads(build_iterrows(df)) == json.loads(build_columnar(df))
+        slow = measure(build_iterrows, df, args.repeat)
+        fast = measure(build_columnar, df, args.repeat)
+        print(f"{rows:>6} {slow / rows * 1e6:>16.2f} {fast / rows * 1e6:>16.2f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Recorded Ergast responses and FastF1 data for offline benchmarks.
+
+A fixture set lives in fixtures/<name>/:
+    manifest.json           recorded season, source and time of recording
+    ergast.json             Ergast path?query -> response body
+    schedules/<year>.json   FastF1 event schedules
+    sessions/<year>_<round>_<session>.json  FastF1 session results
+
+Frames are stored as JSON with their column dtypes, so a set does not depend
+on the pandas or FastF1 version that recorded it. Requests for the current
+season are answered with the recorded season, so routes that use
+datetime.now().year replay the same data in any year.
+"""
+
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+ERGAST_PREFIX = "/ergast/f1"
+
+
+def request_key(path, query=""):
+    """Canonical fixture key for an Ergast request path relative to the base URL."""
+    params = urlencode(sorted(parse_qsl(query)))
+    return f"{path}?{params}" if params else path
+
+
+def alias_year(year, recorded):
+    """Maps the current season onto the recorded one."""
+    return recorded if int(year) == datetime.now().year else int(year)
+
+
+def alias_path(path, recorded):
+    """Rewrites a current-season Ergast path to the recorded season."""
+    current = str(datetime.now().year)
+    parts = path.split("/")
+    if len(parts) > 1 and parts[1].split(".")[0] == current:
+        parts[1] = parts[1].replace(current, str(recorded), 1)
+    return "/".join(parts)
+
+
+def _encode_column(column):
+    """
+    Encodes a column as (dtype, JSON-compatible values). Timestamps keep their
+    UTC offset and durations are stored in seconds; missing values are null.
+    """
+
+    import pandas as pd
+
+    if pd.api.types.is_timedelta64_dtype(column):
+        return str(column.dtype), [None if pd.isna(v) else v.total_seconds() for v in column]
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return str(column.dtype), [None if pd.isna(v) else v.isoformat() for v in column]
+    if column.dtype == object and column.map(lambda v: isinstance(v, pd.Timestamp)).any():
+        # FastF1 keeps local session times, each with its own offset, as objects
+        return "timestamp", [None if pd.isna(v) else v.isoformat() for v in column]
+    return str(column.dtype), [None if pd.isna(v) else v for v in column.tolist()]
+
+
+def _decode_column(dtype, values):
+    """Reverses _encode_column."""
+
+    import pandas as pd
+
+    if dtype == "timestamp":
+        return pd.Series([pd.NaT if v is None else pd.Timestamp(v) for v in values], dtype=object)
+    if dtype.startswith("timedelta64"):
+        return pd.to_timedelta(pd.Series(values, dtype=float), unit="s")
+    if dtype.startswith("datetime64"):
+        parsed = pd.to_datetime(pd.Series(values, dtype=object), utc="," in dtype)
+        return parsed.dt.tz_convert(dtype.split(", ")[1].rstrip("]")) if "," in dtype else parsed
+    return pd.Series(values, dtype=object if dtype == "object" else None).astype(dtype)
+
+
+class Fixtures:
+    """A recorded fixture set, read from or written to disk."""
+
+    def __init__(self, root, year, ergast=None, source=None):
+        self.root = Path(root)
+        self.year = year
+        self.ergast = ergast if ergast is not None else {}
+        self.source = source
+
+    @classmethod
+    def load(cls, name):
+        root = FIXTURES_DIR / name
+        if not (root / "manifest.json").exists():
+            raise FileNotFoundError(f"No fixtures in {root}; record them with record_fixtures.py")
+        manifest = json.loads((root / "manifest.json").read_text())
+        ergast = json.loads((root / "ergast.json").read_text())
+        return cls(root, manifest["year"], ergast, manifest.get("source"))
+
+    def save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "year": self.year,
+            "source": self.source,
+            "recordedAt": datetime.now().isoformat(timespec="seconds"),
+        }
+        (self.root / "manifest.json").write_text(json.dumps(manifest, indent=2))
+        (self.root / "ergast.json").write_text(json.dumps(self.ergast, indent=0, sort_keys=True))
+
+    def _path(self, kind, name):
+        return self.root / kind / f"{name}.json"
+
+    def save_frame(self, kind, name, df):
+        columns = []
+        for column in df.columns:
+            dtype, values = _encode_column(df[column])
+            columns.append({"name": column, "dtype": dtype, "values": values})
+        path = self._path(kind, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"columns": columns}, indent=1))
+
+    def load_frame(self, kind, name):
+        import pandas as pd
+
+        path = self._path(kind, name)
+        if not path.exists():
+            raise ValueError(f"No recorded {kind} fixture {name}")
+        columns = json.loads(path.read_text())["columns"]
+        return pd.DataFrame({column["name"]: _decode_column(column["dtype"], column["values"]) for column in columns})
+
+
+class StubErgast:
+    """
+    Local HTTP server answering Ergast requests from a fixture set and
+    counting them. Unrecorded requests get a 404.
+    """
+
+    def __init__(self, fixtures):
+        self.fixtures = fixtures
+        self.calls = 0
+        self.misses = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlsplit(self.path)
+                path = alias_path(url.path[len(ERGAST_PREFIX):], stub.fixtures.year)
+                body = stub.fixtures.ergast.get(request_key(path, url.query))
+                stub.calls += 1
+                if body is None:
+                    stub.misses.append(self.path)
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                data = body.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}{ERGAST_PREFIX}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, name="stub-ergast", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+
+
+class _Session:
+    """Stands in for a loaded FastF1 session; only results are recorded."""
+
+    def __init__(self, results):
+        self.results = results
+
+    def load(self, **kwargs):
+        pass
+
+
+class FastF1Stub:
+    """
+    Replaces FastF1's schedule, event and session loaders with recorded
+    data and counts the calls.
+    """
+
+    def __init__(self, fixtures):
+        self.fixtures = fixtures
+        self.calls = 0
+
+    def get_event_schedule(self, year, include_testing=False, **kwargs):
+        from fastf1.events import EventSchedule
+
+        self.calls += 1
+        year = alias_year(year, self.fixtures.year)
+        return EventSchedule(self.fixtures.load_frame("schedules", year), year=year)
+
+    def get_event(self, year, gp, **kwargs):
+        schedule = self.get_event_schedule(year)
+        if isinstance(gp, int) or str(gp).isdigit():
+            return schedule.get_event_by_round(int(gp))
+        return schedule.get_event_by_name(gp)
+
+    def get_session(self, year, gp, identifier=None, **kwargs):
+        self.calls += 1
+        name = f"{alias_year(year, self.fixtures.year)}_{gp}_{identifier}"
+        return _Session(self.fixtures.load_frame("sessions", name))
+
+    def install(self, fastf1):
+        fastf1.get_event_schedule = self.get_event_schedule
+        fastf1.get_event = self.get_event
+        fastf1.get_session = self.get_session
+        return self
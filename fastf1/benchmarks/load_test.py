@@ -0,0 +1,187 @@
+"""
+Measures throughput and latency of the API under concurrent load, either
+against a running server or by starting the dev server and gunicorn in turn.
+
+Usage:
+    python fastf1/benchmarks/load_test.py --url http://localhost:8000
+    python fastf1/benchmarks/load_test.py --compare [--workers 4 --threads 4] [--synthetic]
+
+Each client thread keeps one HTTP/1.1 connection open and cycles through the
+paths for the given duration. With --synthetic the servers get their data
+from the made-up season in synthetic.py instead of Ergast and FastF1.
+"""
+
+import argparse
+import http.client
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BENCHMARKS = Path(__file__).resolve().parent
+SRC = BENCHMARKS.parent / "src"
+
+YEAR = datetime.now().year
+DEFAULT_PATHS = [
+    f"/api/f1/get_race_calendar/{YEAR}",
+    f"/api/f1/get_driver_points/{YEAR}",
+    f"/api/f1/get_constructor_points/{YEAR}",
+    "/api/f1/get_driver_standings",
+    "/api/f1/get_constructor_standings",
+    "/api/f1/get_circuits",
+    "/api/f1/get_seasons",
+]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+def run_load(url, paths, concurrency, duration):
+    """
+    Hammers the server and returns throughput and latency figures.
+
+    Returns:
+        dict: requests, errors, rps and latency percentiles in milliseconds.
+    """
+
+    target = urlsplit(url)
+    latencies, errors = [], []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(offset):
+        conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=60)
+        mine, failed, i = [], 0, offset
+        while time.perf_counter() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                conn.request("GET", path, headers={"Accept-Encoding": "gzip"})
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 500:
+                    failed += 1
+                mine.append(time.perf_counter() - started)
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=60)
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+            errors.append(failed)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors),
+        "rps": len(latencies) / elapsed,
+        "p50": percentile(latencies, 0.50) * 1000,
+        "p95": percentile(latencies, 0.95) * 1000,
+        "p99": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def wait_ready(url, timeout=120):
+    target = urlsplit(url)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=5)
+            conn.request("GET", "/healthz")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"{url} did not become ready")
+
+
+def start_server(kind, port, workers, threads, ergast_url=None):
+    env = {**os.environ, "F1_BIND": f"127.0.0.1:{port}", "F1_WORKERS": str(workers), "F1_THREADS": str(threads)}
+    prelude = f"import sys; sys.path.insert(0, {str(SRC)!r}); "
+    cwd = SRC
+    if ergast_url:
+        # Fresh caches in a scratch directory, data from the synthetic season
+        env["ERGAST_BASE_URL"] = ergast_url
+        prelude += f"sys.path.insert(0, {str(BENCHMARKS)!r}); import fastf1, synthetic; synthetic.install(fastf1); "
+        cwd = Path(tempfile.mkdtemp(prefix="f1-load-"))
+        (cwd / "cache" / "fastf1").mkdir(parents=True)
+
+    if kind == "dev":
+        # Same Flask dev server as app.py, without the reloader
+        code = f"from app import app; app.run(port={port}, threaded=True)"
+    else:
+        config = str(SRC / "gunicorn.conf.py")
+        code = f"from gunicorn.app.wsgiapp import run; sys.argv = ['gunicorn', '-c', {config!r}, 'wsgi:app']; run()"
+    command = [sys.executable, "-c", prelude + code]
+    return subprocess.Popen(command, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def report(name, result):
+    print(
+        f"{name:>10} {result['requests']:>8} {result['errors']:>6} {result['rps']:>9.1f} "
+        f"{result['p50']:>8.1f} {result['p95']:>8.1f} {result['p99']:>8.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Server to load, e.g. http://localhost:8000")
+    parser.add_argument("--compare", action="store_true", help="Start the dev server and gunicorn and load both")
+    parser.add_argument("--paths", nargs="+", default=DEFAULT_PATHS)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--warmup", type=float, default=5, help="Seconds of unmeasured load first")
+    parser.add_argument("--port", type=int, default=8050)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--synthetic", action="store_true", help="Serve the synthetic season instead of upstream data")
+    args = parser.parse_args()
+
+    if not args.url and not args.compare:
+        parser.error("give --url or --compare")
+
+    print(f"{'server':>10} {'requests':>8} {'errors':>6} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    if args.url:
+        run_load(args.url, args.paths, args.concurrency, args.warmup)
+        report("url", run_load(args.url, args.paths, args.concurrency, args.duration))
+        return
+
+    ergast_url = None
+    if args.synthetic:
+        import synthetic
+
+        ergast_url = synthetic.SyntheticErgast().start().base_url
+
+    url = f"http://127.0.0.1:{args.port}"
+    for kind in ["dev", "gunicorn"]:
+        server = start_server(kind, args.port, args.workers, args.threads, ergast_url)
+        try:
+            wait_ready(url)
+            run_load(url, args.paths, args.concurrency, args.warmup)
+            report(kind, run_load(url, args.paths, args.concurrency, args.duration))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Records the Ergast responses and FastF1 data every endpoint needs for one
+season, for offline replay by run_benchmarks.py. Needs network access,
+unless --synthetic records the made-up season from synthetic.py instead
+(that is how the committed "synthetic" set was made). The manifest names
+the source either way.
+
+Usage:
+    python fastf1/benchmarks/record_fixtures.py --year 2024 [--name recorded] [--synthetic]
+
+Pick a finished season so the recorded data no longer changes. Routes for
+the current season are served the recorded one, both here and on replay.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from urllib.parse import urlsplit
+
+from fixtures import FIXTURES_DIR, Fixtures, alias_path, alias_year, request_key
+from run_benchmarks import SRC, endpoint_paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--year", type=int, required=True)
+    parser.add_argument("--round", type=int, default=1, help="Round used for per-round endpoints")
+    parser.add_argument("--name", default="recorded")
+    parser.add_argument("--synthetic", action="store_true", help="Record the synthetic season, no network")
+    args = parser.parse_args()
+
+    fixtures = Fixtures(FIXTURES_DIR / args.name, args.year)
+
+    # Start from empty caches so every upstream request goes over the wire
+    os.chdir(tempfile.mkdtemp(prefix="f1-record-"))
+    os.makedirs("cache/fastf1")
+    os.environ.pop("ERGAST_BASE_URL", None)
+    sys.path.insert(0, str(SRC))
+
+    import fastf1
+    import fastf1.ergast.interface
+    import pandas as pd
+    import requests.adapters
+
+    if args.synthetic:
+        import synthetic
+
+        synthetic.install(fastf1)
+        os.environ["ERGAST_BASE_URL"] = synthetic.SyntheticErgast().start().base_url
+        fastf1.ergast.interface.BASE_URL = os.environ["ERGAST_BASE_URL"]
+
+    fixtures.source = "synthetic.py" if args.synthetic else fastf1.ergast.interface.BASE_URL
+    base_path = urlsplit(fastf1.ergast.interface.BASE_URL).path
+    send = requests.adapters.HTTPAdapter.send
+
+    def recording_send(self, request, **kwargs):
+        url = urlsplit(request.url)
+        if not request.url.startswith(fastf1.ergast.interface.BASE_URL):
+            return send(self, request, **kwargs)
+
+        path = alias_path(url.path[len(base_path):], args.year)
+        request.url = url._replace(path=base_path + path).geturl()
+        response = send(self, request, **kwargs)
+        if response.status_code == 200:
+            fixtures.ergast[request_key(path, url.query)] = response.text
+        return response
+
+    requests.adapters.HTTPAdapter.send = recording_send
+
+    get_event_schedule, get_event, get_session = fastf1.get_event_schedule, fastf1.get_event, fastf1.get_session
+
+    def recording_schedule(year, include_testing=False, **kwargs):
+        year = alias_year(year, args.year)
+        schedule = get_event_schedule(year, include_testing=include_testing, **kwargs)
+        fixtures.save_frame("schedules", str(year), schedule)
+        return schedule
+
+    def recording_session(year, gp, identifier=None, **kwargs):
+        # Record every session as it is loaded, results only
+        year = alias_year(year, args.year)
+        session = get_session(year, gp, identifier, **kwargs)
+        load = session.load
+
+        def recording_load(**load_kwargs):
+            load(**load_kwargs)
+            fixtures.save_frame("sessions", f"{year}_{gp}_{identifier}", pd.DataFrame(session.results))
+
+        session.load = recording_load
+        return session
+
+    fastf1.get_event_schedule = recording_schedule
+    fastf1.get_event = lambda year, gp, **kwargs: get_event(alias_year(year, args.year), gp, **kwargs)
+    fastf1.get_session = recording_session
+
+    from app import app
+
+    client = app.test_client()
+    for path in endpoint_paths(app, args.year, args.round):
+        status = client.get(path).status_code
+        print(f"{status} {path}")
+
+    fixtures.save()
+    print(f"Recorded {len(fixtures.ergast)} Ergast responses to {fixtures.root}")
+
+
+if __name__ == "__main__":
+    main()
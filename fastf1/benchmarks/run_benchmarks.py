@@ -0,0 +1,236 @@
+"""
+Offline benchmark of every endpoint, replaying recorded fixtures through a
+local stub Ergast server (see record_fixtures.py). No network is used.
+
+Each cold sample runs in a fresh process with empty caches; warm samples
+repeat the request in that process afterwards. Reports latency
+percentiles, peak traced memory of a cold request and upstream calls
+(Ergast requests and FastF1 loads) per endpoint.
+
+Usage:
+    python fastf1/benchmarks/run_benchmarks.py [--name synthetic] [--cold 5] [--warm 50]
+        [--only get_driver_points] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Extra query variants benchmarked next to the plain routes
+QUERY_VARIANTS = {
+    "/api/f1/get_driver_points/<int:year>": ["?format=compact"],
+    "/api/f1/get_constructor_points/<int:year>": ["?format=compact"],
+}
+# Values filled into the other path arguments
+PATH_ARGS = {"<driver_id>": "hamilton", "<constructor_id>": "ferrari"}
+SKIPPED_RULES = {"/static/<path:filename>", "/healthz", "/metrics", "/admin/cache-stats"}
+
+
+def endpoint_paths(app, year, round_):
+    """
+    Lists a concrete request path for every registered route.
+
+    Args:
+        app (flask.Flask): The API.
+        year (int): Season to fill into <year>.
+        round_ (int): Round to fill into <round>.
+
+    Returns:
+        list[str]: Request paths, sorted.
+    """
+
+    paths = []
+    for rule in app.url_map.iter_rules():
+        if rule.rule in SKIPPED_RULES:
+            continue
+        path = rule.rule.replace("<int:year>", str(year)).replace("<int:round>", str(round_))
+        for arg, value in PATH_ARGS.items():
+            path = path.replace(arg, value)
+        paths.append(path)
+        paths.extend(path + query for query in QUERY_VARIANTS.get(rule.rule, []))
+    return sorted(paths)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return None
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+# ------------------------------------------------------------------
+# Worker: one fresh process per cold sample
+# ------------------------------------------------------------------
+
+
+def _replay_app(name):
+    """
+    Imports the API in an empty cache directory, wired to the stub Ergast
+    server and the recorded FastF1 data.
+
+    Returns:
+        tuple: (app, fixtures, StubErgast, FastF1Stub)
+    """
+
+    from fixtures import FastF1Stub, Fixtures, StubErgast
+
+    fixtures = Fixtures.load(name)
+    os.chdir(tempfile.mkdtemp(prefix="f1-bench-"))
+    os.makedirs("cache/fastf1")
+
+    ergast = StubErgast(fixtures).start()
+    os.environ["ERGAST_BASE_URL"] = ergast.base_url
+    os.environ.pop("F1_LAZY_INIT", None)
+    sys.path.insert(0, str(SRC))
+
+    import fastf1
+
+    loaders = FastF1Stub(fixtures).install(fastf1)
+    from app import app
+
+    return app, fixtures, ergast, loaders
+
+
+def list_paths(name, round_):
+    app, fixtures, _, _ = _replay_app(name)
+    print(json.dumps(endpoint_paths(app, fixtures.year, round_)))
+
+
+def run_worker(name, path, warm, trace_memory):
+    app, _, ergast, loaders = _replay_app(name)
+    client = app.test_client()
+    calls_before = (ergast.calls, loaders.calls)
+
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    response = client.get(path)
+    cold = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    tracemalloc.stop()
+    cold_calls = (ergast.calls - calls_before[0], loaders.calls - calls_before[1])
+
+    warm_samples = []
+    for _ in range(warm):
+        started = time.perf_counter()
+        client.get(path)
+        warm_samples.append(time.perf_counter() - started)
+
+    print(json.dumps({
+        "status": response.status_code,
+        "cold": cold,
+        "warm": warm_samples,
+        "peakBytes": peak,
+        "coldErgastCalls": cold_calls[0],
+        "coldFastf1Calls": cold_calls[1],
+        "warmErgastCalls": ergast.calls - calls_before[0] - cold_calls[0],
+        "warmFastf1Calls": loaders.calls - calls_before[1] - cold_calls[1],
+        "unrecorded": ergast.misses,
+    }))
+
+
+def _run_worker(*args):
+    command = [sys.executable, str(Path(__file__).resolve()), "--worker", *args]
+    output = subprocess.run(command, capture_output=True, text=True, cwd=Path(__file__).parent)
+    if output.returncode != 0:
+        raise RuntimeError(f"Benchmark worker {args} failed:\n{output.stderr}")
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def sample(name, path, warm, trace_memory):
+    args = ["--name", name, "--path", path, "--warm", str(warm)]
+    return _run_worker(*args, "--trace-memory") if trace_memory else _run_worker(*args)
+
+
+# ------------------------------------------------------------------
+# Driver
+# ------------------------------------------------------------------
+
+
+def benchmark(name, path, cold_runs, warm):
+    """
+    Collects cold and warm samples for one endpoint.
+
+    Returns:
+        dict: Status, latency percentiles (ms), peak memory (MiB) and upstream calls.
+    """
+
+    # Memory tracing slows requests down, so it gets its own cold run
+    traced = sample(name, path, 0, True)
+    runs = [sample(name, path, warm if i == 0 else 0, False) for i in range(cold_runs)]
+    cold = [run["cold"] for run in runs]
+    warm_samples = runs[0]["warm"]
+
+    ms = lambda value: round(value * 1000, 2) if value is not None else None  # noqa: E731
+    return {
+        "path": path,
+        "status": runs[0]["status"],
+        "coldP50": ms(percentile(cold, 0.50)),
+        "coldMax": ms(max(cold)),
+        "warmP50": ms(percentile(warm_samples, 0.50)),
+        "warmP95": ms(percentile(warm_samples, 0.95)),
+        "warmP99": ms(percentile(warm_samples, 0.99)),
+        "peakMiB": round(traced["peakBytes"] / 2**20, 2),
+        "coldErgastCalls": runs[0]["coldErgastCalls"],
+        "coldFastf1Calls": runs[0]["coldFastf1Calls"],
+        "warmErgastCalls": runs[0]["warmErgastCalls"],
+        "warmFastf1Calls": runs[0]["warmFastf1Calls"],
+        "unrecorded": runs[0]["unrecorded"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--name", default="synthetic", help="Fixture set under fixtures/")
+    parser.add_argument("--cold", type=int, default=5, help="Cold samples (fresh processes) per endpoint")
+    parser.add_argument("--warm", type=int, default=50, help="Warm samples per endpoint")
+    parser.add_argument("--round", type=int, default=1)
+    parser.add_argument("--only", nargs="+", help="Only paths containing one of these strings")
+    parser.add_argument("--json", help="Also write the results to this file")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    parser.add_argument("--trace-memory", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        if args.path:
+            run_worker(args.name, args.path, args.warm, args.trace_memory)
+        else:
+            list_paths(args.name, args.round)
+        return
+
+    paths = _run_worker("--name", args.name, "--round", str(args.round))
+    if args.only:
+        paths = [path for path in paths if any(part in path for part in args.only)]
+
+    print(
+        f"{'endpoint':<48} {'st':>3} {'cold p50':>9} {'cold max':>9} {'warm p50':>9} {'warm p95':>9} "
+        f"{'warm p99':>9} {'peak MiB':>9} {'cold up':>8} {'warm up':>8}"
+    )
+    results = []
+    for path in paths:
+        result = benchmark(args.name, path, args.cold, args.warm)
+        results.append(result)
+        print(
+            f"{path:<48} {result['status']:>3} {result['coldP50']:>9} {result['coldMax']:>9} "
+            f"{result['warmP50']:>9} {result['warmP95']:>9} {result['warmP99']:>9} {result['peakMiB']:>9} "
+            f"{result['coldErgastCalls'] + result['coldFastf1Calls']:>8} "
+            f"{result['warmErgastCalls'] + result['warmFastf1Calls']:>8}"
+        )
+        if result["unrecorded"]:
+            print(f"    {len(result['unrecorded'])} unrecorded Ergast requests, e.g. {result['unrecorded'][0]}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+A small made-up season served in the Ergast and FastF1 formats, so fixture
+sets (and the tests built on them) can be recorded without network access:
+
+    python fastf1/benchmarks/record_fixtures.py --synthetic --year 2024 --name synthetic
+
+Every season has the same three rounds (the second a sprint weekend), four
+drivers and two constructors; finishing orders rotate from round to round.
+"""
+
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pandas as pd
+
+ERGAST_PREFIX = "/ergast/f1"
+FIRST_SEASON = 1950
+
+CONSTRUCTORS = {
+    "red_bull": ("Red Bull", "Austrian", "3671C6"),
+    "ferrari": ("Ferrari", "Italian", "E8002D"),
+}
+
+# driverId, number, code, given name, family name, nationality, country, constructorId
+DRIVERS = [
+    ("max_verstappen", 1, "VER", "Max", "Verstappen", "Dutch", "NED", "red_bull"),
+    ("perez", 11, "PER", "Sergio", "Perez", "Mexican", "MEX", "red_bull"),
+    ("leclerc", 16, "LEC", "Charles", "Leclerc", "Monegasque", "MON", "ferrari"),
+    ("hamilton", 44, "HAM", "Lewis", "Hamilton", "British", "GBR", "ferrari"),
+]
+
+# circuitId, circuit name, locality, country, event name, event format
+ROUNDS = [
+    ("bahrain", "Bahrain International Circuit", "Sakhir", "Bahrain", "Bahrain Grand Prix", "conventional"),
+    ("shanghai", "Shanghai International Circuit", "Shanghai", "China", "Chinese Grand Prix", "sprint_qualifying"),
+    ("monza", "Autodromo Nazionale di Monza", "Monza", "Italy", "Italian Grand Prix", "conventional"),
+]
+
+RACE_POINTS = [25, 18, 15, 12]
+SPRINT_POINTS = [8, 7, 6, 5]
+SESSION_NAMES = {
+    "conventional": ["Practice 1", "Practice 2", "Practice 3", "Qualifying", "Race"],
+    "sprint_qualifying": ["Practice 1", "Sprint Qualifying", "Sprint", "Qualifying", "Race"],
+}
+
+
+def race_date(year, round_):
+    """Race start (UTC): every other Sunday from early March."""
+    return datetime(year, 3, 3, 15, tzinfo=timezone.utc) + timedelta(weeks=2 * (round_ - 1))
+
+
+def order(year, round_, session):
+    """Drivers in finishing order for a session."""
+    shift = round_ - 1 + (1 if session == "qualifying" else 0) + (2 if session == "sprint" else 0) + year
+    return DRIVERS[shift % len(DRIVERS):] + DRIVERS[:shift % len(DRIVERS)]
+
+
+def _lap(seconds):
+    minutes, rest = divmod(seconds, 60)
+    return f"{int(minutes)}:{rest:06.3f}"
+
+
+# ------------------------------------------------------------------
+# Ergast
+# ------------------------------------------------------------------
+
+
+def _driver(driver):
+    driver_id, number, code, given, family, nationality, _, _ = driver
+    return {
+        "driverId": driver_id, "permanentNumber": str(number), "code": code,
+        "url": f"http://en.wikipedia.org/wiki/{given}_{family}", "givenName": given,
+        "familyName": family, "dateOfBirth": "1990-01-01", "nationality": nationality,
+    }
+
+
+def _constructor(constructor_id):
+    name, nationality, _ = CONSTRUCTORS[constructor_id]
+    return {
+        "constructorId": constructor_id, "url": f"http://en.wikipedia.org/wiki/{name.replace(' ', '_')}",
+        "name": name, "nationality": nationality,
+    }
+
+
+def _circuit(round_):
+    circuit_id, name, locality, country, _, _ = ROUNDS[round_ - 1]
+    return {
+        "circuitId": circuit_id, "url": f"http://en.wikipedia.org/wiki/{name.replace(' ', '_')}",
+        "circuitName": name, "Location": {"lat": "0.0", "long": "0.0", "locality": locality, "country": country},
+    }
+
+
+def _race(year, round_):
+    start = race_date(year, round_)
+    race = {
+        "season": str(year), "round": str(round_),
+        "url": f"http://en.wikipedia.org/wiki/{year}_{ROUNDS[round_ - 1][4].replace(' ', '_')}",
+        "raceName": ROUNDS[round_ - 1][4], "Circuit": _circuit(round_),
+        "date": start.strftime("%Y-%m-%d"), "time": start.strftime("%H:%M:%SZ"),
+    }
+    qualifying = start - timedelta(days=1)
+    race["Qualifying"] = {"date": qualifying.strftime("%Y-%m-%d"), "time": qualifying.strftime("%H:%M:%SZ")}
+    return race
+
+
+def _results(year, round_, session):
+    rows = []
+    for i, driver in enumerate(order(year, round_, session)):
+        row = {"number": str(driver[1]), "position": str(i + 1), "Driver": _driver(driver),
+               "Constructor": _constructor(driver[7])}
+        if session == "qualifying":
+            row.update(Q1=_lap(91 + i * 0.2), Q2=_lap(90.5 + i * 0.2), Q3=_lap(90 + i * 0.2))
+        else:
+            points = (RACE_POINTS if session == "race" else SPRINT_POINTS)[i]
+            retired = session == "race" and i == len(DRIVERS) - 1 and round_ == 2
+            row.update(
+                positionText="R" if retired else str(i + 1), points=str(points if not retired else 0),
+                grid=str(i + 1), laps=str(57 if session == "race" else 19),
+                status="Engine" if retired else "Finished",
+            )
+            if not retired:
+                millis = 5400000 + i * 5000 if session == "race" else 1800000 + i * 2000
+                row["Time"] = {"millis": str(millis), "time": _lap(millis / 1000)}
+        rows.append(row)
+    return rows
+
+
+def _standings(year, kind):
+    """Standings after the last round, from the race and sprint points."""
+    points, wins = {}, {}
+    for round_ in range(1, len(ROUNDS) + 1):
+        for session in ("race", "sprint") if ROUNDS[round_ - 1][5] != "conventional" else ("race",):
+            for result in _results(year, round_, session):
+                key = result["Driver"]["driverId"] if kind == "drivers" else result["Constructor"]["constructorId"]
+                points[key] = points.get(key, 0) + float(result["points"])
+                wins[key] = wins.get(key, 0) + (session == "race" and result["position"] == "1")
+
+    by_id = {driver[0]: driver for driver in DRIVERS}
+    rows = []
+    for i, key in enumerate(sorted(points, key=lambda key: (-points[key], key))):
+        row = {"position": str(i + 1), "positionText": str(i + 1), "points": f"{points[key]:g}", "wins": str(wins[key])}
+        if kind == "drivers":
+            row.update(Driver=_driver(by_id[key]), Constructors=[_constructor(by_id[key][7])])
+        else:
+            row["Constructor"] = _constructor(key)
+        rows.append(row)
+    return rows
+
+
+def ergast_body(path, query):
+    """
+    Builds the Ergast response for a request path relative to the base URL,
+    e.g. "/2024/1/results.json", or None for an unknown request.
+    """
+
+    params = dict(parse_qsl(query))
+    limit, offset = int(params.get("limit", 30)), int(params.get("offset", 0))
+    parts = path.strip("/").removesuffix(".json").split("/")
+    endpoint, selectors = parts[-1], parts[:-1]
+    year = int(selectors[0]) if selectors else None
+    round_ = int(selectors[1]) if len(selectors) > 1 else None
+    rounds = [round_] if round_ else list(range(1, len(ROUNDS) + 1))
+
+    if endpoint == "seasons":
+        items = [{"season": str(season), "url": f"http://en.wikipedia.org/wiki/{season}_Formula_One_season"}
+                 for season in range(FIRST_SEASON, datetime.now().year + 1)]
+        table, key = {}, ("SeasonTable", "Seasons")
+    elif endpoint == "circuits":
+        items = [_circuit(rnd) for rnd in range(1, len(ROUNDS) + 1)]
+        table, key = {}, ("CircuitTable", "Circuits")
+    elif endpoint == "races" and year:
+        items = [_race(year, rnd) for rnd in rounds]
+        table, key = {"season": str(year)}, ("RaceTable", "Races")
+    elif endpoint in ("results", "sprint", "qualifying") and year:
+        session = {"results": "race"}.get(endpoint, endpoint)
+        field = {"race": "Results", "sprint": "SprintResults", "qualifying": "QualifyingResults"}[session]
+        races = [(rnd, _results(year, rnd, session)) for rnd in rounds
+                 if session != "sprint" or ROUNDS[rnd - 1][5] != "conventional"]
+
+        # Paging counts result rows; a race can be split across two pages
+        flat = [(rnd, row) for rnd, rows in races for row in rows]
+        page, grouped = flat[offset:offset + limit], {}
+        for rnd, row in page:
+            grouped.setdefault(rnd, []).append(row)
+        body = {"season": str(year), "Races": [{**_race(year, rnd), field: rows} for rnd, rows in grouped.items()]}
+        if round_:
+            body["round"] = str(round_)
+        return _mrdata(path, limit, offset, len(flat), {"RaceTable": body})
+    elif endpoint in ("driverStandings", "constructorStandings") and year:
+        kind = "drivers" if endpoint == "driverStandings" else "constructors"
+        field = "DriverStandings" if kind == "drivers" else "ConstructorStandings"
+        items = [{"season": str(year), "round": str(len(ROUNDS)), field: _standings(year, kind)}]
+        table, key = {"season": str(year), "round": str(len(ROUNDS))}, ("StandingsTable", "StandingsLists")
+        return _mrdata(path, limit, offset, len(items[0][field]), {key[0]: {**table, key[1]: items}})
+    else:
+        return None
+
+    return _mrdata(path, limit, offset, len(items), {key[0]: {**table, key[1]: items[offset:offset + limit]}})
+
+
+def _mrdata(path, limit, offset, total, table):
+    return json.dumps({"MRData": {
+        "xmlns": "", "series": "f1", "url": f"https://api.jolpi.ca{ERGAST_PREFIX}{path}",
+        "limit": str(limit), "offset": str(offset), "total": str(total), **table,
+    }})
+
+
+class SyntheticErgast:
+    """Local HTTP server answering Ergast requests for the synthetic season."""
+
+    def __init__(self):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlsplit(self.path)
+                body = ergast_body(url.path[len(ERGAST_PREFIX):], url.query)
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                data = body.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}{ERGAST_PREFIX}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, name="synthetic-ergast", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+
+
+# ------------------------------------------------------------------
+# FastF1
+# ------------------------------------------------------------------
+
+
+def event_schedule(year):
+    """The season's FastF1 event schedule."""
+    from fastf1.events import EventSchedule
+
+    rows = []
+    for round_, (_, _, locality, country, name, event_format) in enumerate(ROUNDS, start=1):
+        race = race_date(year, round_)
+        dates = [race - timedelta(days=2, hours=4), race - timedelta(days=2), race - timedelta(days=1, hours=4),
+                 race - timedelta(days=1), race]
+        row = {
+            "RoundNumber": round_, "Country": country, "Location": locality,
+            "OfficialEventName": f"FORMULA 1 {name.upper()} {year}", "EventDate": pd.Timestamp(race.date()),
+            "EventName": name, "EventFormat": event_format, "F1ApiSupport": True,
+        }
+        for i, (session, date) in enumerate(zip(SESSION_NAMES[event_format], dates), start=1):
+            row[f"Session{i}"] = session
+            row[f"Session{i}Date"] = pd.Timestamp(date)
+            row[f"Session{i}DateUtc"] = pd.Timestamp(date).tz_localize(None)
+        rows.append(row)
+    return EventSchedule(pd.DataFrame(rows), year=year)
+
+
+def session_results(year, round_, session):
+    """Results of a FastF1 session ("R", "Q" or "S")."""
+    name = {"R": "race", "Q": "qualifying", "S": "sprint"}.get(session, "race")
+    rows = []
+    for i, (driver_id, number, code, given, family, _, country, constructor_id) in enumerate(order(year, round_, name)):
+        team, _, color = CONSTRUCTORS[constructor_id]
+        rows.append({
+            "DriverNumber": str(number), "BroadcastName": f"{given[0]} {family.upper()}", "Abbreviation": code,
+            "DriverId": driver_id, "TeamName": team, "TeamColor": color, "TeamId": constructor_id,
+            "FirstName": given, "LastName": family, "FullName": f"{given} {family}", "HeadshotUrl": "",
+            "CountryCode": country, "Position": float(i + 1), "ClassifiedPosition": str(i + 1),
+            "GridPosition": float(i + 1), "Status": "Finished",
+            "Points": float(RACE_POINTS[i] if name == "race" else SPRINT_POINTS[i] if name == "sprint" else 0),
+        })
+    return pd.DataFrame(rows)
+
+
+class _Session:
+    def __init__(self, year, round_, session):
+        self.year, self.round, self.session = year, round_, session
+        self.results = None
+
+    def load(self, **kwargs):
+        self.results = session_results(self.year, self.round, self.session)
+
+
+def install(fastf1):
+    """Replaces FastF1's schedule, event and session loaders with the synthetic season."""
+
+    def get_event(year, gp, **kwargs):
+        schedule = event_schedule(year)
+        if isinstance(gp, int) or str(gp).isdigit():
+            return schedule.get_event_by_round(int(gp))
+        return schedule.get_event_by_name(gp)
+
+    fastf1.get_event_schedule = lambda year, include_testing=False, **kwargs: event_schedule(year)
+    fastf1.get_event = get_event
+    fastf1.get_session = lambda year, gp, identifier=None, **kwargs: _Session(year, int(gp), identifier)
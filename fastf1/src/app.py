@@ -1,27 +1,154 @@
 import importlib
+import logging
+import os
 import pkgutil
+import time
 from pathlib import Path
-from flask import Flask, Blueprint
-import fastf1
+from flask import Flask, Blueprint, Response, jsonify, request
+from metrics import TimedJSONProvider, finish_request, instrument_view, render_prometheus, start_request
+from startup import HEALTH_PATH, DeferredLoader, report, startup_report
+
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+app.json = TimedJSONProvider(app)
 
 # Path to the routes folder
 routes_path = Path(__file__).parent / "routes"
 
-# Iterate over all Python files in routes folder
-for module_info in pkgutil.iter_modules([str(routes_path)]):
-    module_name = module_info.name
-    module_path = f"routes.{module_name}"
+# Import routes (and the heavy libraries behind them) in the background
+LAZY_INIT = os.environ.get("F1_LAZY_INIT") == "1"
+
+# Operational endpoints: not timed per phase, and never touch Ergast (so they
+# don't force the caches to load with F1_LAZY_INIT=1)
+INTERNAL_ENDPOINTS = {"static", "healthz", "metrics", "cache_stats"}
+
+# Seconds between checks of the Ergast expiry policy
+POLICY_CHECK_INTERVAL = 60
+_next_policy_check = 0.0
+
+
+def load_routes():
+    """
+    Imports every route module and registers its blueprints, recording how
+    long each import took in the startup report.
+    """
+    started = time.perf_counter()
+
+    # Iterate over all Python files in routes folder
+    for module_info in pkgutil.iter_modules([str(routes_path)]):
+        module_name = module_info.name
+        module_path = f"routes.{module_name}"
+
+        # Import the module dynamically
+        module_started = time.perf_counter()
+        module = importlib.import_module(module_path)
+        startup_report["modules"][module_path] = round(time.perf_counter() - module_started, 3)
+
+        # Register all Blueprint instances
+        for attr_name in dir(module):
+            attr = getattr(module, attr_name)
+            if isinstance(attr, Blueprint):
+                app.register_blueprint(attr)
+
+    # Time every route's compute and serialize phases
+    for endpoint, view in list(app.view_functions.items()):
+        if endpoint not in INTERNAL_ENDPOINTS:
+            app.view_functions[endpoint] = instrument_view(endpoint, view)
+
+    startup_report["routesSeconds"] = round(time.perf_counter() - started, 3)
+    logger.info("Loaded %d route modules in %.2fs", len(startup_report["modules"]), startup_report["routesSeconds"])
+
+
+# Registered first so they enclose every other hook
+app.before_request(start_request)
+app.after_request(finish_request)
+
+
+@app.before_request
+def refresh_ttl_policy():
+    # Keep the Ergast expiry rules in line with the race calendar
+    global _next_policy_check
+    if request.endpoint in INTERNAL_ENDPOINTS or time.monotonic() < _next_policy_check:
+        return
+    _next_policy_check = time.monotonic() + POLICY_CHECK_INTERVAL
+
+    from ttl import refresh_expiry_policy
+    refresh_expiry_policy()
+
+
+@app.before_request
+def conditional_request():
+    # 304 for a still-fresh ETag the client already holds, without running the view
+    from httpcache import answer_not_modified
+    return answer_not_modified()
+
+
+@app.after_request
+def http_cache_headers(response):
+    # ETag, Last-Modified, Cache-Control, compression and 304s for every route
+    from httpcache import add_cache_headers
+    return add_cache_headers(response)
+
+
+@app.after_request
+def stale_data_headers(response):
+    # Runs before http_cache_headers: flags payloads built from stale Ergast
+    # responses and shortens their max-age
+    from upstream import flag_stale
+    return flag_stale(response)
+
+
+# Optional shared secret for the admin endpoints, sent as X-Admin-Token
+ADMIN_TOKEN = os.environ.get("F1_ADMIN_TOKEN")
+
+
+@app.route("/metrics")
+def metrics():
+    from upstream import render_prometheus as render_upstream
+    body = render_prometheus() + render_upstream()
+    return Response(body, mimetype="text/plain; version=0.0.4", headers={"Cache-Control": "no-store"})
+
+
+@app.route("/admin/cache-stats")
+def cache_stats():
+    # Upstream requests per cache wrapper and the in-memory tiers in front of them
+    if ADMIN_TOKEN and request.headers.get("X-Admin-Token") != ADMIN_TOKEN:
+        return jsonify({"error": "Forbidden"}), 403, {"Cache-Control": "no-store"}
+
+    from cache import lru_stats
+    from upstream import stats
+    return jsonify({"upstream": stats(), "memory": lru_stats()}), 200, {"Cache-Control": "no-store"}
+
+
+@app.route(HEALTH_PATH)
+def healthz():
+    return jsonify({"ready": True, "startup": report()}), 200, {"Cache-Control": "no-store"}
+
+
+if LAZY_INIT:
+    app.wsgi_app = DeferredLoader(app.wsgi_app, load_routes)
+else:
+    load_routes()
+
+
+def start_cache_warmer():
+    """Starts the background cache warmer when F1_CACHE_WARMER=1."""
+    if os.environ.get("F1_CACHE_WARMER") == "1":
+        from warmer import CacheWarmer
+        CacheWarmer(app).start()
+
 
-    # Import the module dynamically
-    module = importlib.import_module(module_path)
+def start_history_builder():
+    """Starts indexing every season since 1950 in the background when F1_HISTORY_BUILD=1."""
+    if os.environ.get("F1_HISTORY_BUILD") == "1":
+        from history import HistoryBuilder
+        HistoryBuilder().start()
 
-    # Register all Blueprint instances
-    for attr_name in dir(module):
-        attr = getattr(module, attr_name)
-        if isinstance(attr, Blueprint):
-            app.register_blueprint(attr)
 
 if __name__ == "__main__":
+    # With the reloader on, only warm caches from the serving child process
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_cache_warmer()
+        start_history_builder()
     app.run(port=8000, debug=True)
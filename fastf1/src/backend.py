@@ -0,0 +1,186 @@
+import logging
+import os
+import pickle
+import threading
+import time
+from contextlib import contextmanager
+from lru import LRUCache, sizeof
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------
+# Shared cache backend
+# ------------------------------------------------------------------
+
+# memory:// (per process, the default), redis://host:port/db or
+# unix:///path/to/redis.sock for a store shared by every worker on the host
+CACHE_URL = os.environ.get("F1_CACHE_URL", "memory://")
+
+# Key namespace in a shared store
+KEY_PREFIX = "f1:"
+
+# Budget of the in-process backend
+MEMORY_MAX_BYTES = int(os.environ.get("F1_SHARED_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+
+# A cross-process lock is renewed while its holder runs and expires this long
+# after the holder stopped (e.g. crashed); others wait up to LOCK_WAIT for it
+LOCK_TIMEOUT = 30
+LOCK_RENEW_INTERVAL = LOCK_TIMEOUT / 3
+LOCK_WAIT = 300
+
+_MISSING = object()
+
+
+class MemoryBackend:
+    """
+    In-process backend: a size-bounded LRU with per-entry expiry and
+    per-key thread locks, dropped once nobody holds or waits for them.
+    Values are stored as they are.
+    """
+
+    def __init__(self, max_bytes=MEMORY_MAX_BYTES):
+        self._entries = LRUCache(max_bytes, sizeof=lambda entry: sizeof(entry[0]))
+        self._locks = {}  # name -> [lock, number of holders and waiters]
+        self._locks_guard = threading.Lock()
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        if expires_at is not None and time.time() >= expires_at:
+            self._entries.pop(key)
+            return default
+        return value
+
+    def set(self, key, value, ttl=None):
+        self._entries.set(key, (value, time.time() + ttl if ttl is not None else None))
+
+    def delete_prefix(self, prefix):
+        for key in self._entries.keys():
+            if key.startswith(prefix):
+                self._entries.pop(key)
+
+    @contextmanager
+    def lock(self, name):
+        with self._locks_guard:
+            entry = self._locks.setdefault(name, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._locks_guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[name]
+
+
+class RedisBackend:
+    """
+    Backend on a Redis-compatible server, shared by every worker process.
+    Values are pickled; locks are Redis locks so only one process computes
+    a given key at a time. A lock is renewed by its holder, so one left by a
+    crashed worker frees up after LOCK_TIMEOUT.
+    """
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key, default=None):
+        data = self.client.get(KEY_PREFIX + key)
+        return pickle.loads(data) if data is not None else default
+
+    def set(self, key, value, ttl=None):
+        ttl = max(int(ttl), 1) if ttl is not None else None
+        self.client.set(KEY_PREFIX + key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), ex=ttl)
+
+    def delete_prefix(self, prefix):
+        keys = list(self.client.scan_iter(match=f"{KEY_PREFIX}{prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+    @contextmanager
+    def lock(self, name):
+        with self.client.lock(f"{KEY_PREFIX}lock:{name}", timeout=LOCK_TIMEOUT, blocking_timeout=LOCK_WAIT) as lock:
+            done = threading.Event()
+            threading.Thread(target=self._renew, args=(lock, done), name="redis-lock-renew", daemon=True).start()
+            try:
+                yield
+            finally:
+                done.set()
+
+    @staticmethod
+    def _renew(lock, done):
+        while not done.wait(LOCK_RENEW_INTERVAL):
+            try:
+                lock.reacquire()
+            except Exception:
+                logger.warning("Could not renew Redis lock %s", lock.name, exc_info=True)
+                return
+
+
+def _create_backend(url):
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        try:
+            return RedisBackend(url)
+        except ImportError:
+            logger.warning("F1_CACHE_URL=%s needs the redis package, using the in-process cache", url)
+    return MemoryBackend()
+
+
+backend = _create_backend(CACHE_URL)
+
+
+def get_or_compute(key, fn, *args, ttl=None, cache_if=None, **kwargs):
+    """
+    Returns the cached value for key, computing and storing it on a miss.
+    Only one thread or worker process computes a given key at a time; the
+    others wait and then read its result.
+
+    Args:
+        key (str): Cache key.
+        fn (Callable): Computation run on a miss.
+        ttl (float, optional): Seconds to keep the value; None keeps it until evicted.
+        cache_if (Callable, optional): Predicate on the computed value; values
+            it rejects are returned without being stored.
+
+    Returns:
+        The cached or computed value.
+    """
+
+    value = backend.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    with backend.lock(key):
+        value = backend.get(key, _MISSING)
+        if value is _MISSING:
+            value = fn(*args, **kwargs)
+            if cache_if is None or cache_if(value):
+                backend.set(key, value, ttl)
+        return value
+
+
+def requests_cache_backend(namespace, keep_expired=3600):
+    """
+    Returns a requests-cache backend for HTTP responses: Redis when the
+    shared backend is Redis, so workers don't contend on one SQLite file,
+    and SQLite otherwise.
+
+    Args:
+        namespace (str): Key namespace of the responses in Redis.
+        keep_expired (int): Seconds Redis keeps a response past its expiry, so
+            it can still be served stale. SQLite keeps them until overwritten.
+
+    Returns:
+        requests_cache.RedisCache | str: Backend instance, or "sqlite".
+    """
+
+    if isinstance(backend, RedisBackend):
+        from requests_cache import RedisCache
+
+        return RedisCache(namespace=f"{KEY_PREFIX}{namespace}", connection=backend.client, ttl_offset=keep_expired)
+    return "sqlite"
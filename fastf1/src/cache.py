@@ -1,73 +1,338 @@
-import fastf1
-from fastf1.ergast import Ergast
-from joblib import Memory
-import requests_cache
+import os
+import threading
+import time
+from functools import wraps
+from backend import requests_cache_backend
+from lru import LRUCache, lru_tier
+from metrics import span, timed
+from singleflight import SingleFlight
+import upstream
+from upstream import accounted, attributed
 
 # ------------------------------------------------------------------
 # Setup caching
 # ------------------------------------------------------------------
 
-# FastF1 raw data cache (sessions, events, telemetry, laps)
-fastf1.Cache.enable_cache("./cache/fastf1")
+# FastF1, requests-cache, joblib and the Ergast client are imported and set up
+# by init_cache(): at import time by default, or on first use with F1_LAZY_INIT=1
+LAZY_INIT = os.environ.get("F1_LAZY_INIT") == "1"
 
-# Requests cache for Ergast API calls (SQLite, 24h expiry)
-requests_cache.install_cache("./cache/ergast", expire_after=86400)
+# Requests cache for Ergast API calls (SQLite, 24h default expiry; per-season
+# expiry rules are applied through set_ergast_expiry, see ttl.py)
+ERGAST_EXPIRE_AFTER = 86400
 
-# Ergast instance
-ergast = Ergast(result_type="pandas", auto_cast=True)
+# Expired Ergast responses are served right away for this long past their
+# expiry while a background request refreshes them; after that the request
+# waits for Ergast, and falls back to the expired response if Ergast fails
+ERGAST_STALE_WHILE_REVALIDATE = int(os.environ.get("F1_STALE_WHILE_REVALIDATE", str(7 * 86400)))
+ERGAST_STALE_SETTINGS = {"stale_if_error": True, "stale_while_revalidate": ERGAST_STALE_WHILE_REVALIDATE}
 
-# Joblib Memory for caching processed function results
-memory = Memory("./cache/joblib", verbose=0)
+# Upper bound on in-flight Ergast requests across all threads
+ERGAST_MAX_CONCURRENCY = int(os.environ.get("ERGAST_MAX_CONCURRENCY", "4"))
+_ergast_slots = threading.BoundedSemaphore(ERGAST_MAX_CONCURRENCY)
+
+# Page size for season-wide Ergast queries (the API caps it at 100)
+ERGAST_PAGE_LIMIT = 100
+
+# In-memory LRU budget per function, kept in front of the joblib disk cache
+LRU_MAX_BYTES = int(os.environ.get("F1_LRU_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Loaded FastF1 sessions kept in memory, bounded by count
+SESSION_LRU_MAX_ENTRIES = int(os.environ.get("F1_SESSION_LRU_MAX_ENTRIES", "8"))
+_loaded_sessions = LRUCache(SESSION_LRU_MAX_ENTRIES, sizeof=lambda session: 1)
+_session_loads = SingleFlight()
+
+# Set by init_cache()
+fastf1 = None
+requests_cache = None
+memory = None
+ergast = None
+init_seconds = None
+_init_lock = threading.Lock()
+
+
+def init_cache():
+    """
+    Imports the heavy dependencies and sets up every cache and the Ergast
+    client. Safe to call repeatedly; only the first call does any work.
+    """
+
+    global fastf1, requests_cache, memory, ergast, init_seconds
+    if ergast is not None:
+        return
+
+    with _init_lock:
+        if ergast is not None:
+            return
+        started = time.perf_counter()
+
+        import fastf1
+        import fastf1.ergast.interface
+        import requests_cache
+        from fastf1.ergast import Ergast
+        from joblib import Memory
+
+        # Count cache hits, misses and upstream traffic per wrapper, and
+        # coalesce background refreshes of stale responses
+        upstream.install(requests_cache.session.CacheMixin, _ergast_slots)
+
+        # FastF1 raw data cache (sessions, events, telemetry, laps). FastF1 sends
+        # its Ergast requests through this session too, so it shares the Redis
+        # store with the global cache when F1_CACHE_URL points at one
+        fastf1.Cache.enable_cache("./cache/fastf1")
+        session = fastf1.Cache._requests_session_cached
+        if session is not None:
+            for name, value in ERGAST_STALE_SETTINGS.items():
+                setattr(session.settings, name, value)
+            shared = requests_cache_backend("fastf1", keep_expired=ERGAST_STALE_WHILE_REVALIDATE)
+            if shared != "sqlite":
+                session.cache.close()
+                session.cache = shared
+
+        # SQLite at ./cache/ergast, or the shared Redis store when F1_CACHE_URL points at one
+        requests_cache.install_cache(
+            "./cache/ergast",
+            backend=requests_cache_backend("ergast", keep_expired=ERGAST_STALE_WHILE_REVALIDATE),
+            expire_after=ERGAST_EXPIRE_AFTER,
+            **ERGAST_STALE_SETTINGS,
+        )
+
+        # Joblib Memory for caching processed function results
+        memory = Memory("./cache/joblib", verbose=0)
+
+        # Ergast instance, optionally pointed at another server (e.g. a local stub)
+        if os.environ.get("ERGAST_BASE_URL"):
+            fastf1.ergast.interface.BASE_URL = os.environ["ERGAST_BASE_URL"].rstrip("/")
+        ergast = Ergast(result_type="pandas", auto_cast=True)
+
+        init_seconds = time.perf_counter() - started
+
+
+def _disk_cached(func):
+    """joblib disk cache, bound to the Memory created by init_cache on first call."""
+    cached = None
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        nonlocal cached
+        if cached is None:
+            init_cache()
+            cached = memory.cache(func)
+        return cached(*args, **kwargs)
+
+    return wrapper
+
+
+def set_ergast_expiry(urls_expire_after):
+    """
+    Applies per-URL expiry rules to every requests-cache session that serves Ergast.
+
+    Args:
+        urls_expire_after (dict): URL pattern -> expiry, as accepted by requests-cache.
+    """
+
+    init_cache()
+    requests_cache.install_cache(
+        backend=requests_cache.get_cache(),
+        expire_after=ERGAST_EXPIRE_AFTER,
+        urls_expire_after=urls_expire_after,
+        **ERGAST_STALE_SETTINGS,
+    )
+
+    # FastF1 sends Ergast requests through its own cached session
+    session = getattr(fastf1.Cache, "_requests_session_cached", None)
+    if session is not None:
+        session.settings.urls_expire_after = urls_expire_after
+
+
+def reset_connections():
+    """
+    Closes the connections of the Ergast response caches so a forked worker
+    opens its own instead of sharing the parent's file handles or sockets.
+    """
+
+    if ergast is None:
+        return
+    requests_cache.get_cache().close()
+    session = getattr(fastf1.Cache, "_requests_session_cached", None)
+    if session is not None:
+        session.cache.close()
+
+
+def reset_after_fork():
+    """
+    Prepares a forked worker: opens its own cache connections and replaces
+    the state inherited from the master process, whose background threads
+    (and the Ergast slots they held) do not exist in the child.
+    """
+
+    global _ergast_slots
+    _ergast_slots = threading.BoundedSemaphore(ERGAST_MAX_CONCURRENCY)
+    reset_connections()
+    upstream.reset_after_fork(_ergast_slots)
 
 
 # ------------------------------------------------------------------
 # FastF1 wrappers
 # ------------------------------------------------------------------
-@memory.cache
+@timed
+@accounted
+@lru_tier(LRU_MAX_BYTES)
+@_disk_cached
 def get_event_cached(year, gp):
     return fastf1.get_event(year, gp)
 
 
-@memory.cache
+@timed
+@accounted
+@lru_tier(LRU_MAX_BYTES)
+@_disk_cached
 def get_event_schedule_cached(year, include_testing=False):
     return fastf1.get_event_schedule(year, include_testing=include_testing)
 
 
-@memory.cache
-def get_session_cached(year, round, session):
-    return fastf1.get_session(year, round, session)
+@timed
+@accounted
+def get_session_cached(year, round, session, laps=False, telemetry=False, weather=False, messages=False):
+    """
+    Returns a loaded FastF1 session, reusing sessions this process already parsed.
+    Sessions are keyed by what was loaded, so a results-only load never pays
+    for laps or telemetry.
+    """
+    key = (year, round, session, laps, telemetry, weather, messages)
+    loaded = _loaded_sessions.get(key)
+    if loaded is None:
+        loaded = _session_loads.do(key, _load_session, *key)
+    return loaded
+
+
+def _load_session(year, round, session, laps, telemetry, weather, messages):
+    init_cache()
+    loaded = fastf1.get_session(year, round, session)
+    loaded.load(laps=laps, telemetry=telemetry, weather=weather, messages=messages)
+    _loaded_sessions.set((year, round, session, laps, telemetry, weather, messages), loaded)
+    return loaded
+
+
+def lru_stats():
+    """Returns the in-memory tier counters of every two-tier cached function."""
+    return {
+        "get_event_cached": get_event_cached.cache.stats(),
+        "get_event_schedule_cached": get_event_schedule_cached.cache.stats(),
+        "get_session_cached": _loaded_sessions.stats(),
+    }
 
 
 # ------------------------------------------------------------------
 # Ergast wrappers (requests-cache handles caching)
 # ------------------------------------------------------------------
+def _ergast_call(func):
+    """
+    Holds one of the shared Ergast concurrency slots for the duration of the
+    call, timing the wait for a slot and the call itself and attributing its
+    upstream requests to the wrapper.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        init_cache()
+        with span("ergast_slot_wait"):
+            _ergast_slots.acquire()
+        try:
+            with span(func.__name__), attributed(func.__name__):
+                return func(*args, **kwargs)
+        finally:
+            _ergast_slots.release()
+
+    return wrapper
+
+
+@_ergast_call
 def get_circuits_cached(limit):
     return ergast.get_circuits(limit=limit)
 
 
+@_ergast_call
 def get_race_results_cached(season, round_):
     return ergast.get_race_results(season=season, round=round_)
 
 
+@_ergast_call
 def get_race_schedule_cached(season):
     return ergast.get_race_schedule(season=season)
 
 
+@_ergast_call
 def get_sprint_results_cached(season, round_):
     return ergast.get_sprint_results(season=season, round=round_)
 
 
+@_ergast_call
 def get_constructor_standings_cached(season):
     return ergast.get_constructor_standings(season=season)
 
 
+@_ergast_call
 def get_driver_standings_cached(season):
     return ergast.get_driver_standings(season=season)
 
 
+@_ergast_call
 def get_seasons_cached(limit):
     return ergast.get_seasons(limit=limit)
 
 
+@_ergast_call
 def get_qualifying_results_cached(season, round_):
     return ergast.get_qualifying_results(season=season, round=round_)
+
+
+# ------------------------------------------------------------------
+# Season-wide Ergast results
+# ------------------------------------------------------------------
+def _all_pages(response):
+    """
+    Follows Ergast pagination and flattens every page into one frame.
+
+    Args:
+        response (ErgastMultiResponse): First page of a season-wide query.
+
+    Returns:
+        pd.DataFrame: Results of all races, with a 'round' column.
+    """
+
+    import pandas as pd
+
+    frames = []
+    while True:
+        # A race can be split across two pages; each page describes its own races
+        for rnd, df in zip(response.description["round"], response.content):
+            if not df.empty:
+                frames.append(df.assign(round=int(rnd)))
+        if response.is_complete:
+            break
+        try:
+            response = response.get_next_result_page()
+        except ValueError:  # past the last page
+            break
+
+    return pd.concat(frames, ignore_index=True, sort=False) if frames else pd.DataFrame()
+
+
+@_ergast_call
+def get_season_race_results_cached(season):
+    return _all_pages(ergast.get_race_results(season=season, limit=ERGAST_PAGE_LIMIT))
+
+
+@_ergast_call
+def get_season_sprint_results_cached(season):
+    return _all_pages(ergast.get_sprint_results(season=season, limit=ERGAST_PAGE_LIMIT))
+
+
+@_ergast_call
+def get_season_qualifying_results_cached(season):
+    return _all_pages(ergast.get_qualifying_results(season=season, limit=ERGAST_PAGE_LIMIT))
+
+
+if not LAZY_INIT:
+    init_cache()
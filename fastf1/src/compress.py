@@ -0,0 +1,109 @@
+import gzip
+import os
+import zlib
+from flask import request
+from lru import LRUCache
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is always available
+    brotli = None
+
+# ------------------------------------------------------------------
+# Response compression
+# ------------------------------------------------------------------
+
+# Bodies smaller than this are sent as they are
+COMPRESS_MIN_BYTES = 512
+COMPRESS_MIMETYPES = {"application/json", "text/plain", "text/html"}
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Compressed bodies keyed by (ETag, encoding), so unchanged payloads are only
+# compressed once
+COMPRESSED_MAX_BYTES = int(os.environ.get("F1_COMPRESSED_MAX_BYTES", str(16 * 1024 * 1024)))
+_compressed = LRUCache(COMPRESSED_MAX_BYTES, sizeof=len)
+
+
+def _encode(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _gzip_stream(chunks):
+    """Gzips a streamed body chunk by chunk."""
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def negotiate():
+    """
+    Picks the best encoding the client accepts.
+
+    Returns:
+        str | None: "br", "gzip" or None for identity.
+    """
+
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def compress_response(response):
+    """
+    Compresses a response body with gzip or brotli according to
+    Accept-Encoding. The ETag gets an encoding suffix, as the compressed
+    representation differs from the identity one.
+
+    Args:
+        response (flask.Response): Outgoing response.
+
+    Returns:
+        flask.Response: The response, compressed when worthwhile.
+    """
+
+    response.vary.add("Accept-Encoding")
+    if (
+        response.status_code != 200
+        or response.mimetype not in COMPRESS_MIMETYPES
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    # Streamed bodies are gzipped on the fly
+    if response.is_streamed:
+        if request.accept_encodings["gzip"]:
+            response.response = _gzip_stream(response.iter_encoded())
+            response.headers.pop("Content-Length", None)
+            response.headers["Content-Encoding"] = "gzip"
+        return response
+
+    encoding = negotiate()
+    if encoding is None:
+        return response
+
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+
+    etag, weak = response.get_etag()
+    key = (etag, encoding)
+    data = _compressed.get(key) if etag else None
+    if data is None:
+        data = _encode(body, encoding)
+        if etag:
+            _compressed.set(key, data)
+
+    response.set_data(data)
+    response.headers["Content-Encoding"] = encoding
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak=weak)
+    return response
@@ -0,0 +1,63 @@
+import fcntl
+import multiprocessing
+import os
+import threading
+
+# ------------------------------------------------------------------
+# Gunicorn settings (gunicorn -c gunicorn.conf.py wsgi:app)
+# ------------------------------------------------------------------
+
+bind = os.environ.get("F1_BIND", "0.0.0.0:8000")
+
+# Pre-fork workers, each serving requests from a thread pool; most time is
+# spent waiting on Ergast or disk, so threads go a long way
+workers = int(os.environ.get("F1_WORKERS", str(multiprocessing.cpu_count() * 2 + 1)))
+threads = int(os.environ.get("F1_THREADS", "4"))
+worker_class = "gthread"
+
+# Import routes, pandas, FastF1 and the current schedule once in the master
+preload_app = True
+
+# Cold FastF1 session loads can take a while
+timeout = int(os.environ.get("F1_WORKER_TIMEOUT", "120"))
+keepalive = 5
+
+# Recycle workers now and then to bound memory growth of the in-process caches
+max_requests = int(os.environ.get("F1_MAX_REQUESTS", "5000"))
+max_requests_jitter = 500
+
+accesslog = "-"
+
+
+# Only the worker holding this lock runs the cache warmer and history
+# builder; the others wait on it and one takes over once the holder exits
+background_lock = os.environ.get("F1_BACKGROUND_LOCK", "./cache/background.lock")
+_background_lock_file = None
+
+
+def _run_background_jobs():
+    global _background_lock_file
+    from app import start_cache_warmer, start_history_builder
+
+    os.makedirs(os.path.dirname(background_lock) or ".", exist_ok=True)
+    lock_file = open(background_lock, "a")
+    fcntl.flock(lock_file, fcntl.LOCK_EX)
+    # Held for the rest of this worker's life, released by the OS when it exits
+    _background_lock_file = lock_file
+
+    # F1_CACHE_WARMER=1; materialized payloads it invalidates are dropped by
+    # every worker, upstream results are shared through the disk caches
+    start_cache_warmer()
+
+    # F1_HISTORY_BUILD=1; the history index is shared on disk
+    start_history_builder()
+
+
+def post_fork(server, worker):
+    from cache import reset_after_fork
+
+    # Own SQLite connections, and none of the master's in-flight refreshes
+    reset_after_fork()
+
+    if os.environ.get("F1_CACHE_WARMER") == "1" or os.environ.get("F1_HISTORY_BUILD") == "1":
+        threading.Thread(target=_run_background_jobs, name="background-jobs", daemon=True).start()
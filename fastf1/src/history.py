@@ -0,0 +1,508 @@
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+import pandas as pd
+from cache import get_event_schedule_cached, get_race_schedule_cached
+from season import STAT_COLUMNS, build_season_results, completed_rounds, constructor_flags, driver_flags, get_season_results
+from store import read_frame, stored_rounds, write_frame
+from ttl import FIRST_SEASON
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; locks then only cover this process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------
+# Historical stats index
+# ------------------------------------------------------------------
+
+# Results table (one file per season), per-season aggregates and a manifest
+# of the indexed rounds
+HISTORY_DIR = Path("./cache/history")
+MANIFEST = HISTORY_DIR / "manifest.json"
+
+# Version of that layout; an index saved in another one is built again
+LAYOUT = 2
+
+# Compact column types of the results table: one row per driver per session
+RESULT_TYPES = {
+    "year": "int16",
+    "round": "int8",
+    "session": "category",
+    "driverId": "category",
+    "constructorId": "category",
+    "position": "float32",
+    "grid": "float32",
+    "points": "float32",
+    "dnf": "bool",
+    "retired": "bool",
+}
+
+# Per-season and career aggregates: the season stats counters, points and
+# races started
+AGGREGATE_COLUMNS = [*STAT_COLUMNS, "points", "races"]
+FLAGS = {"drivers": driver_flags, "constructors": constructor_flags}
+
+# Pause after each season the builder had to fetch from Ergast (about a dozen
+# requests), keeping it well below the API's hourly request limit
+BUILD_SEASON_INTERVAL = int(os.environ.get("F1_HISTORY_SEASON_INTERVAL", "240"))
+
+# How often the builder retries failed seasons and adds the current season's
+# latest rounds
+BUILD_RETRY_INTERVAL = 3600
+
+_index = None
+_version = None
+_lock = threading.RLock()
+
+
+@contextmanager
+def _file_lock(name, blocking=True):
+    """
+    Lock shared by every process using HISTORY_DIR. Yields whether it was
+    acquired, which is always the case when blocking.
+    """
+
+    HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+    with open(HISTORY_DIR / f"{name}.lock", "w") as f:
+        if fcntl is None:
+            yield True
+            return
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def compact_results(year, results):
+    """
+    Reduces a season frame to the columns and types of the results table.
+
+    Args:
+        year (int): Season.
+        results (pd.DataFrame): Long-form frame from build_season_results.
+
+    Returns:
+        pd.DataFrame: Rows of the results table for that season.
+    """
+
+    table = results.reindex(columns=list(RESULT_TYPES)).assign(year=year)
+    for name in ("round", "position", "grid", "points"):
+        table[name] = pd.to_numeric(table[name], errors="coerce")
+    table = table.dropna(subset=["round"])
+    table[["dnf", "retired"]] = table[["dnf", "retired"]].fillna(False)
+    return table.astype(RESULT_TYPES)
+
+
+def season_aggregates(year, table, flags_for):
+    """
+    Aggregates one season of the results table per driver or constructor.
+    Seasons without qualifying results count race grid P1 as pole.
+
+    Args:
+        year (int): Season.
+        table (pd.DataFrame): That season's rows of the results table.
+        flags_for (Callable): driver_flags or constructor_flags.
+
+    Returns:
+        pd.DataFrame: 'year', 'id' and AGGREGATE_COLUMNS, one row per driver or
+            constructor with a race or sprint result.
+    """
+
+    flags = flags_for(table).assign(round=table["round"])
+    # Ergast only covers qualifying fully from 2003: in a season without any
+    # qualifying results, the race grid P1 counts as pole
+    if not (table["session"] == "qualifying").any():
+        flags["poles"] = (table["session"] == "race") & (table["grid"] == 1)
+    flags["id"] = flags["id"].astype(str)
+    grouped = flags.groupby("id")
+
+    stats = grouped[STAT_COLUMNS].sum().astype("int32")
+    stats["points"] = grouped["points"].sum().astype(float)
+    raced = flags[flags["raced"]].groupby("id")["round"].nunique()
+    stats["races"] = raced.reindex(stats.index, fill_value=0).astype("int32")
+
+    started = flags.loc[table["session"].isin(["race", "sprint"]).to_numpy(), "id"]
+    stats = stats.loc[stats.index.isin(started)]
+    return stats.reset_index().assign(year=year)[["year", "id", *AGGREGATE_COLUMNS]]
+
+
+def careers(per_season):
+    """
+    Rolls per-season aggregates up into career totals.
+
+    Args:
+        per_season (pd.DataFrame): Output of season_aggregates for many seasons.
+
+    Returns:
+        pd.DataFrame: 'id', AGGREGATE_COLUMNS, 'seasons', 'firstSeason' and
+            'lastSeason', most wins first.
+    """
+
+    grouped = per_season.groupby("id")
+    career = grouped[AGGREGATE_COLUMNS].sum()
+    career["seasons"] = grouped["year"].size()
+    career["firstSeason"] = grouped["year"].min()
+    career["lastSeason"] = grouped["year"].max()
+    career = career.reset_index()
+    return career.sort_values(["wins", "points", "id"], ascending=[False, False, True], ignore_index=True)
+
+
+def _empty_aggregates():
+    return pd.DataFrame({"year": pd.Series(dtype="int16"), "id": pd.Series(dtype=object)}).assign(
+        **{name: pd.Series(dtype=float if name == "points" else "int32") for name in AGGREGATE_COLUMNS}
+    )
+
+
+def _by_points(frame):
+    return frame.sort_values(["points", "wins", "id"], ascending=[False, False, True], ignore_index=True)
+
+
+def _concat(kept, added):
+    # Skip an empty side so it doesn't decide the column types
+    if kept.empty:
+        return added.reset_index(drop=True)
+    return pd.concat([kept, added], ignore_index=True)
+
+
+class HistoryIndex:
+    """
+    Per-season and career aggregates for drivers and constructors of every
+    indexed season since 1950. The compact results table they are built from
+    is written to disk one season at a time and never held in memory as a
+    whole. Instances are never modified: adding a season returns a new
+    index, in which only that season was aggregated again.
+    """
+
+    def __init__(self, seasons, aggregates):
+        self.seasons = seasons  # year -> {"rounds": [...], "complete": bool}
+        self.aggregates = aggregates  # kind -> per-season aggregates
+        self.careers = {kind: careers(frame) for kind, frame in aggregates.items()}
+
+    @classmethod
+    def empty(cls):
+        return cls({}, {kind: _empty_aggregates() for kind in FLAGS})
+
+    @classmethod
+    def load(cls, root):
+        if not (root / MANIFEST.name).exists():
+            return cls.empty()
+        manifest = json.loads((root / MANIFEST.name).read_text())
+        if manifest.get("layout") != LAYOUT or not manifest["seasons"]:
+            return cls.empty()
+        seasons = {int(year): season for year, season in manifest["seasons"].items()}
+        aggregates = {kind: read_frame(root / kind) for kind in FLAGS}
+        return cls(seasons, aggregates)
+
+    def save(self, root, tables=None):
+        """
+        Writes the index along with the results table of the given seasons.
+
+        Args:
+            root (Path): Index directory.
+            tables (dict[int, pd.DataFrame], optional): Results table rows of
+                the seasons that changed, from compact_results.
+        """
+
+        for year, table in (tables or {}).items():
+            write_frame(table, root / "results" / str(year))
+        for kind, frame in self.aggregates.items():
+            write_frame(frame, root / kind)
+
+        # The manifest goes last: its modification time versions the index
+        manifest = {"layout": LAYOUT, "seasons": {str(year): season for year, season in sorted(self.seasons.items())}}
+        tmp = root / f"{MANIFEST.name}.tmp"
+        tmp.write_text(json.dumps(manifest))
+        tmp.replace(root / MANIFEST.name)
+
+    def with_season(self, year, table, complete):
+        """
+        Returns a copy of the index with a season added or replaced.
+
+        Args:
+            year (int): Season.
+            table (pd.DataFrame): Its rows of the results table, from compact_results.
+            complete (bool): Whether every round of the season is in.
+
+        Returns:
+            HistoryIndex: The updated index.
+        """
+
+        rounds = sorted(int(rnd) for rnd in table.loc[table["session"] == "race", "round"].unique())
+        seasons = {**self.seasons, year: {"rounds": rounds, "complete": complete}}
+        aggregates = {
+            kind: _concat(frame[frame["year"] != year], season_aggregates(year, table, FLAGS[kind]))
+            .sort_values(["year", "id"], ignore_index=True)
+            for kind, frame in self.aggregates.items()
+        }
+        return HistoryIndex(seasons, aggregates)
+
+    def rounds(self, year):
+        """Returns the indexed rounds of a season (empty if not indexed)."""
+        return self.seasons.get(year, {}).get("rounds", [])
+
+    def is_complete(self, year):
+        return self.seasons.get(year, {}).get("complete", False)
+
+    def season(self, kind, year):
+        """
+        Returns a season's aggregates, most points first.
+
+        Args:
+            kind (str): "drivers" or "constructors".
+            year (int): Season.
+
+        Returns:
+            pd.DataFrame: 'id' and AGGREGATE_COLUMNS.
+        """
+
+        frame = self.aggregates[kind]
+        return _by_points(frame[frame["year"] == year])
+
+    def seasons_of(self, kind, id_):
+        """Returns the per-season aggregates of one driver or constructor, oldest first."""
+        frame = self.aggregates[kind]
+        return frame[frame["id"] == id_].reset_index(drop=True)
+
+    def coverage(self, now=None):
+        """
+        Describes which seasons the career totals include.
+
+        Returns:
+            dict: First and last indexed season, the number indexed, the
+                finished seasons that are not (fully) indexed yet and whether
+                that list is empty.
+        """
+
+        year = (now or datetime.now(timezone.utc)).year
+        indexed = sorted(self.seasons)
+        missing = [season for season in range(FIRST_SEASON, year) if not self.is_complete(season)]
+        return {
+            "first": indexed[0] if indexed else None,
+            "last": indexed[-1] if indexed else None,
+            "indexed": len(indexed),
+            "missing": missing,
+            "complete": not missing,
+        }
+
+
+def _manifest_version():
+    try:
+        return MANIFEST.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def get_index():
+    """
+    Returns the current index, reloading it when this or another worker
+    process saved a newer one.
+
+    Returns:
+        HistoryIndex: Read-only index.
+    """
+
+    global _index, _version
+    version = _manifest_version()
+    if _index is not None and version == _version:
+        return _index
+
+    with _lock:
+        if _index is None or version != _version:
+            _index = HistoryIndex.load(HISTORY_DIR)
+            _version = version
+        return _index
+
+
+def season_rounds(year, now=None):
+    """
+    Returns the rounds of a season that can be indexed: every round of a
+    finished season, the completed ones of the current season.
+
+    Args:
+        year (int): Season.
+        now (datetime, optional): Reference time, defaults to the current UTC time.
+
+    Returns:
+        tuple[list[int], bool]: The rounds, and whether they are the whole season.
+    """
+
+    now = now or datetime.now(timezone.utc)
+    if year < now.year:
+        schedule = get_race_schedule_cached(year)
+        rounds = sorted(int(rnd) for rnd in schedule["round"]) if schedule is not None and not schedule.empty else []
+        return rounds, True
+    return completed_rounds(get_event_schedule_cached(year, include_testing=False), now), False
+
+
+def index_season(year, rounds, complete):
+    """
+    Loads the given rounds of a season from the season store (fetching what
+    it lacks from Ergast) and adds them to the index. The fetch runs before
+    taking the index locks, and the index is only written when it gained
+    rounds.
+
+    Args:
+        year (int): Season.
+        rounds (list[int]): Rounds to include.
+        complete (bool): Whether these are all of the season's rounds.
+
+    Returns:
+        HistoryIndex: The updated index.
+    """
+
+    global _index, _version
+    table = compact_results(year, build_season_results(year, list(rounds)))
+
+    # Rounds Ergast has not published yet leave the season incomplete
+    indexed = set(table.loc[table["session"] == "race", "round"].astype(int))
+    complete = complete and indexed >= set(rounds)
+
+    with _lock, _file_lock("index"):
+        index = get_index()
+        if not indexed - set(index.rounds(year)) and complete <= index.is_complete(year):
+            return index
+
+        index = index.with_season(year, table, complete)
+        index.save(HISTORY_DIR, tables={year: table})
+        _index, _version = index, _manifest_version()
+        return index
+
+
+def ensure_season(year, now=None):
+    """
+    Makes sure the index holds a season: a finished season once, the current
+    one up to its latest completed round. Cheap when nothing changed.
+
+    Args:
+        year (int): Season.
+        now (datetime, optional): Reference time, defaults to the current UTC time.
+
+    Returns:
+        HistoryIndex: The index.
+    """
+
+    index = get_index()
+    if index.is_complete(year):
+        return index
+
+    rounds, complete = season_rounds(year, now)
+    if not rounds or (not complete and index.rounds(year) == rounds):
+        return index
+    return index_season(year, rounds, complete)
+
+
+def season_stats(kind, year, now=None):
+    """
+    Returns a season's stats from the index, or straight from the season
+    store while the index lacks some of its rounds. Requests never write the
+    index; the builder fills it.
+
+    Args:
+        kind (str): "drivers" or "constructors".
+        year (int): Season.
+        now (datetime, optional): Reference time, defaults to the current UTC time.
+
+    Returns:
+        pd.DataFrame: 'id' and AGGREGATE_COLUMNS, most points first.
+    """
+
+    index = get_index()
+    if index.is_complete(year):
+        return index.season(kind, year)
+
+    rounds, _ = season_rounds(year, now)
+    if not rounds or index.rounds(year) == rounds:
+        return index.season(kind, year)
+
+    table = compact_results(year, get_season_results(year, tuple(rounds)))
+    return _by_points(season_aggregates(year, table, FLAGS[kind]))
+
+
+def build_history(stop=None, interval=BUILD_SEASON_INTERVAL):
+    """
+    Indexes every season from the current one back to 1950, pausing after
+    each season that had to be fetched from Ergast. Only one process builds
+    at a time.
+
+    Args:
+        stop (threading.Event, optional): Set to stop building early.
+        interval (float): Seconds to pause after a fetched season.
+
+    Returns:
+        bool: True once every season is indexed.
+    """
+
+    stop = stop or threading.Event()
+    with _file_lock("builder", blocking=False) as acquired:
+        if not acquired:
+            logger.info("Another process is building the history index")
+            return False
+
+        now = datetime.now(timezone.utc)
+        for year in range(now.year, FIRST_SEASON - 1, -1):
+            if stop.is_set():
+                return False
+            if get_index().is_complete(year):
+                continue
+
+            fetched = not stored_rounds(year)
+            try:
+                index = ensure_season(year, now)
+                logger.info("History index: %s has %d rounds", year, len(index.rounds(year)))
+            except Exception:
+                logger.exception("Could not index the %s season", year)
+            if fetched and year < now.year and stop.wait(interval):
+                return False
+
+        index = get_index()
+        return all(index.is_complete(year) for year in range(FIRST_SEASON, now.year))
+
+
+class HistoryBuilder:
+    """
+    Builds the history index in the background, retrying seasons that failed
+    (e.g. when Ergast's hourly limit was reached) until every one is in, then
+    keeps adding the current season's rounds as they are published.
+    """
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="history-builder", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        complete = False
+        while not self._stop.is_set():
+            try:
+                if build_history(self._stop) and not complete:
+                    complete = True
+                    logger.info("History index complete")
+            except Exception:
+                logger.exception("History index build failed")
+            self._stop.wait(BUILD_RETRY_INTERVAL)
+
+
+if __name__ == "__main__":
+    # One-off build: python history.py [seconds between fetched seasons]
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    interval = float(sys.argv[1]) if len(sys.argv) > 1 else BUILD_SEASON_INTERVAL
+    sys.exit(0 if build_history(interval=interval) else 1)
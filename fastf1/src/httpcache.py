@@ -0,0 +1,239 @@
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from pathlib import Path
+from flask import make_response, request
+from backend import backend
+from cache import get_event_schedule_cached
+from compress import compress_response
+from ttl import LIVE_TTL, MAX_TTL, current_season_ttl
+
+# ------------------------------------------------------------------
+# HTTP caching headers and conditional requests
+# ------------------------------------------------------------------
+
+# Without a schedule, fall back to a short max-age
+DEFAULT_MAX_AGE = LIVE_TTL
+
+# Versions live in the shared backend under this prefix + path, so every
+# worker answers conditional requests alike: (etag, last_modified,
+# fresh_until, stored_at), i.e. when each representation was first served and
+# until when clients were told they may reuse it
+VERSION_PREFIX = "version:"
+VERSION_TTL = MAX_TTL
+
+# Touched when cached responses are invalidated: with the in-process backend
+# every worker holds its own versions and materialized responses, and drops
+# those stored before another process invalidated
+INVALIDATED_MARKER = Path("./cache/responses.invalidated")
+
+# (computed_at, ttl, valid_until) for the current season
+_policy = None
+_lock = threading.Lock()
+
+
+def invalidated_at():
+    """
+    Returns when cached responses were last invalidated by any process.
+
+    Returns:
+        float: POSIX timestamp, 0.0 if they never were.
+    """
+
+    try:
+        return INVALIDATED_MARKER.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def _mark_invalidated():
+    # Explicit time: file timestamps otherwise follow the coarser kernel clock
+    now = time.time()
+    INVALIDATED_MARKER.parent.mkdir(parents=True, exist_ok=True)
+    INVALIDATED_MARKER.touch()
+    os.utime(INVALIDATED_MARKER, (now, now))
+
+
+def _version(key):
+    version = backend.get(VERSION_PREFIX + key)
+    if version is not None and version[3] > invalidated_at():
+        return version
+    return None
+
+
+def _set_version(key, etag, last_modified, fresh_until):
+    backend.set(VERSION_PREFIX + key, (etag, last_modified, fresh_until, time.time()), VERSION_TTL.total_seconds())
+
+
+def invalidate_versions(prefix=""):
+    """
+    Forgets the representations served for paths starting with the given
+    prefix, so conditional requests for them run the view again. Forgetting
+    all of them also reaches the versions other worker processes hold in memory.
+
+    Args:
+        prefix (str): Route prefix, e.g. "/api/f1/get_driver_points". Empty forgets all.
+    """
+
+    backend.delete_prefix(VERSION_PREFIX + prefix)
+    if not prefix:
+        _mark_invalidated()
+
+
+def etag_for(body):
+    """
+    Returns a strong ETag for a response body.
+
+    Args:
+        body (bytes): Serialized payload.
+
+    Returns:
+        str: Unquoted entity tag.
+    """
+
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def last_modified_for(key, etag, now):
+    """
+    Returns when the given representation of a path was first served, so
+    Last-Modified only moves when the payload actually changed.
+
+    Args:
+        key (str): Path and query string.
+        etag (str): Entity tag of the current payload.
+        now (datetime): Time to record for a new representation.
+
+    Returns:
+        datetime: Last modification time (UTC).
+    """
+
+    version = _version(key)
+    if version is None or version[0] != etag:
+        _set_version(key, etag, now, None)
+        return now
+    return version[1]
+
+
+def max_age(now, year=None):
+    """
+    Works out how long clients may reuse a response: until the next session
+    starts, briefly during a race weekend, and long for finished seasons.
+
+    Args:
+        now (datetime): Reference time (UTC).
+        year (int, optional): Season the response is about, if any.
+
+    Returns:
+        int: max-age in seconds.
+    """
+
+    global _policy
+    if year is not None and year < now.year:
+        return int(MAX_TTL.total_seconds())
+
+    with _lock:
+        if _policy is None or now >= _policy[2]:
+            try:
+                schedule = get_event_schedule_cached(now.year, include_testing=False)
+                if schedule.empty:
+                    raise ValueError(f"No event schedule found for {now.year}")
+                ttl, valid_until = current_season_ttl(schedule, now)
+            except Exception:
+                ttl, valid_until = DEFAULT_MAX_AGE, now + DEFAULT_MAX_AGE
+            _policy = (now, ttl, valid_until)
+        computed_at, ttl, _ = _policy
+
+    # The next session moves closer while the policy is reused
+    remaining = ttl if ttl <= LIVE_TTL else ttl - (now - computed_at)
+    return max(int(remaining.total_seconds()), 0)
+
+
+def add_cache_headers(response):
+    """
+    Adds ETag, Last-Modified and Cache-Control to successful GET responses,
+    compresses them, and turns them into 304 Not Modified when the client
+    already holds them. Routes that set their own Cache-Control or ETag keep it.
+
+    Args:
+        response (flask.Response): Outgoing response.
+
+    Returns:
+        flask.Response: The response, possibly made conditional.
+    """
+
+    if request.method not in ("GET", "HEAD") or response.status_code != 200:
+        return compress_response(response)
+
+    now = datetime.now(timezone.utc)
+    if "Cache-Control" not in response.headers:
+        year = (request.view_args or {}).get("year")
+        response.headers["Cache-Control"] = f"public, max-age={max_age(now, year)}"
+
+    # Streamed bodies can't be hashed without buffering them
+    if response.is_streamed:
+        return compress_response(response)
+
+    if response.get_etag() == (None, None):
+        response.set_etag(etag_for(response.get_data()))
+    etag = response.get_etag()[0]
+    if response.last_modified is None:
+        response.last_modified = last_modified_for(request.full_path, etag, now)
+
+    # Lets answer_not_modified() skip the view while clients may reuse this one
+    cache_control = response.cache_control
+    if cache_control.max_age is not None and not cache_control.no_cache and not cache_control.no_store:
+        fresh_until = now + timedelta(seconds=cache_control.max_age)
+        _set_version(request.full_path, etag, response.last_modified, fresh_until)
+
+    # Compress first so the ETag matches the representation actually sent
+    return compress_response(response).make_conditional(request)
+
+
+def answer_not_modified():
+    """
+    Answers a conditional GET with 304 Not Modified before the view runs, when
+    the client holds the representation last served for the path and its
+    max-age has not run out yet, so the payload is not built just to be
+    hashed and thrown away.
+
+    Returns:
+        flask.Response | None: The 304 response, or None to run the view.
+    """
+
+    if request.method not in ("GET", "HEAD") or not request.if_none_match:
+        return None
+
+    now = datetime.now(timezone.utc)
+    version = _version(request.full_path)
+    if version is None or version[2] is None or now >= version[2]:
+        return None
+
+    # The client may hold the identity or a compressed representation
+    etag, last_modified, fresh_until, _ = version
+    for tag in (etag, f"{etag}-gzip", f"{etag}-br"):
+        if request.if_none_match.contains(tag):
+            response = make_response("", 304)
+            response.set_etag(tag)
+            response.last_modified = last_modified
+            response.headers["Cache-Control"] = f"public, max-age={int((fresh_until - now).total_seconds())}"
+            return response
+    return None
+
+
+def no_cache(view):
+    """
+    Marks a view whose payload changes on every request (e.g. a countdown):
+    clients must revalidate before reusing it.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        response = make_response(view(*args, **kwargs))
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
+    return wrapper
@@ -0,0 +1,138 @@
+import inspect
+import sys
+import threading
+from collections import OrderedDict
+from functools import wraps
+from singleflight import SingleFlight
+
+# ------------------------------------------------------------------
+# In-process LRU tier
+# ------------------------------------------------------------------
+
+_MISSING = object()
+
+
+def sizeof(value):
+    """
+    Estimates the in-memory size of a cached value in bytes.
+
+    Args:
+        value: Cached object. DataFrames are measured deeply.
+
+    Returns:
+        int: Approximate size in bytes.
+    """
+
+    # pandas objects, without importing pandas
+    memory_usage = getattr(value, "memory_usage", None)
+    if memory_usage is not None:
+        usage = memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used mapping bounded by the total size of its
+    values, with hit/miss/eviction counters.
+    """
+
+    def __init__(self, max_bytes, sizeof=sizeof):
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key][0]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._data:
+                self.current_bytes -= self._data.pop(key)[1]
+            self._data[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted) = self._data.popitem(last=False)
+                self.current_bytes -= evicted
+                self.evictions += 1
+
+    def pop(self, key):
+        with self._lock:
+            if key in self._data:
+                self.current_bytes -= self._data.pop(key)[1]
+
+    def keys(self):
+        with self._lock:
+            return list(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self.current_bytes,
+                "maxBytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def lru_tier(max_bytes):
+    """
+    Memoizes a function in memory in front of whatever caching it already
+    does (e.g. a joblib disk cache), so hot keys skip hashing, disk I/O and
+    unpickling. Concurrent misses for the same key share one call. Returned
+    values are shared and must be treated as read-only.
+
+    Args:
+        max_bytes (int): Memory budget for the cached values.
+
+    Returns:
+        Callable: Decorator exposing `cache` (the LRUCache) and `cache_clear`.
+    """
+
+    def decorator(func):
+        # joblib's MemorizedFunc keeps the original function as `.func`
+        signature = inspect.signature(getattr(func, "func", func))
+        cache = LRUCache(max_bytes)
+        flights = SingleFlight()
+
+        def load(key, args, kwargs):
+            value = func(*args, **kwargs)
+            cache.set(key, value)
+            return value
+
+        @wraps(getattr(func, "func", func))
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tuple(bound.arguments.items())
+
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = flights.do(key, load, key, args, kwargs)
+            return value
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
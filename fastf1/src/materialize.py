@@ -0,0 +1,159 @@
+import time
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from flask import Response, make_response, request
+from backend import backend
+from cache import get_event_schedule_cached
+from httpcache import etag_for, invalidate_versions, invalidated_at, last_modified_for
+from season import race_boundaries
+from singleflight import SingleFlight
+from ttl import MAX_TTL
+from upstream import served_stale
+
+# ------------------------------------------------------------------
+# Materialized responses
+# ------------------------------------------------------------------
+
+# Results are usually published a few hours after the race starts (and may be
+# amended for penalties), so right after a race payloads are only kept briefly
+SETTLE_WINDOW = timedelta(hours=24)
+SETTLE_TTL = timedelta(minutes=15)
+
+# Entries live in the shared backend under this prefix + path + season:
+# (body, status, mimetype, expires_at, etag, last_modified, stored_at)
+KEY_PREFIX = "materialized:"
+_flights = SingleFlight()
+
+
+def _expires_at(year, now):
+    """
+    Works out until when a payload for the given season stays valid: until
+    the next race, and no longer than MAX_TTL so that late amendments to a
+    finished season are picked up too.
+
+    Returns:
+        datetime: Expiry time (UTC).
+    """
+
+    schedule = get_event_schedule_cached(year, include_testing=False)
+    if schedule.empty:
+        return now + SETTLE_TTL
+
+    last_race, next_race = race_boundaries(schedule, now)
+    if last_race is not None and now - last_race < SETTLE_WINDOW:
+        return now + SETTLE_TTL
+    if next_race is None:
+        return now + MAX_TTL
+    return min(next_race, now + MAX_TTL)
+
+
+def _lookup(key, now):
+    entry = backend.get(KEY_PREFIX + key)
+    if entry is not None and now < entry[3] and entry[6] > invalidated_at():
+        return entry
+    return None
+
+
+def _render(key, view, year, now, args, kwargs):
+    """
+    Runs the view and stores its body, ETag and Last-Modified time when it
+    succeeded. Only one worker process renders a given key at a time; the
+    others pick up its result.
+
+    Returns:
+        tuple[bytes, int, str, str | None, datetime | None]: Body, status code,
+            mimetype, ETag and Last-Modified time.
+    """
+
+    with backend.lock(KEY_PREFIX + key):
+        entry = _lookup(key, now)
+        if entry is not None:
+            body, status, mimetype, _, etag, last_modified, _ = entry
+            return body, status, mimetype, etag, last_modified
+        return _render_view(key, view, year, now, args, kwargs)
+
+
+def _render_view(key, view, year, now, args, kwargs):
+    """Runs the view and stores the entry when it succeeded on fresh data."""
+    response = make_response(view(*args, **kwargs))
+    body = response.get_data()
+    if response.status_code != 200:
+        return body, response.status_code, response.mimetype, None, None
+
+    etag = etag_for(body)
+    entry = (body, response.status_code, response.mimetype, etag, last_modified_for(key, etag, now))
+
+    # Built from stale Ergast data: serve it, but render again once refreshed
+    if served_stale():
+        return entry
+    try:
+        expires_at = _expires_at(year, now)
+    except Exception:
+        return entry
+    stored = (*entry[:3], expires_at, *entry[3:], time.time())
+    backend.set(KEY_PREFIX + key, stored, (expires_at - now).total_seconds())
+    return entry
+
+
+def _respond(body, status, mimetype, etag, last_modified):
+    """
+    Builds the response for a stored body. The validators let the
+    after_request hook answer conditional requests with 304 straight away.
+    """
+
+    response = Response(body, status=status, mimetype=mimetype)
+    if etag is not None:
+        response.set_etag(etag)
+        response.last_modified = last_modified
+    return response
+
+
+def materialized(year_arg=None):
+    """
+    Caches the serialized JSON body of a route keyed by its path, query
+    string and season. Entries are invalidated once the schedule shows a new
+    completed race, so hits are answered without touching pandas at all, and
+    conditional requests are answered from the stored ETag. Routes tied to
+    the current season get a new key when the year changes.
+
+    Args:
+        year_arg (str, optional): Name of the view argument holding the season.
+            Routes without one are tied to the current season.
+
+    Returns:
+        Callable: Decorator for a Flask view function.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            now = datetime.now(timezone.utc)
+            year = kwargs.get(year_arg) if year_arg else now.year
+            key = f"{request.full_path}#{year}"
+
+            entry = _lookup(key, now)
+            if entry is not None:
+                body, status, mimetype, _, etag, last_modified, _ = entry
+                return _respond(body, status, mimetype, etag, last_modified)
+
+            # Concurrent misses for the same key share one render
+            return _respond(*_flights.do(key, _render, key, view, year, now, args, kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate(prefix=""):
+    """
+    Drops materialized responses whose key starts with the given prefix,
+    along with the versions conditional requests are answered from, so
+    clients holding an old ETag get the new payload. Dropping all of them
+    also reaches the entries other worker processes hold in memory.
+
+    Args:
+        prefix (str): Route prefix, e.g. "/api/f1/get_driver_points". Empty drops all.
+    """
+
+    backend.delete_prefix(KEY_PREFIX + prefix)
+    invalidate_versions(prefix)
@@ -0,0 +1,198 @@
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from flask import Response, g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+# ------------------------------------------------------------------
+# Timing spans, Prometheus metrics and Server-Timing
+# ------------------------------------------------------------------
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# ?profile=1 runs a single request under cProfile and returns the profile
+# instead of the payload; off unless F1_PROFILING=1
+PROFILING = os.environ.get("F1_PROFILING") == "1"
+PROFILE_LINES = 40
+
+# (span, endpoint) -> histogram counts, see new_histogram()
+_histograms = {}
+_lock = threading.Lock()
+
+
+def new_histogram():
+    """Returns empty histogram counts: one per bucket, then +Inf count and sum."""
+    return [0] * (len(BUCKETS) + 2)
+
+
+def add_sample(histogram, seconds):
+    """Adds a duration to histogram counts created by new_histogram()."""
+    for i, bound in enumerate(BUCKETS):
+        if seconds <= bound:
+            histogram[i] += 1
+    histogram[-2] += 1
+    histogram[-1] += seconds
+
+
+def histogram_lines(metric, labels, histogram):
+    """
+    Renders one labelled histogram in the Prometheus text format.
+
+    Args:
+        metric (str): Metric name, e.g. "f1_span_seconds".
+        labels (str): Label pairs, e.g. 'span="request"'.
+        histogram (list): Counts created by new_histogram().
+
+    Returns:
+        list[str]: Bucket, sum and count lines.
+    """
+
+    lines = [f'{metric}_bucket{{{labels},le="{bound}"}} {count}' for bound, count in zip(BUCKETS, histogram)]
+    lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {histogram[-2]}')
+    lines.append(f"{metric}_sum{{{labels}}} {histogram[-1]:.6f}")
+    lines.append(f"{metric}_count{{{labels}}} {histogram[-2]}")
+    return lines
+
+
+def observe(name, seconds, endpoint=""):
+    """
+    Records a duration in the span's histogram.
+
+    Args:
+        name (str): Span name, e.g. "get_event_schedule_cached".
+        seconds (float): Duration.
+        endpoint (str): Flask endpoint the span belongs to, if per-route.
+    """
+
+    with _lock:
+        add_sample(_histograms.setdefault((name, endpoint), new_histogram()), seconds)
+
+
+@contextmanager
+def span(name):
+    """
+    Times a block: adds it to the global histogram and, inside a request, to
+    that request's Server-Timing breakdown.
+    """
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        observe(name, elapsed)
+        if has_request_context():
+            timings = g.setdefault("timings", {})
+            total, count = timings.get(name, (0.0, 0))
+            timings[name] = (total + elapsed, count + 1)
+
+
+def timed(func):
+    """Wraps a function in a span named after it."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(func.__name__):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def instrument_view(endpoint, view):
+    """
+    Splits a view's time into 'compute' (everything but encoding) and
+    'serialize' (JSON encoding, recorded by the JSON provider and
+    json_response), per endpoint. Also hosts the opt-in profiler.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if PROFILING and request.args.get("profile") == "1":
+            return _profile(view, args, kwargs)
+
+        before = g.get("timings", {}).get("serialize", (0.0, 0))[0]
+        started = time.perf_counter()
+        try:
+            return view(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            serialize = g.get("timings", {}).get("serialize", (0.0, 0))[0] - before
+            compute = max(elapsed - serialize, 0.0)
+            observe("compute", compute, endpoint)
+            if serialize:
+                observe("serialize", serialize, endpoint)
+            g.setdefault("timings", {})["compute"] = (compute, 1)
+
+    return wrapper
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, with jsonify() timed as 'serialize'."""
+
+    def response(self, *args, **kwargs):
+        with span("serialize"):
+            return super().response(*args, **kwargs)
+
+
+def _profile(view, args, kwargs):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        view(*args, **kwargs)
+    finally:
+        profiler.disable()
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_LINES)
+    return Response(out.getvalue(), mimetype="text/plain", headers={"Cache-Control": "no-store"})
+
+
+def start_request():
+    g.request_started = time.perf_counter()
+
+
+def finish_request(response):
+    """
+    Records the request's total time and adds a Server-Timing header with
+    every span measured while handling it (durations in milliseconds).
+    """
+
+    started = g.get("request_started")
+    if started is None:
+        return response
+
+    total = time.perf_counter() - started
+    observe("request", total, request.endpoint or "")
+    entries = [
+        f"{name};dur={seconds * 1000:.1f}" + (f';desc="x{count}"' if count > 1 else "")
+        for name, (seconds, count) in g.get("timings", {}).items()
+    ]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    response.headers["Server-Timing"] = ", ".join(entries)
+    return response
+
+
+def render_prometheus():
+    """
+    Renders every span histogram in the Prometheus text exposition format.
+
+    Returns:
+        str: Metrics text.
+    """
+
+    with _lock:
+        histograms = {key: list(values) for key, values in _histograms.items()}
+
+    lines = [
+        "# HELP f1_span_seconds Time spent in instrumented spans.",
+        "# TYPE f1_span_seconds histogram",
+    ]
+    for (name, endpoint), values in sorted(histograms.items()):
+        labels = f'span="{name}"' + (f',endpoint="{endpoint}"' if endpoint else "")
+        lines.extend(histogram_lines("f1_span_seconds", labels, values))
+    return "\n".join(lines) + "\n"
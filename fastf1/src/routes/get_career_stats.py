@@ -0,0 +1,87 @@
+from flask import Blueprint
+from history import get_index
+from serialize import career_records, ints, json_response, stats_records
+from ttl import LIVE_TTL
+
+career_stats_bp = Blueprint("career_stats", __name__, url_prefix="/api/f1")
+
+
+def _headers(coverage):
+    # Totals still grow while the index is being built, so don't let clients keep them long
+    if coverage["complete"]:
+        return {}
+    return {"Cache-Control": f"public, max-age={int(LIVE_TTL.total_seconds())}"}
+
+
+def _career_list(kind):
+    index = get_index()
+    coverage = index.coverage()
+    careers = index.careers[kind]
+    if careers.empty:
+        return json_response({"error": "Historical stats are not indexed yet", "coverage": coverage}, 404)
+
+    response = json_response({"coverage": coverage, kind: career_records(careers)})
+    response.headers.update(_headers(coverage))
+    return response
+
+
+def _career(kind, id_):
+    index = get_index()
+    careers = index.careers[kind]
+    career = careers[careers["id"] == id_]
+    if career.empty:
+        return json_response({"error": f"No career stats found for {id_}"}, 404)
+
+    coverage = index.coverage()
+    seasons = index.seasons_of(kind, id_)
+    by_season = [{"year": year, **row} for year, row in zip(ints(seasons["year"]), stats_records(seasons))]
+    response = json_response({"coverage": coverage, **career_records(career)[0], "bySeason": by_season})
+    response.headers.update(_headers(coverage))
+    return response
+
+
+@career_stats_bp.route("/get_driver_career_stats")
+def get_driver_career_stats():
+    """
+    Return career totals (wins, podiums, poles, DNFs, points, races, seasons)
+    of every driver since 1950, most wins first, from the historical stats index.
+    'coverage' lists the seasons the totals include.
+    """
+    try:
+        return _career_list("drivers")
+    except Exception as e:
+        return json_response({"error": f"Failed to fetch driver career stats: {str(e)}"}, 500)
+
+
+@career_stats_bp.route("/get_driver_career_stats/<driver_id>")
+def get_driver_career(driver_id):
+    """
+    Return one driver's career totals and their stats per season.
+    """
+    try:
+        return _career("drivers", driver_id)
+    except Exception as e:
+        return json_response({"error": f"Failed to fetch career stats for {driver_id}: {str(e)}"}, 500)
+
+
+@career_stats_bp.route("/get_constructor_career_stats")
+def get_constructor_career_stats():
+    """
+    Return career totals (wins, podiums, poles, DNFs, points, races, seasons)
+    of every constructor since 1950, most wins first, from the historical stats index.
+    """
+    try:
+        return _career_list("constructors")
+    except Exception as e:
+        return json_response({"error": f"Failed to fetch constructor career stats: {str(e)}"}, 500)
+
+
+@career_stats_bp.route("/get_constructor_career_stats/<constructor_id>")
+def get_constructor_career(constructor_id):
+    """
+    Return one constructor's career totals and its stats per season.
+    """
+    try:
+        return _career("constructors", constructor_id)
+    except Exception as e:
+        return json_response({"error": f"Failed to fetch career stats for {constructor_id}: {str(e)}"}, 500)
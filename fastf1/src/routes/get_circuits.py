@@ -1,5 +1,6 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint
 from cache import get_circuits_cached
+from serialize import column, json_response, records, texts
 import pandas as pd
 import logging
 import requests
@@ -18,34 +19,29 @@ def get_circuits():
 
         # Check if data is empty
         if circuits_df.empty:
-            return jsonify({"error": "No circuit data available"}), 404
-
-        # Convert DataFrame to a list of dictionaries with relevant circuit details
-        tracks_list = [
-            {
-                "id": row.get("circuitId"),
-                "name": row.get("circuitName"),
-                "location": row.get("locality"),
-                "country": row.get("country"),
-                "url": row.get("circuitUrl"),
-            }
-            for _, row in circuits_df.iterrows()
-        ]
-
-        # Sort circuits alphabetically by name
-        tracks_list.sort(key=lambda track: track["name"])
+            return json_response({"error": "No circuit data available"}, 404)
+
+        # Sort circuits alphabetically by name, then build the list column-wise
+        circuits_df = circuits_df.sort_values("circuitName", kind="stable")
+        tracks_list = records(
+            id=texts(column(circuits_df, "circuitId")),
+            name=texts(column(circuits_df, "circuitName")),
+            location=texts(column(circuits_df, "locality")),
+            country=texts(column(circuits_df, "country")),
+            url=texts(column(circuits_df, "circuitUrl")),
+        )
 
         # Return JSON response with the sorted circuits
-        return jsonify(tracks_list)
+        return json_response(tracks_list)
 
     except requests.exceptions.RequestException as e:
         # Catch network-related errors
-        return jsonify({"error": "Network error while fetching circuits"}), 503
+        return json_response({"error": "Network error while fetching circuits"}, 503)
 
     except pd.errors.EmptyDataError:
         # Catch empty data from DataFrame
-        return jsonify({"error": "Circuit data is empty or malformed"}), 500
+        return json_response({"error": "Circuit data is empty or malformed"}, 500)
 
     except Exception as e:
         # Catch all other exceptions
-        return jsonify({"error": f"Failed to fetch circuits: {str(e)}"}), 500
+        return json_response({"error": f"Failed to fetch circuits: {str(e)}"}, 500)
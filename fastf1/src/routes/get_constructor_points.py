@@ -1,27 +1,30 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, request
 import pandas as pd
 from utils import iso3_country, slugify_location
-from cache import (
-    get_event_schedule_cached,
-    get_race_results_cached,
-    get_sprint_results_cached,
-)
+from cache import get_event_schedule_cached
+from materialize import materialized
+from season import completed_rounds
+from serialize import compact_points, json_response
+from store import load_season_results
 
 constructor_points_bp = Blueprint("constructor_points", __name__, url_prefix="/api/f1")
 
 
 @constructor_points_bp.route("/get_constructor_points/<int:year>")
+@materialized(year_arg="year")
 def get_constructor_points(year):
     """
     Fetch constructor points for a given F1 season, including race and sprint points.
     Adds a 'slug' field for each race based on its location.
+    ?format=compact returns the race metadata once, with points and positions as
+    arrays indexed like it.
     """
     try:
         # Get race schedule
         schedule = get_event_schedule_cached(year, include_testing=False)
 
         if schedule.empty:
-            return jsonify({"error": f"No event schedule found for {year}"}), 404
+            return json_response({"error": f"No event schedule found for {year}"}, 404)
 
         rounds = schedule.get("RoundNumber", []).tolist()
         events = schedule.get("EventName", []).tolist()
@@ -29,10 +32,17 @@ def get_constructor_points(year):
         locations = schedule.get("Location", []).tolist()
 
         if not rounds or not events or not countries or not locations:
-            return jsonify({"error": f"Incomplete schedule data for {year}"}), 500
+            return json_response({"error": f"Incomplete schedule data for {year}"}, 500)
 
         country_codes = iso3_country(countries)
+
+        # Race and sprint results of every completed round, grouped by round
+        season = load_season_results(year, completed_rounds(schedule))
+        race_by_round = dict(tuple(season["race"].groupby("round"))) if not season["race"].empty else {}
+        sprint_by_round = dict(tuple(season["sprint"].groupby("round"))) if not season["sprint"].empty else {}
+
         constructor_points = {}
+        races = []
 
         # Process each race
         for round_number, race_name, country_code, location in zip(
@@ -41,19 +51,9 @@ def get_constructor_points(year):
             race_slug = slugify_location(location)
             weekend_points = {}
 
-            # Fetch race results safely
-            try:
-                race_data = get_race_results_cached(year, round_number).content
-                race_results = race_data[0] if race_data else pd.DataFrame()
-            except Exception:
-                race_results = pd.DataFrame()
-
-            # Fetch sprint results safely
-            try:
-                sprint_data = get_sprint_results_cached(year, round_number).content
-                sprint_results = sprint_data[0] if sprint_data else pd.DataFrame()
-            except Exception:
-                sprint_results = pd.DataFrame()
+            # Look up this round's results from the season store
+            race_results = race_by_round.get(round_number, pd.DataFrame())
+            sprint_results = sprint_by_round.get(round_number, pd.DataFrame())
 
             # Aggregate weekend points
             for df in [race_results, sprint_results]:
@@ -72,6 +72,9 @@ def get_constructor_points(year):
                         }
                     weekend_points[cid]["weekend_points"] += points
 
+            if weekend_points:
+                races.append({"round": int(round_number), "name": race_name, "slug": race_slug, "country": country_code})
+
             # Sort and assign weekend positions
             sorted_weekend = sorted(
                 weekend_points.values(), key=lambda x: x["weekend_points"], reverse=True
@@ -88,6 +91,7 @@ def get_constructor_points(year):
                     }
 
                 constructor_points[cid]["races"].append({
+                    "round": int(round_number),
                     "name": race_name,
                     "slug": race_slug,
                     "country": country_code,
@@ -97,7 +101,7 @@ def get_constructor_points(year):
                 constructor_points[cid]["total"] += data["weekend_points"]
 
         if not constructor_points:
-            return jsonify({"error": f"No constructor points available for {year}"}), 404
+            return json_response({"error": f"No constructor points available for {year}"}, 404)
 
         # Convert to list and sort by total points
         constructors_list = sorted(
@@ -108,7 +112,11 @@ def get_constructor_points(year):
         for idx, constructor in enumerate(constructors_list, start=1):
             constructor["position"] = idx
 
-        return jsonify(constructors_list)
+        # Optional compact format with race metadata hoisted into one table
+        if request.args.get("format") == "compact":
+            return json_response(compact_points(constructors_list, races, "constructors"))
+
+        return json_response(constructors_list)
 
     except Exception as e:
-        return jsonify({"error": f"Failed to fetch constructor points: {str(e)}"}), 500
+        return json_response({"error": f"Failed to fetch constructor points: {str(e)}"}, 500)
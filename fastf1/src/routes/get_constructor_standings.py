@@ -1,7 +1,9 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint
+import pandas as pd
 from datetime import datetime
 from utils import nationality_to_country_code
 from cache import get_constructor_standings_cached
+from serialize import column, ints, json_response, records, texts
 
 constructors_standings_bp = Blueprint(
     "constructor_standings", __name__, url_prefix="/api/f1"
@@ -23,37 +25,37 @@ def get_constructor_standings():
 
         # Check if response is empty or missing content
         if not response or not getattr(response, "content", None) or len(response.content) == 0:
-            return jsonify({"error": f"No constructor standings found for {year}"}), 404
+            return json_response({"error": f"No constructor standings found for {year}"}, 404)
 
         # Extract standings DataFrame from response
         standings_df = response.content[0]
 
         # Check if DataFrame is empty
         if standings_df.empty:
-            return jsonify({"error": f"No constructor standings data available for {year}"}), 404
-
-        # Convert DataFrame to JSON-friendly list
-        standings_list = []
-        for _, row in standings_df.iterrows():
-            try:
-                standings_list.append({
-                    "id": row.get("constructorId"),
-                    "position": int(row.get("position", 0)),
-                    "name": row.get("constructorName", "Unknown"),
-                    "points": int(row.get("points", 0)),
-                    "nationality": nationality_to_country_code(row.get("constructorNationality", "")),
-                })
-            except (ValueError, TypeError):
-                continue  # Skip rows with invalid data
+            return json_response({"error": f"No constructor standings data available for {year}"}, 404)
+
+        # Skip rows with invalid position or points, then build the list column-wise
+        position = pd.to_numeric(column(standings_df, "position", 0), errors="coerce")
+        points = pd.to_numeric(column(standings_df, "points", 0), errors="coerce")
+        valid = position.notna() & points.notna()
+        standings_df = standings_df[valid]
+
+        standings_list = records(
+            id=texts(column(standings_df, "constructorId")),
+            position=ints(position[valid]),
+            name=texts(column(standings_df, "constructorName", "Unknown")),
+            points=ints(points[valid]),
+            nationality=nationality_to_country_code(column(standings_df, "constructorNationality", "").fillna("")).tolist(),
+        )
 
         if not standings_list:
-            return jsonify({"error": f"No valid constructor standings for {year}"}), 404
+            return json_response({"error": f"No valid constructor standings for {year}"}, 404)
 
-        return jsonify(standings_list)
+        return json_response(standings_list)
 
     except AttributeError as ae:
-        return jsonify({"error": f"Attribute error: {str(ae)}"}), 500
+        return json_response({"error": f"Attribute error: {str(ae)}"}, 500)
     except ValueError as ve:
-        return jsonify({"error": f"Value error: {str(ve)}"}), 500
+        return json_response({"error": f"Value error: {str(ve)}"}, 500)
     except Exception as e:
-        return jsonify({"error": f"Failed to fetch constructor standings: {str(e)}"}), 500
+        return json_response({"error": f"Failed to fetch constructor standings: {str(e)}"}, 500)
@@ -1,16 +1,17 @@
-from flask import Blueprint, jsonify
-import pandas as pd
+from flask import Blueprint
 from datetime import datetime, timezone
-from cache import (
-    get_event_schedule_cached,
-    get_race_results_cached,
-    get_qualifying_results_cached,
-)
+from cache import get_event_schedule_cached
+from history import season_stats
+from materialize import materialized
+from serialize import json_response, stats_records
+from season import completed_rounds, get_season_results, constructor_stats
+from ttl import FIRST_SEASON
 
 constructor_stats_bp = Blueprint("constructor_stats", __name__, url_prefix="/api/f1")
 
 
 @constructor_stats_bp.route("/get_constructor_stats")
+@materialized()
 def get_constructor_stats():
     """
     Fetch and return constructor statistics (wins, podiums, poles, DNFs) for the current F1 season.
@@ -23,86 +24,46 @@ def get_constructor_stats():
         schedule = get_event_schedule_cached(year, include_testing=False)
 
         if schedule.empty:
-            return jsonify({"error": f"No event schedule found for {year}"}), 404
+            return json_response({"error": f"No event schedule found for {year}"}, 404)
 
-        rounds = schedule.get("RoundNumber", []).tolist()
+        # Only include rounds that have occurred (race date <= now)
+        rounds = completed_rounds(schedule, datetime.now(timezone.utc))
         if not rounds:
-            return jsonify({"error": f"No rounds found in schedule for {year}"}), 404
+            return json_response({"error": f"No completed races yet for {year}"}, 404)
 
-        all_constructor_ids = set()
-        # Collect all constructor IDs
-        for rnd in rounds:
-            try:
-                results = get_race_results_cached(year, rnd)
-                if results and not results.content[0].empty:
-                    all_constructor_ids.update(results.content[0].get("constructorId", []))
-            except Exception:
-                continue
+        # Reuse the parsed and classified season frame shared with driver stats
+        results = get_season_results(year, tuple(rounds))
+        constructor_stats_list = constructor_stats(results)
 
-        if not all_constructor_ids:
-            return jsonify({"error": f"No constructor data available for {year}"}), 404
-
-        constructor_stats_list = []
+        if not constructor_stats_list:
+            return json_response({"error": f"No constructor stats available for {year}"}, 404)
 
-        # Process each constructor
-        for constructor_id in all_constructor_ids:
-            wins = podiums = poles = dnfs = 0
+        return json_response(constructor_stats_list)
 
-            for rnd in rounds:
-                # Race results
-                try:
-                    results = get_race_results_cached(year, rnd)
-                    if results and not results.content[0].empty:
-                        df = results.content[0].copy()
-                        df["position"] = pd.to_numeric(df.get("position", pd.Series()), errors="coerce")
-                        constructor_rows = df[df.get("constructorId") == constructor_id]
-                        if not constructor_rows.empty:
-                            wins += int((constructor_rows["position"] == 1).sum())
-                            podiums += int((constructor_rows["position"] <= 3).sum())
-                            dnfs += int(
-                                constructor_rows.get("status", pd.Series()).str.contains(
-                                    r"Did Not Finish|Retired|Accident|Collision|Disqualified|Withdrew|"
-                                    r"Mechanical|Engine|Gearbox|Transmission|Clutch|Hydraulics|Electrical|"
-                                    r"Suspension|Brakes|Differential|Overheating|Oil leak|Wheel|Tyre|"
-                                    r"Puncture|Driveshaft|Fuel|Exhaust|Throttle|Steering|Chassis|Battery|"
-                                    r"Alternator|Radiator|Turbo|Power Unit|ERS|Spun off|Damage|Debris",
-                                    case=False,
-                                    na=False,
-                                ).sum()
-                            )
-                except Exception:
-                    continue
+    except AttributeError as ae:
+        return json_response({"error": f"Attribute error: {str(ae)}"}, 500)
+    except ValueError as ve:
+        return json_response({"error": f"Value error: {str(ve)}"}, 500)
+    except Exception as e:
+        return json_response({"error": f"Failed to fetch constructor stats: {str(e)}"}, 500)
 
-                # Qualifying results
-                try:
-                    quali = get_qualifying_results_cached(year, rnd)
-                    if quali and not quali.content[0].empty:
-                        q_df = quali.content[0].copy()
-                        q_df["position"] = pd.to_numeric(q_df.get("position", pd.Series()), errors="coerce")
-                        constructor_quali = q_df[q_df.get("constructorId") == constructor_id]
-                        if not constructor_quali.empty:
-                            poles += int((constructor_quali["position"] == 1).sum())
-                except Exception:
-                    continue
 
-            constructor_stats_list.append(
-                {
-                    "id": constructor_id,
-                    "wins": wins,
-                    "podiums": podiums,
-                    "poles": poles,
-                    "dnfs": dnfs,
-                }
-            )
+@constructor_stats_bp.route("/get_constructor_stats/<int:year>")
+def get_constructor_stats_for_season(year):
+    """
+    Fetch constructor statistics (wins, podiums, poles, DNFs, points, races) for any
+    season since 1950 from the historical stats index. The current season
+    covers the races that have occurred so far.
+    """
+    if not FIRST_SEASON <= year <= datetime.now().year:
+        return json_response({"error": f"No F1 season {year}"}, 404)
 
-        if not constructor_stats_list:
-            return jsonify({"error": f"No constructor stats available for {year}"}), 404
+    try:
+        stats = season_stats("constructors", year)
+        if stats.empty:
+            return json_response({"error": f"No constructor stats available for {year}"}, 404)
 
-        return jsonify(constructor_stats_list)
+        return json_response(stats_records(stats))
 
-    except AttributeError as ae:
-        return jsonify({"error": f"Attribute error: {str(ae)}"}), 500
-    except ValueError as ve:
-        return jsonify({"error": f"Value error: {str(ve)}"}), 500
     except Exception as e:
-        return jsonify({"error": f"Failed to fetch constructor stats: {str(e)}"}), 500
+        return json_response({"error": f"Failed to fetch constructor stats: {str(e)}"}, 500)
@@ -1,16 +1,17 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint
 from datetime import datetime, timezone
-from cache import (
-    get_event_schedule_cached,
-    get_race_results_cached,
-    get_sprint_results_cached,
-    get_qualifying_results_cached,
-)
+from cache import get_event_schedule_cached
+from history import season_stats
+from materialize import materialized
+from serialize import json_response, stats_records
+from season import completed_rounds, get_season_results, driver_stats
+from ttl import FIRST_SEASON
 
 driver_stats_bp = Blueprint("driver_stats", __name__, url_prefix="/api/f1")
 
 
 @driver_stats_bp.route("/get_driver_stats")
+@materialized()
 def get_driver_stats():
     """
     Fetch driver statistics (wins, podiums, poles, DNFs) for the current F1 season.
@@ -22,103 +23,43 @@ def get_driver_stats():
         # Fetch schedule for current year
         schedule = get_event_schedule_cached(year, include_testing=False)
         if schedule.empty:
-            return jsonify({"error": f"No event schedule found for {year}"}), 404
+            return json_response({"error": f"No event schedule found for {year}"}, 404)
 
         # Only include rounds that have occurred (race date <= now)
-        rounds = []
-        now = datetime.now(timezone.utc)
-        for _, event in schedule.iterrows():
-            race_date = event.get("Session5Date")  # Main race session
-            if race_date is not None and race_date <= now:
-                rounds.append(event["RoundNumber"])
+        rounds = completed_rounds(schedule, datetime.now(timezone.utc))
 
         if not rounds:
-            return jsonify({"error": f"No completed races yet for {year}"}), 404
+            return json_response({"error": f"No completed races yet for {year}"}, 404)
 
-        # Collect all driver IDs that participated in any completed race or sprint
-        all_driver_ids = set()
-        for rnd in rounds:
-            for fn in (get_race_results_cached, get_sprint_results_cached):
-                try:
-                    res = fn(year, rnd)
-                    if res and res.content:
-                        df = res.content[0]
-                        if not df.empty:
-                            all_driver_ids.update(df["driverId"].unique())
-                except Exception:
-                    continue
+        # Gather every completed round into one long-form frame and aggregate once
+        results = get_season_results(year, tuple(rounds))
+        driver_stats_list = driver_stats(results)
 
-        if not all_driver_ids:
-            return jsonify({"error": f"No driver data available for {year}"}), 404
+        if not driver_stats_list:
+            return json_response({"error": f"No driver data available for {year}"}, 404)
 
-        driver_stats_list = []
+        return json_response(driver_stats_list)
 
-        # Process each driver
-        for driver_id in all_driver_ids:
-            wins = podiums = poles = dnfs = 0
-
-            for rnd in rounds:
-                # --- Race results ---
-                try:
-                    race_res = get_race_results_cached(year, rnd)
-                    if race_res and race_res.content:
-                        df = race_res.content[0]
-                        if not df.empty:
-                            driver_row = df[df["driverId"] == driver_id]
-                            if not driver_row.empty:
-                                pos = int(driver_row.iloc[0].get("position", 0))
-                                status = str(driver_row.iloc[0].get("status", "")).lower()
-                                wins += int(pos == 1)
-                                podiums += int(pos <= 3)
-                                if not (status.startswith("finished") or "lap" in status):
-                                    dnfs += 1
-                except Exception:
-                    continue
-
-                # --- Sprint results ---
-                try:
-                    sprint_res = get_sprint_results_cached(year, rnd)
-                    if sprint_res and sprint_res.content:
-                        df = sprint_res.content[0]
-                        if not df.empty:
-                            driver_row = df[df["driverId"] == driver_id]
-                            if not driver_row.empty:
-                                pos = int(driver_row.iloc[0].get("position", 0))
-                                status = str(driver_row.iloc[0].get("status", "")).lower()
-                                wins += int(pos == 1)
-                                podiums += int(pos <= 3)
-                                if not (status.startswith("finished") or "lap" in status):
-                                    dnfs += 1
+    except Exception as e:
+        return json_response({"error": f"Failed to fetch driver stats: {str(e)}"}, 500)
 
-                                # Sprint poles based on grid
-                                if "grid" in driver_row.columns:
-                                    grid = int(driver_row.iloc[0].get("grid", 0))
-                                    poles += int(grid == 1)
-                except Exception:
-                    continue
 
-                # --- Qualifying results (pole positions) ---
-                try:
-                    quali_res = get_qualifying_results_cached(year, rnd)
-                    if quali_res and quali_res.content:
-                        df = quali_res.content[0]
-                        if not df.empty:
-                            driver_row = df[df["driverId"] == driver_id]
-                            if not driver_row.empty:
-                                pos = int(driver_row.iloc[0].get("position", 0))
-                                poles += int(pos == 1)
-                except Exception:
-                    continue
+@driver_stats_bp.route("/get_driver_stats/<int:year>")
+def get_driver_stats_for_season(year):
+    """
+    Fetch driver statistics (wins, podiums, poles, DNFs, points, races) for any
+    season since 1950 from the historical stats index. The current season
+    covers the races that have occurred so far.
+    """
+    if not FIRST_SEASON <= year <= datetime.now().year:
+        return json_response({"error": f"No F1 season {year}"}, 404)
 
-            driver_stats_list.append({
-                "id": driver_id,
-                "wins": wins,
-                "podiums": podiums,
-                "poles": poles,
-                "dnfs": dnfs
-            })
+    try:
+        stats = season_stats("drivers", year)
+        if stats.empty:
+            return json_response({"error": f"No driver stats available for {year}"}, 404)
 
-        return jsonify(driver_stats_list)
+        return json_response(stats_records(stats))
 
     except Exception as e:
-        return jsonify({"error": f"Failed to fetch driver stats: {str(e)}"}), 500
+        return json_response({"error": f"Failed to fetch driver stats: {str(e)}"}, 500)
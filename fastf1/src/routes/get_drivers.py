@@ -1,9 +1,9 @@
 from flask import Blueprint, jsonify
 from datetime import datetime, timezone
-import fastf1
 import pandas as pd
 from collections import defaultdict
 from cache import get_event_schedule_cached
+from store import load_session_results
 
 drivers_bp = Blueprint("drivers", __name__, url_prefix="/api/f1")
 
@@ -46,18 +46,14 @@ def get_drivers():
 
         # Load race results
         round_number = int(latest_race["RoundNumber"])
-        session = fastf1.get_session(year, round_number, "R")
-        session.load(telemetry=False, laps=False, weather=False)
-        results = session.results
+        results = load_session_results(year, round_number, "R")
 
         # Fallback if empty
         if results.empty or results[results["FullName"].notna() & results["TeamName"].notna()].empty:
             if second_latest_race is None:
                 return jsonify({"error": "No drivers found in the latest race and no fallback available"}), 404
             round_number = int(second_latest_race["RoundNumber"])
-            session = fastf1.get_session(year, round_number, "R")
-            session.load(telemetry=False, laps=False, weather=False)
-            results = session.results
+            results = load_session_results(year, round_number, "R")
             if results.empty or results[results["FullName"].notna() & results["TeamName"].notna()].empty:
                 return jsonify({"error": "No drivers found in latest or fallback race"}), 404
 
@@ -2,12 +2,14 @@ from flask import Blueprint, jsonify
 from datetime import datetime, timezone
 import pandas as pd
 from cache import get_event_schedule_cached
+from httpcache import no_cache
 
 # Initialize Blueprint for F1 next event countdown API
 next_event_cd_bp = Blueprint("next_event_countdown", __name__, url_prefix="/api/f1")
 
 
 @next_event_cd_bp.route("/get_next_event_countdown")
+@no_cache
 def get_next_event_countdown():
     """
     Fetch and return a countdown to the next F1 race in the current season.
@@ -1,62 +1,85 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint
 import pandas as pd
 from utils import iso2_country, iso3_country, slugify_location
 from cache import get_event_schedule_cached
+from materialize import materialized
+from serialize import column, ints, json_response, records, texts
 
 race_calendar_bp = Blueprint("race_calendar", __name__, url_prefix="/api/f1")
 
+# Standard session names
+DEFAULT_SESSIONS = ["Practice 1", "Practice 2", "Practice 3", "Qualifying", "Race"]
+SPRINT_SESSIONS = ["Practice 1", "Qualifying", "Sprint Shootout", "Sprint", "Race"]
+SPRINT_FORMATS = {"sprint", "sprint_qualifying", "sprint_shootout"}
+
+
+def _format_dates(values, fmt):
+    """Formats datetimes with strftime, None for missing values."""
+    return [value.strftime(fmt) if pd.notna(value) and hasattr(value, "strftime") else None for value in values]
+
+
+def _session_dates(schedule, i):
+    """
+    Returns the dates of session i for every event, preferring the UTC column
+    and falling back to the local one where it is missing.
+    """
+
+    dates = pd.Series([None] * len(schedule), index=schedule.index, dtype=object)
+    for suffix in ["Date", "DateUtc"]:  # later columns take precedence
+        col = f"Session{i}{suffix}"
+        if col in schedule.columns:
+            values = schedule[col].astype(object)
+            dates = values.where(values.notna(), dates)
+    return dates
+
+
 @race_calendar_bp.route("/get_race_calendar/<int:year>")
+@materialized(year_arg="year")
 def get_race_calendar(year):
     try:
-        # Standard session names
-        default_sessions = ["Practice 1", "Practice 2", "Practice 3", "Qualifying", "Race"]
-
         schedule = get_event_schedule_cached(year, include_testing=False)
-        calendar = []
 
-        for _, event in schedule.iterrows():
-            sessions = []
-
-            # Pick session labels based on event format
-            if str(event.get("EventFormat")).lower() in {"sprint", "sprint_qualifying", "sprint_shootout"}:
-                session_names = ["Practice 1", "Qualifying", "Sprint Shootout", "Sprint", "Race"]
-            else:
-                session_names = default_sessions
-
-            # Build session list
-            for i, session_name in enumerate(session_names, start=1):
-                for suffix in ["DateUtc", "Date"]:  # try both
-                    col = f"Session{i}{suffix}"
-                    if col in event and pd.notna(event[col]):
-                        dt = event[col]
-                        if hasattr(dt, "strftime"):
-                            sessions.append({
-                                "name": session_name,
-                                "date": dt.strftime("%b %d"),
-                                "time": dt.strftime("%H:%M"),
-                            })
-                        break  # found valid column for this session
+        # Map country codes for the whole schedule in one batch
+        schedule = schedule.assign(
+            CountryCode2=iso2_country(schedule["Country"]),
+            CountryCode3=iso3_country(schedule["Country"]),
+        ).sort_values("RoundNumber", kind="stable")
+
+        # Pick session labels based on event format
+        is_sprint = column(schedule, "EventFormat", "").astype(str).str.lower().isin(SPRINT_FORMATS).tolist()
+
+        # Format every session column once instead of once per event
+        session_dates = []
+        for i in range(1, len(DEFAULT_SESSIONS) + 1):
+            dates = _session_dates(schedule, i)
+            session_dates.append(list(zip(_format_dates(dates, "%b %d"), _format_dates(dates, "%H:%M"))))
 
+        events = records(
+            round=ints(column(schedule, "RoundNumber", 0).fillna(0)),
+            country=texts(column(schedule, "Country", "")),
+            location=texts(column(schedule, "Location", "")),
+            officialEventName=texts(column(schedule, "OfficialEventName", "")),
+            eventName=texts(column(schedule, "EventName", "")),
+            eventDate=_format_dates(column(schedule, "EventDate"), "%Y-%m-%dT%H:%M:%SZ"),
+            eventFormat=texts(column(schedule, "EventFormat", "")),
+            countryCode2=[code or None for code in schedule["CountryCode2"]],
+            countryCode3=[code or None for code in schedule["CountryCode3"]],
+            slug=[slugify_location(location) for location in column(schedule, "Location", "")],
+        )
+
+        # Build session lists
+        calendar = []
+        for row, event in enumerate(events):
+            session_names = SPRINT_SESSIONS if is_sprint[row] else DEFAULT_SESSIONS
+            sessions = [
+                {"name": name, "date": dates[row][0], "time": dates[row][1]}
+                for name, dates in zip(session_names, session_dates)
+                if dates[row][0] is not None
+            ]
             if sessions:
-                calendar.append({
-                    "round": int(event.get("RoundNumber", 0)),
-                    "country": str(event.get("Country", "")),
-                    "location": str(event.get("Location", "")),
-                    "officialEventName": str(event.get("OfficialEventName", "")),
-                    "eventName": str(event.get("EventName", "")),
-                    "eventDate": event["EventDate"].strftime("%Y-%m-%dT%H:%M:%SZ")
-                                 if pd.notna(event.get("EventDate")) and hasattr(event["EventDate"], "strftime")
-                                 else None,
-                    "eventFormat": str(event.get("EventFormat", "")),
-                    "countryCode2": iso2_country(event.get("Country")) or None,
-                    "countryCode3": iso3_country(event.get("Country")) or None,
-                    "slug": slugify_location(event.get("Location", "")),
-                    "sessions": sessions,
-                })
-
-        # Sort calendar by round
-        calendar.sort(key=lambda r: r["round"])
-        return jsonify({"year": year, "calendar": calendar})
+                calendar.append({**event, "sessions": sessions})
+
+        return json_response({"year": year, "calendar": calendar})
 
     except Exception as e:
-        return jsonify({"error": f"Failed to fetch race calendar: {str(e)}"}), 500
+        return json_response({"error": f"Failed to fetch race calendar: {str(e)}"}, 500)
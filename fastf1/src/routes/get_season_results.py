@@ -0,0 +1,67 @@
+from flask import Blueprint, request
+from cache import get_event_schedule_cached
+from season import completed_rounds
+from serialize import (
+    json_response,
+    qualifying_result_records,
+    race_result_records,
+    sprint_result_records,
+)
+from store import load_season_results
+
+season_results_bp = Blueprint("season_results", __name__, url_prefix="/api/f1")
+
+# Query parameter value -> (season store session, payload builder)
+SESSIONS = {
+    "race": ("race", race_result_records),
+    "quali": ("qualifying", qualifying_result_records),
+    "qualifying": ("qualifying", qualifying_result_records),
+    "sprint": ("sprint", sprint_result_records),
+}
+DEFAULT_SESSIONS = "race,quali,sprint"
+
+
+@season_results_bp.route("/season/<int:year>/results")
+def get_season_results(year):
+    """
+    Return the results of every completed round of a season in one response,
+    so season views don't need one request per round and session.
+    Sessions are picked with ?sessions=race,quali,sprint (default: all).
+    """
+    try:
+        requested = [s.strip().lower() for s in request.args.get("sessions", DEFAULT_SESSIONS).split(",") if s.strip()]
+        unknown = [s for s in requested if s not in SESSIONS]
+        if unknown or not requested:
+            return json_response({"error": f"Unknown sessions: {', '.join(unknown) or 'none given'}"}, 400)
+        sessions = list(dict.fromkeys(SESSIONS[s] for s in requested))
+
+        schedule = get_event_schedule_cached(year, include_testing=False)
+        if schedule.empty:
+            return json_response({"error": f"No event schedule found for {year}"}, 404)
+
+        rounds = completed_rounds(schedule)
+        names = dict(zip(schedule["RoundNumber"].astype(int), schedule["EventName"].astype(str)))
+
+        # Every round comes from the season store instead of per-round calls
+        season = load_season_results(year, rounds)
+        by_round = {
+            session: dict(tuple(season[session].groupby(season[session]["round"].astype(int))))
+            if not season[session].empty else {}
+            for session, _ in sessions
+        }
+
+        payload = []
+        for round_number in rounds:
+            # Skip rounds whose results are not published yet
+            if not any(round_number in frames for frames in by_round.values()):
+                continue
+            entry = {"round": round_number, "eventName": names.get(round_number)}
+            for session, build in sessions:
+                df = by_round[session].get(round_number)
+                entry[session] = build(df) if df is not None else []
+            payload.append(entry)
+
+        return json_response({"year": year, "sessions": [session for session, _ in sessions], "rounds": payload})
+
+    except Exception as e:
+        return json_response({"error": f"Failed to fetch season results: {str(e)}"}, 500)
@@ -1,6 +1,7 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint
 import pandas as pd
 from cache import get_seasons_cached
+from serialize import column, ints, json_response, records, texts
 
 seasons_bp = Blueprint("seasons", __name__, url_prefix="/api/f1")
 
@@ -15,22 +16,19 @@ def get_seasons():
         # Fetch seasons data with a limit of 100
         seasons_df = get_seasons_cached(limit=100)
         if seasons_df is None or seasons_df.empty:
-            return jsonify({"error": "No seasons data found"}), 404
+            return json_response({"error": "No seasons data found"}, 404)
 
         # Convert season column to numeric safely
         seasons_df["season"] = pd.to_numeric(seasons_df.get("season", pd.Series()), errors="coerce")
 
-        # Build list of valid seasons
-        seasons_list = [
-            {"year": int(row["season"]), "url": row.get("seasonUrl", "")}
-            for _, row in seasons_df.iterrows()
-            if pd.notna(row["season"])
-        ]
+        # Keep valid seasons, sorted descending (latest first)
+        seasons_df = seasons_df[seasons_df["season"].notna()].sort_values("season", ascending=False, kind="stable")
+        seasons_list = records(
+            year=ints(seasons_df["season"]),
+            url=texts(column(seasons_df, "seasonUrl", "")),
+        )
 
-        # Sort seasons descending (latest first)
-        seasons_list.sort(key=lambda s: -s["year"])
-
-        return jsonify(seasons_list)
+        return json_response(seasons_list)
 
     except Exception as e:
-        return jsonify({"error": f"Failed to fetch seasons: {str(e)}"}), 500
+        return json_response({"error": f"Failed to fetch seasons: {str(e)}"}, 500)
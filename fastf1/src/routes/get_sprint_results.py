@@ -1,6 +1,6 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint
 from cache import get_sprint_results_cached
-import pandas as pd
+from serialize import json_response, sprint_result_records
 
 sprint_results_bp = Blueprint("sprint_results", __name__, url_prefix="/api/f1")
 
@@ -13,30 +13,19 @@ def get_sprint_results(year, round):
     try:
         res = get_sprint_results_cached(year, round)
         if not res or not res.content or res.content[0].empty:
-            return jsonify({"error": "No sprint results available"}), 404
+            return json_response({"error": "No sprint results available"}, 404)
 
         df = res.content[0]
 
-        sprint_results = []
-        for _, row in df.iterrows():
-            sprint_results.append({
-                "position": int(row.get("position", 0)),
-                "driver": f"{row.get('givenName', '')} {row.get('familyName', '')}".strip(),
-                "id": row.get("driverCode", ""),
-                "team": row.get("constructorName", ""),
-                "laps": int(row["laps"]) if pd.notna(row.get("laps")) else None,
-                "time": str(row.get("raceTime", "")),
-                "grid": row.get("grid"),
-                "points": row.get("points", 0)
-            })
+        sprint_results = sprint_result_records(df)
 
-        return jsonify({
+        return json_response({
             "year": year,
             "round": round,
             "results": sprint_results
         })
 
     except ValueError:
-        return jsonify({"error": "Invalid year or round"}), 400
+        return json_response({"error": "Invalid year or round"}, 400)
     except Exception as e:
-        return jsonify({"error": f"Failed to fetch sprint results: {str(e)}"}), 500
+        return json_response({"error": f"Failed to fetch sprint results: {str(e)}"}, 500)
@@ -0,0 +1,276 @@
+from datetime import datetime, timezone
+import re
+import pandas as pd
+from backend import backend, get_or_compute
+from store import load_season_results, store_version
+
+# Statuses that count as a retirement for constructor stats
+DNF_PATTERN = re.compile(
+    r"Did Not Finish|Retired|Accident|Collision|Disqualified|Withdrew|"
+    r"Mechanical|Engine|Gearbox|Transmission|Clutch|Hydraulics|Electrical|"
+    r"Suspension|Brakes|Differential|Overheating|Oil leak|Wheel|Tyre|"
+    r"Puncture|Driveshaft|Fuel|Exhaust|Throttle|Steering|Chassis|Battery|"
+    r"Alternator|Radiator|Turbo|Power Unit|ERS|Spun off|Damage|Debris",
+    re.IGNORECASE,
+)
+
+# Counters reported by the driver and constructor stats
+STAT_COLUMNS = ["wins", "podiums", "poles", "dnfs"]
+
+# Built season frames are keyed by their rounds and the version of the stored
+# results, so they only go unused once another race finished or the store was
+# rewritten; keep them a week at most
+SEASON_RESULTS_TTL = 7 * 24 * 3600
+SEASON_RESULTS_PREFIX = "season_results:"
+
+
+def completed_rounds(schedule, now=None):
+    """
+    Returns the round numbers whose main race has already taken place.
+
+    Args:
+        schedule (pd.DataFrame): Event schedule as returned by get_event_schedule_cached.
+        now (datetime, optional): Reference time, defaults to the current UTC time.
+
+    Returns:
+        list[int]: Completed round numbers in schedule order.
+    """
+
+    now = now or datetime.now(timezone.utc)
+    race_dates = pd.to_datetime(schedule["Session5Date"], utc=True)
+    return [int(rnd) for rnd in schedule.loc[race_dates <= now, "RoundNumber"]]
+
+
+def race_boundaries(schedule, now=None):
+    """
+    Returns the start of the most recent and of the next main race.
+
+    Args:
+        schedule (pd.DataFrame): Event schedule as returned by get_event_schedule_cached.
+        now (datetime, optional): Reference time, defaults to the current UTC time.
+
+    Returns:
+        tuple[datetime | None, datetime | None]: Last completed and next race start (UTC).
+    """
+
+    now = now or datetime.now(timezone.utc)
+    race_dates = pd.to_datetime(schedule["Session5Date"], utc=True).dropna()
+    past, upcoming = race_dates[race_dates <= now], race_dates[race_dates > now]
+    last_race = past.max().to_pydatetime() if not past.empty else None
+    next_race = upcoming.min().to_pydatetime() if not upcoming.empty else None
+    return last_race, next_race
+
+
+def session_events(schedule):
+    """
+    Flattens the schedule into (start time, round, session name) tuples.
+
+    Args:
+        schedule (pd.DataFrame): Event schedule as returned by get_event_schedule_cached.
+
+    Returns:
+        list[tuple[datetime, int, str]]: Sessions sorted by start time (UTC).
+    """
+
+    events = []
+    for i in range(1, 6):
+        names, dates = schedule.get(f"Session{i}"), schedule.get(f"Session{i}Date")
+        if names is None or dates is None:
+            continue
+        dates = pd.to_datetime(dates, utc=True)
+        for rnd, name, date in zip(schedule["RoundNumber"], names, dates):
+            if pd.notna(date) and name:
+                events.append((date.to_pydatetime(), int(rnd), str(name)))
+    return sorted(events)
+
+
+def build_season_results(year, rounds):
+    """
+    Concatenates the race, sprint and qualifying results of every given round
+    from the season store into a single long-form frame.
+
+    Args:
+        year (int): Season to fetch.
+        rounds (list[int]): Rounds to include.
+
+    Returns:
+        pd.DataFrame: One row per driver per session, with 'session' and 'round'
+            columns added, 'position'/'grid' cast to numeric and the status
+            classified into 'dnf' (not a classified finisher) and 'retired'
+            (matches DNF_PATTERN).
+    """
+
+    frames = [
+        df.assign(session=session)
+        for session, df in load_season_results(year, rounds).items()
+        if not df.empty
+    ]
+
+    if not frames:
+        return pd.DataFrame(columns=[
+            "session", "round", "driverId", "constructorId",
+            "position", "grid", "status", "dnf", "retired",
+        ])
+
+    # Columns a session leaves all-NA (e.g. Q3 without a Q3) would decide the
+    # dtypes otherwise; they are added back, empty, after the concat
+    columns = list(dict.fromkeys(column for df in frames for column in df.columns))
+    results = pd.concat([df.dropna(axis=1, how="all") for df in frames], ignore_index=True, sort=False)
+    results = results.reindex(columns=columns)
+    results["position"] = pd.to_numeric(results["position"], errors="coerce")
+    results["grid"] = pd.to_numeric(results.get("grid"), errors="coerce")
+
+    status = results["status"].astype(str)
+    lowered = status.str.lower()
+    results["dnf"] = ~(lowered.str.startswith("finished") | lowered.str.contains("lap", regex=False))
+    results["retired"] = results["status"].notna() & status.str.contains(DNF_PATTERN)
+    return results
+
+
+def get_season_results(year, rounds):
+    """
+    Memoized build_season_results, shared by the driver and constructor stats
+    and, through the shared cache backend, by every worker process. The key
+    includes the completed rounds and the store version, so a newly finished
+    race or reloaded results yield a fresh frame. A frame missing any of the
+    rounds (e.g. Ergast has not published the latest race yet), or built
+    while the store changed, is returned but not cached. Concurrent misses
+    for the same key share one build. Callers must treat the returned frame
+    as read-only.
+
+    Args:
+        year (int): Season to fetch.
+        rounds (tuple[int]): Rounds to include.
+
+    Returns:
+        pd.DataFrame: Long-form results frame.
+    """
+
+    version = store_version(year)
+    key = f"{SEASON_RESULTS_PREFIX}{year}:{','.join(str(rnd) for rnd in rounds)}@{version}"
+    wanted = {int(rnd) for rnd in rounds}
+
+    def complete(results):
+        # A build that wrote to the store belongs under the next version's key
+        return wanted <= set(results["round"].astype(int)) and store_version(year) == version
+
+    return get_or_compute(key, build_season_results, year, list(rounds), ttl=SEASON_RESULTS_TTL, cache_if=complete)
+
+
+def invalidate_season_results(year=None):
+    """
+    Drops the memoized season frames of one season, or of every season.
+
+    Args:
+        year (int, optional): Season to drop, defaults to all.
+    """
+
+    backend.delete_prefix(SEASON_RESULTS_PREFIX if year is None else f"{SEASON_RESULTS_PREFIX}{year}:")
+
+
+def _points(results):
+    """Points scored per result row, 0 where Ergast has none (e.g. qualifying)."""
+    if "points" not in results:
+        return pd.Series(0.0, index=results.index)
+    return pd.to_numeric(results["points"], errors="coerce").fillna(0.0)
+
+
+def _poles(results):
+    """Flags qualifying P1 rows."""
+    return (results["session"] == "qualifying") & (results["position"] == 1)
+
+
+def driver_flags(results):
+    """
+    Flags what every result row counts towards in the driver stats.
+
+    Wins, podiums, DNFs and points count race and sprint results. Poles count
+    qualifying P1 and sprint grid P1.
+
+    Args:
+        results (pd.DataFrame): Long-form frame from build_season_results.
+
+    Returns:
+        pd.DataFrame: 'id', one boolean column per STAT_COLUMNS entry, 'points'
+            and 'raced' (race result rows), aligned with results.
+    """
+
+    session = results["session"]
+    position = results["position"]
+    classified = session.isin(["race", "sprint"])
+
+    return pd.DataFrame({
+        "id": results["driverId"],
+        "wins": classified & (position == 1),
+        "podiums": classified & (position <= 3),
+        "poles": _poles(results) | ((session == "sprint") & (results["grid"] == 1)),
+        "dnfs": classified & results["dnf"].astype(bool),
+        "points": _points(results).where(classified, 0.0),
+        "raced": session == "race",
+    })
+
+
+def constructor_flags(results):
+    """
+    Flags what every result row counts towards in the constructor stats.
+
+    Wins, podiums and DNFs count race results only. Poles count qualifying P1.
+    Points count race and sprint results.
+
+    Args:
+        results (pd.DataFrame): Long-form frame from build_season_results.
+
+    Returns:
+        pd.DataFrame: 'id', one boolean column per STAT_COLUMNS entry, 'points'
+            and 'raced' (race result rows), aligned with results.
+    """
+
+    session = results["session"]
+    position = results["position"]
+    race = session == "race"
+
+    return pd.DataFrame({
+        "id": results["constructorId"],
+        "wins": race & (position == 1),
+        "podiums": race & (position <= 3),
+        "poles": _poles(results),
+        "dnfs": race & results["retired"].astype(bool),
+        "points": _points(results).where(session.isin(["race", "sprint"]), 0.0),
+        "raced": race,
+    })
+
+
+def driver_stats(results):
+    """
+    Computes wins, podiums, poles and DNFs for every driver in one grouped
+    pass, counted as described in driver_flags.
+
+    Args:
+        results (pd.DataFrame): Long-form frame from build_season_results.
+
+    Returns:
+        list[dict]: One entry per driver that took part in a race or sprint.
+    """
+
+    flags = driver_flags(results)
+    stats = flags.groupby("id")[STAT_COLUMNS].sum().astype(int)
+    stats = stats.loc[stats.index.isin(results.loc[results["session"].isin(["race", "sprint"]), "driverId"])]
+    return stats.reset_index().to_dict(orient="records")
+
+
+def constructor_stats(results):
+    """
+    Computes wins, podiums, poles and DNFs for every constructor in one
+    grouped pass, counted as described in constructor_flags.
+
+    Args:
+        results (pd.DataFrame): Long-form frame from build_season_results.
+
+    Returns:
+        list[dict]: One entry per constructor that took part in a race.
+    """
+
+    flags = constructor_flags(results)
+    stats = flags.groupby("id")[STAT_COLUMNS].sum().astype(int)
+    stats = stats.loc[stats.index.isin(results.loc[results["session"] == "race", "constructorId"])]
+    return stats.reset_index().to_dict(orient="records")
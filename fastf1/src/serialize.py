@@ -0,0 +1,316 @@
+import json
+import numpy as np
+import pandas as pd
+from flask import Response
+from metrics import span
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to the standard library encoder
+    orjson = None
+
+# ------------------------------------------------------------------
+# Column-wise DataFrame serialization
+# ------------------------------------------------------------------
+
+
+def column(df, name, default=None):
+    """
+    Returns a column, or a column filled with default if the frame lacks it.
+
+    Args:
+        df (pd.DataFrame): Source frame.
+        name (str): Column name.
+        default: Fill value for a missing column.
+
+    Returns:
+        pd.Series: The column.
+    """
+
+    if name in df.columns:
+        return df[name]
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+
+def nullable(series):
+    """
+    Converts a Series to a list of Python objects with NaN/NaT/None as None.
+    """
+
+    missing = series.isna().to_numpy()
+    values = series.tolist()
+    if not missing.any():
+        return values
+    return [None if miss else value for value, miss in zip(values, missing)]
+
+
+def _numbers(series):
+    """Returns a Series as a float array plus its missing-value mask."""
+    if series.dtype.kind in "iuf":
+        values = series.to_numpy(dtype=float)
+    else:
+        values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float)
+    return values, np.isnan(values)
+
+
+def ints(series):
+    """
+    Casts a Series to a list of Python ints (truncating like int()), with
+    missing or non-numeric values as None.
+    """
+
+    if series.dtype.kind in "iu":
+        return series.tolist()
+    values, missing = _numbers(series)
+    values = np.trunc(np.where(missing, 0, values)).astype(np.int64).tolist()
+    if not missing.any():
+        return values
+    return [None if miss else value for value, miss in zip(values, missing)]
+
+
+def floats(series):
+    """
+    Casts a Series to a list of Python floats, with missing or non-numeric values as None.
+    """
+
+    values, missing = _numbers(series)
+    values = values.tolist()
+    if not missing.any():
+        return values
+    return [None if miss else value for value, miss in zip(values, missing)]
+
+
+def texts(series):
+    """
+    Casts a Series to a list of strings, with missing values as None.
+    """
+
+    return [value if value is None or isinstance(value, str) else str(value) for value in nullable(series)]
+
+
+def full_names(df, first="givenName", last="familyName"):
+    """
+    Concatenates first and last name columns, stripping missing parts.
+
+    Returns:
+        list[str]: "First Last" per row.
+    """
+
+    firsts = texts(column(df, first, ""))
+    lasts = texts(column(df, last, ""))
+    return [f"{given or ''} {family or ''}".strip() for given, family in zip(firsts, lasts)]
+
+
+def records(**fields):
+    """
+    Zips equally long per-field value lists into a list of row dicts.
+
+    Args:
+        **fields (list): Output key -> values, e.g. as built by ints() or texts().
+
+    Returns:
+        list[dict]: One dict per row, keys in argument order.
+    """
+
+    keys = list(fields)
+    return [dict(zip(keys, row)) for row in zip(*fields.values())]
+
+
+def _default(value):
+    """Encodes the numpy and pandas scalars the standard library cannot."""
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return None if np.isnan(value) else float(value)
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, (pd.Timestamp, pd.Timedelta)):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload):
+    """
+    Encodes a payload to JSON bytes, using orjson when it is installed.
+
+    Args:
+        payload: JSON-compatible data (numpy scalars allowed).
+
+    Returns:
+        bytes: Encoded JSON.
+    """
+
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, default=_default, separators=(",", ":")).encode()
+
+
+def json_response(payload, status=200):
+    """
+    Builds a JSON response with the fast encoder; drop-in for jsonify.
+
+    Args:
+        payload: JSON-compatible data.
+        status (int): HTTP status code.
+
+    Returns:
+        flask.Response: The response.
+    """
+
+    with span("serialize"):
+        body = dumps(payload)
+    return Response(body, status=status, mimetype="application/json")
+
+
+# ------------------------------------------------------------------
+# Session result payloads
+# ------------------------------------------------------------------
+
+
+def race_result_records(df):
+    """
+    Builds the race results payload rows.
+
+    Args:
+        df (pd.DataFrame): Ergast race results.
+
+    Returns:
+        list[dict]: One dict per classified driver.
+    """
+
+    return records(
+        position=ints(column(df, "position")),
+        driver=full_names(df),
+        id=texts(column(df, "driverCode", "")),
+        team=texts(column(df, "constructorName", "")),
+        laps=ints(column(df, "laps")),
+        time=texts(column(df, "raceTime")),
+        grid=ints(column(df, "grid")),
+        points=floats(column(df, "points")),
+    )
+
+
+def qualifying_result_records(df):
+    """
+    Builds the qualifying results payload rows.
+
+    Args:
+        df (pd.DataFrame): Ergast qualifying results.
+
+    Returns:
+        list[dict]: One dict per driver.
+    """
+
+    return records(
+        position=ints(column(df, "position", 0)),
+        id=texts(column(df, "driverCode", "")),
+        driver=full_names(df),
+        q1_time=texts(column(df, "Q1")),
+        q2_time=texts(column(df, "Q2")),
+        q3_time=texts(column(df, "Q3")),
+    )
+
+
+def sprint_result_records(df):
+    """
+    Builds the sprint results payload rows.
+
+    Args:
+        df (pd.DataFrame): Ergast sprint results.
+
+    Returns:
+        list[dict]: One dict per classified driver.
+    """
+
+    return records(
+        position=ints(column(df, "position", 0)),
+        driver=full_names(df),
+        id=texts(column(df, "driverCode", "")),
+        team=texts(column(df, "constructorName", "")),
+        laps=ints(column(df, "laps")),
+        time=texts(column(df, "raceTime", "")),
+        grid=ints(column(df, "grid")),
+        points=floats(column(df, "points", 0)),
+    )
+
+
+# ------------------------------------------------------------------
+# Compact season payloads
+# ------------------------------------------------------------------
+
+
+def compact_points(entries, races, key):
+    """
+    Hoists the race metadata repeated in every entry's 'races' list into one
+    shared table, and turns each entry's per-race points and positions into
+    arrays aligned with that table (None where the entry has no result).
+    Races are matched by round, as names and venues can repeat in a season.
+
+    Args:
+        entries (list[dict]): Standings entries, each with a 'races' list of
+            {round, name, slug, country, points, position}.
+        races (list[dict]): Race table in round order, each with round, name,
+            slug and country.
+        key (str): Name of the standings list in the payload, e.g. "drivers".
+
+    Returns:
+        dict: {"races": races, key: entries with "points" and "positions" arrays}.
+    """
+
+    index = {race["round"]: i for i, race in enumerate(races)}
+    compact = []
+    for entry in entries:
+        points, positions = [None] * len(races), [None] * len(races)
+        for race in entry["races"]:
+            i = index[race["round"]]
+            points[i], positions[i] = race["points"], race["position"]
+        compact.append({
+            **{field: value for field, value in entry.items() if field != "races"},
+            "points": points,
+            "positions": positions,
+        })
+    return {"races": races, key: compact}
+
+
+# ------------------------------------------------------------------
+# Historical stats payloads
+# ------------------------------------------------------------------
+
+
+def stats_records(df):
+    """
+    Builds season stats payload rows from history index aggregates.
+
+    Args:
+        df (pd.DataFrame): Aggregates with 'id', counters, 'points' and 'races'.
+
+    Returns:
+        list[dict]: One dict per driver or constructor.
+    """
+
+    return records(
+        id=texts(df["id"]),
+        wins=ints(df["wins"]),
+        podiums=ints(df["podiums"]),
+        poles=ints(df["poles"]),
+        dnfs=ints(df["dnfs"]),
+        points=floats(df["points"]),
+        races=ints(df["races"]),
+    )
+
+
+def career_records(df):
+    """
+    Builds career stats payload rows: season stats plus the seasons raced.
+
+    Args:
+        df (pd.DataFrame): Career totals from the history index.
+
+    Returns:
+        list[dict]: One dict per driver or constructor.
+    """
+
+    rows = stats_records(df)
+    for row, seasons, first, last in zip(rows, ints(df["seasons"]), ints(df["firstSeason"]), ints(df["lastSeason"])):
+        row.update(seasons=seasons, firstSeason=first, lastSeason=last)
+    return rows
@@ -0,0 +1,64 @@
+import threading
+
+# ------------------------------------------------------------------
+# Request coalescing
+# ------------------------------------------------------------------
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls sharing a key: the first caller runs the
+    computation, callers arriving while it is in flight wait for it and get
+    the same result (or exception). Nothing is cached once the call finished.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Runs fn(*args, **kwargs) unless a call for key is already in flight.
+
+        Args:
+            key (Hashable): Identity of the computation, e.g. ("season", 2024).
+            fn (Callable): Computation to run.
+
+        Returns:
+            The computation's result, shared by every coalesced caller.
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self):
+        """Returns the number of computations currently running."""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,66 @@
+import json
+import logging
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------
+# Startup timing and deferred route loading
+# ------------------------------------------------------------------
+
+HEALTH_PATH = "/healthz"
+
+# Filled in by app.load_routes()
+startup_report = {"modules": {}, "routesSeconds": None}
+
+
+def report():
+    """
+    Returns how long startup took: per route module import, all routes, and
+    the cache setup (None until the caches were first used in lazy mode).
+    """
+
+    cache = sys.modules.get("cache")
+    return {**startup_report, "cacheInitSeconds": getattr(cache, "init_seconds", None)}
+
+
+class DeferredLoader:
+    """
+    WSGI middleware that lets a worker accept connections right away while the
+    route modules (and with them pandas and FastF1) are imported in the
+    background. The health check answers immediately; every other request
+    waits until loading has finished.
+    """
+
+    def __init__(self, wsgi_app, load):
+        self.wsgi_app = wsgi_app
+        self._ready = threading.Event()
+        self._error = None
+        threading.Thread(target=self._load, args=(load,), name="route-loader", daemon=True).start()
+
+    def _load(self, load):
+        try:
+            load()
+        except Exception as e:
+            self._error = e
+            logger.exception("Failed to load routes")
+        finally:
+            self._ready.set()
+
+    def _respond(self, start_response, status, payload):
+        body = json.dumps(payload).encode()
+        start_response(status, [("Content-Type", "application/json"), ("Content-Length", str(len(body)))])
+        return [body]
+
+    def __call__(self, environ, start_response):
+        if environ.get("PATH_INFO") == HEALTH_PATH:
+            ready = self._ready.is_set() and self._error is None
+            return self._respond(start_response, "200 OK", {"ready": ready, "startup": report()})
+
+        self._ready.wait()
+        if self._error is not None:
+            return self._respond(
+                start_response, "503 SERVICE UNAVAILABLE", {"error": f"Failed to load routes: {self._error}"}
+            )
+        return self.wsgi_app(environ, start_response)
@@ -0,0 +1,387 @@
+import logging
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pandas as pd
+from cache import (
+    ERGAST_MAX_CONCURRENCY,
+    ERGAST_PAGE_LIMIT,
+    LRU_MAX_BYTES,
+    get_session_cached,
+    get_race_results_cached,
+    get_sprint_results_cached,
+    get_qualifying_results_cached,
+    get_season_race_results_cached,
+    get_season_sprint_results_cached,
+    get_season_qualifying_results_cached,
+)
+from backend import backend
+from lru import LRUCache
+from singleflight import SingleFlight
+from upstream import forced_refresh
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------
+# Local season results store
+# ------------------------------------------------------------------
+
+# One directory per season, one columnar file per session type
+STORE_DIR = Path("./cache/seasons")
+
+# Ergast wrapper used for each session type of a race weekend
+SESSION_FETCHERS = {
+    "race": get_race_results_cached,
+    "sprint": get_sprint_results_cached,
+    "qualifying": get_qualifying_results_cached,
+}
+
+# Season-wide (paginated) Ergast wrapper for each session type
+SEASON_FETCHERS = {
+    "race": get_season_race_results_cached,
+    "sprint": get_season_sprint_results_cached,
+    "qualifying": get_season_qualifying_results_cached,
+}
+
+# Result rows a round adds to a season-wide query (one per driver), used to
+# estimate how many pages of ERGAST_PAGE_LIMIT rows such a query takes
+ROWS_PER_ROUND = 20
+
+# One file per loaded session's results
+SESSIONS_DIR = Path("./cache/sessions")
+_session_results = LRUCache(LRU_MAX_BYTES)
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+# Coalesces concurrent loads of the same season or session
+_flights = SingleFlight()
+
+
+@contextmanager
+def _season_lock(year):
+    """Serializes writes to a season's files across threads and worker processes."""
+    with _locks_guard:
+        lock = _locks.setdefault(year, threading.Lock())
+    with lock, backend.lock(f"season_store:{year}"):
+        yield
+
+
+def read_frame(base):
+    """
+    Reads a stored frame, preferring Parquet and falling back to pickle.
+    """
+
+    parquet, pickled = base.with_suffix(".parquet"), base.with_suffix(".pkl")
+    if parquet.exists():
+        return pd.read_parquet(parquet)
+    if pickled.exists():
+        return pd.read_pickle(pickled)
+    return pd.DataFrame()
+
+
+def write_frame(df, base):
+    """
+    Writes a frame as Parquet, falling back to pickle when pyarrow is missing
+    or a column cannot be represented in Arrow.
+    """
+
+    base.parent.mkdir(parents=True, exist_ok=True)
+    parquet, pickled = base.with_suffix(".parquet"), base.with_suffix(".pkl")
+    try:
+        df.to_parquet(parquet, index=False)
+        pickled.unlink(missing_ok=True)
+    except Exception:
+        parquet.unlink(missing_ok=True)
+        df.to_pickle(pickled)
+
+
+def _fetch_round(fetch, year, round_):
+    """
+    Fetches a single round's results.
+
+    Returns:
+        tuple[pd.DataFrame | None, bool]: The results, None when nothing is
+            published, and whether the request succeeded.
+    """
+
+    try:
+        response = fetch(year, round_)
+    except Exception:
+        logger.warning("Fetching %s %s round %s failed", fetch.__name__, year, round_, exc_info=True)
+        return None, False
+    if response and response.content and not response.content[0].empty:
+        return response.content[0].assign(round=round_), True
+    return None, True
+
+
+def _fetch_season(fetch, year, rounds):
+    """
+    Fetches a whole season with one paginated query and keeps the given rounds.
+
+    Returns:
+        tuple[dict[int, pd.DataFrame], bool]: Results per published round and
+            whether the request succeeded.
+    """
+
+    try:
+        df = fetch(year)
+    except Exception:
+        logger.warning("Fetching %s %s failed", fetch.__name__, year, exc_info=True)
+        return {}, False
+    if df.empty:
+        return {}, True
+    df = df[df["round"].astype(int).isin(rounds)]
+    return {rnd: frame for rnd, frame in df.groupby(df["round"].astype(int))}, True
+
+
+def _season_query_pages(rounds):
+    """
+    Estimates the requests the season-wide queries take to cover the given
+    rounds: every session type is paged through from round 1 on.
+
+    Args:
+        rounds (list[int]): Rounds to fetch.
+
+    Returns:
+        int: Estimated number of pages over all session types.
+    """
+
+    pages = -(-max(rounds) * ROWS_PER_ROUND // ERGAST_PAGE_LIMIT)
+    return len(SEASON_FETCHERS) * pages
+
+
+def _refreshed(fetch):
+    """Wraps a fetcher so its Ergast requests bypass cached responses."""
+
+    @wraps(fetch)
+    def wrapper(*args, **kwargs):
+        with forced_refresh():
+            return fetch(*args, **kwargs)
+
+    return wrapper
+
+
+def _fetch_rounds(year, rounds, refresh=False):
+    """
+    Fetches every session of the given rounds concurrently, with season-wide
+    queries when they take fewer pages than per-round queries take requests.
+    Rounds whose race results are not published yet, and rounds with a
+    session whose request failed, are dropped so they are retried later; a
+    failed request is not mistaken for a session without results.
+
+    Args:
+        year (int): Season to fetch.
+        rounds (list[int]): Rounds to fetch.
+        refresh (bool): Bypass cached Ergast responses.
+
+    Returns:
+        tuple[dict[str, list[pd.DataFrame]], set[int]]: Fetched frames per
+            session type, and the rounds with a failed request.
+    """
+
+    fetched = {session: [] for session in SESSION_FETCHERS}
+    if not rounds:
+        return fetched, set()
+
+    session_fetchers, season_fetchers = SESSION_FETCHERS, SEASON_FETCHERS
+    if refresh:
+        session_fetchers = {session: _refreshed(fetch) for session, fetch in session_fetchers.items()}
+        season_fetchers = {session: _refreshed(fetch) for session, fetch in season_fetchers.items()}
+
+    if _season_query_pages(rounds) < len(SESSION_FETCHERS) * len(rounds):
+        with ThreadPoolExecutor(max_workers=min(ERGAST_MAX_CONCURRENCY, len(season_fetchers))) as pool:
+            seasons = dict(zip(
+                season_fetchers,
+                pool.map(lambda session: _fetch_season(season_fetchers[session], year, rounds), season_fetchers),
+            ))
+        results = {
+            (session, rnd): (seasons[session][0].get(rnd), seasons[session][1])
+            for session in SESSION_FETCHERS for rnd in rounds
+        }
+    else:
+        tasks = [(session, rnd) for rnd in rounds for session in SESSION_FETCHERS]
+        with ThreadPoolExecutor(max_workers=min(ERGAST_MAX_CONCURRENCY, len(tasks))) as pool:
+            frames = pool.map(lambda task: _fetch_round(session_fetchers[task[0]], year, task[1]), tasks)
+            results = dict(zip(tasks, frames))
+
+    failed = {rnd for (session, rnd), (df, ok) in results.items() if not ok}
+    published = {rnd for rnd in rounds if results[("race", rnd)][0] is not None and rnd not in failed}
+    for (session, rnd), (df, ok) in results.items():
+        if df is not None and rnd in published:
+            fetched[session].append(df)
+    return fetched, failed
+
+
+def stored_rounds(year):
+    """
+    Returns the rounds of a season that are already held in the store.
+    A round counts as stored once its race results are present.
+
+    Args:
+        year (int): Season to inspect.
+
+    Returns:
+        set[int]: Stored round numbers.
+    """
+
+    race = read_frame(STORE_DIR / str(year) / "race")
+    return set(race["round"].astype(int)) if not race.empty else set()
+
+
+def store_version(year):
+    """
+    Returns a token that changes whenever a season's stored results are
+    written, so values derived from them can be keyed by it in every process.
+
+    Args:
+        year (int): Season to inspect.
+
+    Returns:
+        str: Modification time and size of the stored race results, "0" when
+            none are stored.
+    """
+
+    base = STORE_DIR / str(year) / "race"
+    for path in (base.with_suffix(".parquet"), base.with_suffix(".pkl")):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+    return "0"
+
+
+def load_season_results(year, rounds):
+    """
+    Returns the normalized race, sprint and qualifying results of a season,
+    fetching only the requested rounds that are not yet in the store.
+    Concurrent callers asking for the same rounds share one load.
+
+    Raises:
+        RuntimeError: A request for a missing round failed. The rounds that
+            were fetched in full are stored before raising.
+
+    Args:
+        year (int): Season to load.
+        rounds (list[int]): Completed rounds to include.
+
+    Returns:
+        dict[str, pd.DataFrame]: One frame per session type, each with a 'round' column.
+    """
+
+    rounds = tuple(int(rnd) for rnd in rounds)
+    return _flights.do(("season", year, rounds), _load_season_results, year, rounds)
+
+
+def _load_season_results(year, rounds):
+    season_dir = STORE_DIR / str(year)
+
+    with _season_lock(year):
+        frames = {session: read_frame(season_dir / session) for session in SESSION_FETCHERS}
+        have = set(frames["race"]["round"].astype(int)) if not frames["race"].empty else set()
+        missing = [int(rnd) for rnd in rounds if int(rnd) not in have]
+
+        fetched, failed = _fetch_rounds(year, missing)
+        _store_rounds(season_dir, frames, fetched)
+
+    # A season with rounds silently left out would be cached as complete
+    if failed:
+        raise RuntimeError(f"Failed to fetch results of {year} round(s) {sorted(failed)} from Ergast")
+
+    wanted = {int(rnd) for rnd in rounds}
+    return {
+        session: df[df["round"].astype(int).isin(wanted)] if not df.empty else df
+        for session, df in frames.items()
+    }
+
+
+def reload_season_results(year, rounds):
+    """
+    Fetches stored rounds again from Ergast, bypassing cached responses, and
+    replaces them in the store, e.g. once results were amended by post-race
+    penalties. Nothing is replaced unless every session of every round was
+    fetched.
+
+    Raises:
+        RuntimeError: A request for one of the rounds failed.
+
+    Args:
+        year (int): Season to reload.
+        rounds (list[int]): Rounds to fetch again.
+
+    Returns:
+        set[int]: The rounds that were replaced.
+    """
+
+    season_dir = STORE_DIR / str(year)
+    rounds = [int(rnd) for rnd in rounds]
+
+    with _season_lock(year):
+        fetched, failed = _fetch_rounds(year, rounds, refresh=True)
+        if failed:
+            raise RuntimeError(f"Failed to fetch results of {year} round(s) {sorted(failed)} from Ergast")
+
+        # Rounds whose race results are gone upstream are kept as stored
+        replaced = {int(df["round"].iloc[0]) for df in fetched["race"]}
+        frames, dropped = {}, set()
+        for session in SESSION_FETCHERS:
+            df = read_frame(season_dir / session)
+            kept = df[~df["round"].astype(int).isin(replaced)] if not df.empty else df
+            if len(kept) < len(df):
+                dropped.add(session)
+            frames[session] = kept
+        _store_rounds(season_dir, frames, fetched, changed=dropped)
+    return replaced
+
+
+def _store_rounds(season_dir, frames, fetched, changed=()):
+    """
+    Appends fetched rounds to the stored frames and writes back the frames
+    that received rows or are listed in changed.
+    """
+
+    for session, new in fetched.items():
+        if new:
+            existing = [frames[session]] if not frames[session].empty else []
+            frames[session] = pd.concat([*existing, *new], ignore_index=True, sort=False)
+        if new or session in changed:
+            write_frame(frames[session], season_dir / session)
+
+
+def load_session_results(year, round_, session):
+    """
+    Returns the parsed results of a FastF1 session, from memory, then disk,
+    and only loading the session (results only, no laps or telemetry) when
+    neither holds it. Empty results are not stored so they are retried.
+
+    Args:
+        year (int): Season.
+        round_ (int): Round number.
+        session (str): Session identifier, e.g. "R" or "Q".
+
+    Returns:
+        pd.DataFrame: Session results.
+    """
+
+    key = (year, round_, session)
+    results = _session_results.get(key)
+    if results is not None:
+        return results
+
+    return _flights.do(("session", *key), _load_session_results, year, round_, session)
+
+
+def _load_session_results(year, round_, session):
+    base = SESSIONS_DIR / str(year) / f"{round_}_{session}"
+    results = read_frame(base)
+    if results.empty:
+        results = pd.DataFrame(get_session_cached(year, round_, session).results)
+        if not results.empty:
+            write_frame(results, base)
+
+    if not results.empty:
+        _session_results.set((year, round_, session), results)
+    return results
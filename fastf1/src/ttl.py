@@ -0,0 +1,119 @@
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from requests_cache import NEVER_EXPIRE
+from cache import ERGAST_EXPIRE_AFTER, get_event_schedule_cached, set_ergast_expiry
+from season import session_events
+
+# ------------------------------------------------------------------
+# Ergast expiry policy derived from the schedule
+# ------------------------------------------------------------------
+
+FIRST_SEASON = 1950
+
+# A race weekend is "live" from shortly before its first session until a day
+# after its last one, to pick up late results and post-race penalties
+WEEKEND_LEAD = timedelta(hours=1)
+WEEKEND_TAIL = timedelta(hours=24)
+LIVE_TTL = timedelta(minutes=10)
+
+# Between weekends current-season data expires when the next weekend starts
+MAX_TTL = timedelta(days=7)
+
+# How often the policy is recomputed outside of live weekends
+POLICY_REFRESH = timedelta(hours=1)
+
+_valid_until = None
+_lock = threading.Lock()
+
+
+def weekend_windows(schedule):
+    """
+    Returns the live window of every race weekend in the schedule.
+
+    Args:
+        schedule (pd.DataFrame): Event schedule as returned by get_event_schedule_cached.
+
+    Returns:
+        list[tuple[datetime, datetime]]: (start, end) per weekend, sorted by start.
+    """
+
+    weekends = {}
+    for start, rnd, _ in session_events(schedule):
+        first, last = weekends.get(rnd, (start, start))
+        weekends[rnd] = (min(first, start), max(last, start))
+    return sorted((first - WEEKEND_LEAD, last + WEEKEND_TAIL) for first, last in weekends.values())
+
+
+def current_season_ttl(schedule, now):
+    """
+    Picks the expiry for current-season Ergast responses.
+
+    Args:
+        schedule (pd.DataFrame): Current season schedule.
+        now (datetime): Reference time (UTC).
+
+    Returns:
+        tuple[timedelta, datetime]: Expiry to apply and until when that choice holds.
+    """
+
+    windows = weekend_windows(schedule)
+    for start, end in windows:
+        if start <= now <= end:
+            return LIVE_TTL, end
+        if now < start:
+            ttl = min(start - now, MAX_TTL)
+            return max(ttl, LIVE_TTL), min(start, now + POLICY_REFRESH)
+
+    # Season finished, results only change for late amendments
+    return MAX_TTL, now + POLICY_REFRESH
+
+
+def build_policy(year, schedule, now):
+    """
+    Builds the per-URL expiry rules: past seasons never expire, the current
+    season follows the weekend calendar, everything else keeps the default.
+
+    Args:
+        year (int): Current season.
+        schedule (pd.DataFrame | None): Current season schedule, if available.
+        now (datetime): Reference time (UTC).
+
+    Returns:
+        tuple[dict, datetime]: requests-cache urls_expire_after mapping and its validity.
+    """
+
+    if schedule is not None and not schedule.empty:
+        ttl, valid_until = current_season_ttl(schedule, now)
+    else:
+        ttl, valid_until = timedelta(seconds=ERGAST_EXPIRE_AFTER), now + POLICY_REFRESH
+
+    past_seasons = "|".join(str(season) for season in range(FIRST_SEASON, year))
+    policy = {
+        re.compile(rf"/f1/(?:{past_seasons})[/.]"): NEVER_EXPIRE,
+        re.compile(rf"/f1/(?:{year}|current)[/.]"): int(ttl.total_seconds()),
+    }
+    return policy, valid_until
+
+
+def refresh_expiry_policy(now=None):
+    """
+    Recomputes and applies the expiry policy once the previous one lapsed.
+    Cheap to call on every request.
+    """
+
+    global _valid_until
+    now = now or datetime.now(timezone.utc)
+    if _valid_until is not None and now < _valid_until:
+        return
+
+    with _lock:
+        if _valid_until is not None and now < _valid_until:
+            return
+        try:
+            schedule = get_event_schedule_cached(now.year, include_testing=False)
+        except Exception:
+            schedule = None
+        policy, valid_until = build_policy(now.year, schedule, now)
+        set_ergast_expiry(policy)
+        _valid_until = valid_until
@@ -0,0 +1,312 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from flask import g, has_request_context
+from metrics import BUCKETS, add_sample, histogram_lines, new_histogram
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------
+# Upstream call accounting and background revalidation
+# ------------------------------------------------------------------
+
+# How a request sent through requests-cache was answered:
+#   hit          fresh response from the cache, no network
+#   stale        expired response served while it is refreshed in the background
+#   stale_error  expired response served because upstream failed
+#   revalidated  expired response confirmed by a 304 from upstream
+#   miss         full response from upstream
+#   error        the request raised
+RESULTS = ("hit", "stale", "stale_error", "revalidated", "miss", "error")
+
+# Response header flagging payloads built from stale upstream data, and the
+# max-age clients get for them so they come back for the refreshed version
+STALE_HEADER = "X-Data-Stale"
+STALE_MAX_AGE = 60
+STALE_REASONS = {"stale": "revalidating", "stale_error": "upstream-error"}
+
+# Requests made outside of any accounted wrapper (e.g. background refreshes)
+UNATTRIBUTED = "unattributed"
+
+_context = threading.local()
+_stats = {}
+_lock = threading.Lock()
+_installed = False
+
+# Cache keys being refreshed in the background, and those whose last
+# refresh failed (served stale as an upstream error until one succeeds)
+_refreshing = set()
+_failing = set()
+
+# Upstream concurrency slots, also held by background refreshes (set by install)
+_slots = None
+
+
+def _new_stats():
+    return {"results": dict.fromkeys(RESULTS, 0), "bytes": 0, "latency": new_histogram()}
+
+
+def current_wrapper():
+    """Returns the name of the innermost accounted wrapper running on this thread."""
+    return getattr(_context, "wrapper", None) or UNATTRIBUTED
+
+
+@contextmanager
+def attributed(name):
+    """Attributes every upstream request made inside the block to `name`."""
+
+    previous = getattr(_context, "wrapper", None)
+    _context.wrapper = name
+    try:
+        yield
+    finally:
+        _context.wrapper = previous
+
+
+@contextmanager
+def forced_refresh():
+    """Sends every request made inside the block to upstream, bypassing cached responses."""
+
+    previous = getattr(_context, "force_refresh", False)
+    _context.force_refresh = True
+    try:
+        yield
+    finally:
+        _context.force_refresh = previous
+
+
+def accounted(func):
+    """Attributes the upstream requests a cache wrapper makes to its name."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with attributed(func.__name__):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def record(result, seconds=None, size=0, wrapper=None):
+    """
+    Counts one upstream request.
+
+    Args:
+        result (str): One of RESULTS.
+        seconds (float): Time spent on the network, if the request went there.
+        size (int): Response body bytes received from upstream.
+        wrapper (str): Wrapper to attribute it to; the current one by default.
+    """
+
+    with _lock:
+        stats = _stats.setdefault(wrapper or current_wrapper(), _new_stats())
+        stats["results"][result] += 1
+        stats["bytes"] += size
+        if seconds is not None:
+            add_sample(stats["latency"], seconds)
+
+    # Upstream errors take precedence over a pending refresh
+    if result in STALE_REASONS and has_request_context() and g.get("stale_upstream") != "upstream-error":
+        g.stale_upstream = STALE_REASONS[result]
+
+
+def _classify(response):
+    if not getattr(response, "from_cache", False):
+        return "error" if response.status_code >= 500 else "miss"
+    if getattr(response, "revalidated", False):
+        return "revalidated"
+    if getattr(response, "is_expired", False):
+        return "stale" if getattr(_context, "refreshing", False) else "stale_error"
+    return "hit"
+
+
+def served_stale():
+    """
+    Tells whether the current request used stale upstream data.
+
+    Returns:
+        str | None: "revalidating" or "upstream-error", None if all data was fresh.
+    """
+
+    return g.get("stale_upstream") if has_request_context() else None
+
+
+def flag_stale(response):
+    """
+    after_request hook: marks responses built from stale upstream data and
+    keeps clients from holding on to them for long.
+    """
+
+    reason = served_stale()
+    if reason is not None:
+        response.headers[STALE_HEADER] = reason
+        response.headers["Cache-Control"] = f"public, max-age={STALE_MAX_AGE}"
+    return response
+
+
+def _refresh(send_and_cache, session, wrapper, slots, key, args, kwargs):
+    started = time.perf_counter()
+    result = "error"
+    try:
+        with slots:
+            response = send_and_cache(session, *args, **kwargs)
+        result = _classify(response)
+        size = len(response.content or b"") if result == "miss" else 0
+        record(result, time.perf_counter() - started, size, wrapper)
+        if result == "error":
+            logger.warning("Background refresh of %s failed with %s", args[0].url, response.status_code)
+    except Exception:
+        record("error", time.perf_counter() - started, wrapper=wrapper)
+        logger.warning("Background refresh of %s failed", args[0].url, exc_info=True)
+    finally:
+        with _lock:
+            _refreshing.discard(key)
+            if result == "error":
+                _failing.add(key)
+            else:
+                _failing.discard(key)
+
+
+def install(session_class, slots):
+    """
+    Counts every request sent through a requests-cache session class and
+    coalesces its stale-while-revalidate refreshes. Patching the mixin covers
+    both the globally installed session and FastF1's own. This replaces the
+    private send path of requests-cache (_resend_async, _send_and_cache), so
+    requirements.txt pins its minor version and tests/test_upstream.py fails
+    when an upgrade changes it.
+
+    Args:
+        session_class (type): requests_cache.session.CacheMixin.
+        slots (threading.Semaphore): Upstream concurrency slots, also held by
+            background refreshes.
+    """
+
+    global _installed, _slots
+    if _installed:
+        return
+    _installed = True
+    _slots = slots
+
+    send = session_class.send
+    send_and_cache = session_class._send_and_cache
+
+    @wraps(send)
+    def accounted_send(self, request, **kwargs):
+        _context.refreshing = False
+        if getattr(_context, "force_refresh", False):
+            kwargs["force_refresh"] = True
+        started = time.perf_counter()
+        try:
+            response = send(self, request, **kwargs)
+        except Exception:
+            record("error", time.perf_counter() - started)
+            raise
+
+        result = _classify(response)
+        if result in ("hit", "stale", "stale_error"):
+            record(result)
+        else:
+            size = len(response.content or b"") if result == "miss" else 0
+            record(result, time.perf_counter() - started, size)
+        return response
+
+    @wraps(session_class._resend_async)
+    def resend_async(self, request, actions, cached_response, **kwargs):
+        # requests-cache starts a thread per stale hit; one refresh per key is enough
+        key = actions.cache_key
+        with _lock:
+            _context.refreshing = key not in _failing
+            if key in _refreshing:
+                return
+            _refreshing.add(key)
+        threading.Thread(
+            target=_refresh,
+            args=(send_and_cache, self, current_wrapper(), _slots, key, (request, actions, cached_response), kwargs),
+            name="upstream-refresh",
+            daemon=True,
+        ).start()
+
+    session_class.send = accounted_send
+    session_class._resend_async = resend_async
+
+
+def reset_after_fork(slots):
+    """
+    Clears the state a forked worker inherits from its parent: refreshes the
+    parent had in flight never finish in the child (so their keys would stay
+    marked forever), its lock may have been held by one of them, and its
+    counters would be reported again by every worker.
+
+    Args:
+        slots (threading.Semaphore): The worker's own upstream concurrency slots.
+    """
+
+    global _lock, _slots
+    _lock = threading.Lock()
+    _slots = slots
+    _refreshing.clear()
+    _failing.clear()
+    _stats.clear()
+
+
+def stats():
+    """
+    Returns the counters of every wrapper that made upstream requests.
+
+    Returns:
+        dict: Wrapper name -> counts per result, cache hit ratio, bytes
+        received and network latency (count, mean and cumulative buckets).
+    """
+
+    with _lock:
+        snapshot = {name: (dict(s["results"]), s["bytes"], list(s["latency"])) for name, s in _stats.items()}
+
+    out = {}
+    for name, (results, size, latency) in sorted(snapshot.items()):
+        calls = sum(results.values())
+        out[name] = {
+            "calls": calls,
+            **results,
+            "hitRatio": round((results["hit"] + results["stale"] + results["stale_error"]) / calls, 4) if calls else None,
+            "bytes": size,
+            "latency": {
+                "count": latency[-2],
+                "meanSeconds": round(latency[-1] / latency[-2], 6) if latency[-2] else None,
+                "buckets": {**{str(bound): count for bound, count in zip(BUCKETS, latency)}, "+Inf": latency[-2]},
+            },
+        }
+    return out
+
+
+def render_prometheus():
+    """
+    Renders the upstream counters in the Prometheus text exposition format.
+
+    Returns:
+        str: Metrics text.
+    """
+
+    with _lock:
+        snapshot = {name: (dict(s["results"]), s["bytes"], list(s["latency"])) for name, s in _stats.items()}
+
+    requests, received, latency = [], [], []
+    for name, (results, size, histogram) in sorted(snapshot.items()):
+        for result, count in results.items():
+            requests.append(f'f1_upstream_requests_total{{wrapper="{name}",result="{result}"}} {count}')
+        received.append(f'f1_upstream_bytes_total{{wrapper="{name}"}} {size}')
+        latency.extend(histogram_lines("f1_upstream_seconds", f'wrapper="{name}"', histogram))
+
+    lines = [
+        "# HELP f1_upstream_requests_total Requests sent through the Ergast response cache, by outcome.",
+        "# TYPE f1_upstream_requests_total counter",
+        *requests,
+        "# HELP f1_upstream_bytes_total Response body bytes received from upstream.",
+        "# TYPE f1_upstream_bytes_total counter",
+        *received,
+        "# HELP f1_upstream_seconds Time spent on requests that went to upstream.",
+        "# TYPE f1_upstream_seconds histogram",
+        *latency,
+    ]
+    return "\n".join(lines) + "\n"
@@ -1,55 +1,179 @@
+from functools import lru_cache
+from types import MappingProxyType
+import pandas as pd
 import pycountry
 import re
 
+# Country names used by the F1 schedule and Ergast that pycountry does not
+# resolve (or resolves ambiguously), mapped to ISO alpha-2 codes
+COUNTRY_ALIASES = MappingProxyType({
+    "uk": "GB",
+    "great britain": "GB",
+    "united kingdom": "GB",
+    "usa": "US",
+    "united states": "US",
+    "uae": "AE",
+    "abu dhabi": "AE",
+    "russia": "RU",
+    "korea": "KR",
+    "south korea": "KR",
+    "turkey": "TR",
+    "vietnam": "VN",
+})
+
+# Driver and constructor nationalities mapped to lowercase ISO alpha-2 codes
+NATIONALITY_CODES = MappingProxyType({
+    "American": "us",
+    "Argentine": "ar",
+    "Argentinian": "ar",
+    "Australian": "au",
+    "Austrian": "at",
+    "Belgian": "be",
+    "Brazilian": "br",
+    "British": "gb",
+    "Canadian": "ca",
+    "Chilean": "cl",
+    "Chinese": "cn",
+    "Colombian": "co",
+    "Czech": "cz",
+    "Danish": "dk",
+    "Dutch": "nl",
+    "East German": "de",
+    "Emirati": "ae",
+    "Finnish": "fi",
+    "French": "fr",
+    "German": "de",
+    "Hungarian": "hu",
+    "Indian": "in",
+    "Indonesian": "id",
+    "Irish": "ie",
+    "Italian": "it",
+    "Japanese": "jp",
+    "Liechtensteiner": "li",
+    "Luxembourgish": "lu",
+    "Malaysian": "my",
+    "Mexican": "mx",
+    "Monegasque": "mc",
+    "Moroccan": "ma",
+    "New Zealander": "nz",
+    "Polish": "pl",
+    "Portuguese": "pt",
+    "Rhodesian": "zw",
+    "Russian": "ru",
+    "Saudi": "sa",
+    "Singaporean": "sg",
+    "South African": "za",
+    "South Korean": "kr",
+    "Spanish": "es",
+    "Swedish": "se",
+    "Swiss": "ch",
+    "Thai": "th",
+    "Turkish": "tr",
+    "Uruguayan": "uy",
+    "Venezuelan": "ve",
+})
+
+
+@lru_cache(maxsize=1)
+def _country_index():
+    """
+    Builds an immutable index from every lowercase ISO code, name, official
+    name, common name and alias to its pycountry entry. Built once, on first use.
 
-def iso2_country(country_input):
+    Returns:
+        MappingProxyType: Lowercase key -> pycountry country.
     """
-    Maps a country name or list of country names to lowercase ISO alpha-2 codes using pycountry.
-    Falls back to first 2 lowercase letters if country not found.
+
+    index = {}
+    for country in pycountry.countries:
+        for attr in ("alpha_2", "alpha_3", "name", "official_name", "common_name"):
+            value = getattr(country, attr, None)
+            if value:
+                index.setdefault(value.lower(), country)
+    for alias, alpha_2 in COUNTRY_ALIASES.items():
+        index[alias] = pycountry.countries.get(alpha_2=alpha_2)
+    return MappingProxyType(index)
+
+
+@lru_cache(maxsize=1024)
+def _lookup_country(name, fuzzy=True):
+    """
+    Resolves a country name with a dict probe, falling back to a (memoized)
+    fuzzy pycountry search.
 
     Args:
-        country_input (str or list[str]): A single country name or list of country names.
+        name (str): Country name, code or alias.
+        fuzzy (bool): Whether to try a fuzzy search on a miss.
 
     Returns:
-        str or list[str]: A single lowercase ISO alpha-2 code or list of codes.
+        pycountry country or None: Matching country, if any.
     """
 
-    def get_alpha2_code(name: str) -> str:
+    country = _country_index().get(name.strip().lower())
+    if country is None and fuzzy:
         try:
-            return pycountry.countries.lookup(name).alpha_2.lower()
+            country = pycountry.countries.search_fuzzy(name)[0]
         except LookupError:
-            return name[:2].lower() if name else ""
+            country = None
+    return country
+
+
+def _map_countries(country_input, to_code):
+    """
+    Applies a per-name mapping to a string, a list or a pandas Series. Series
+    are mapped through their unique values only.
+    """
 
     if isinstance(country_input, str):
-        return get_alpha2_code(country_input)
+        return to_code(country_input)
     elif isinstance(country_input, list):
-        return [get_alpha2_code(name) for name in country_input]
+        return [to_code(name) for name in country_input]
+    elif isinstance(country_input, pd.Series):
+        codes = {name: to_code(name) for name in country_input.dropna().unique() if isinstance(name, str)}
+        return country_input.map(codes).fillna("")
     return ""
 
 
+def iso2_country(country_input):
+    """
+    Maps country names to lowercase ISO alpha-2 codes using a precomputed index.
+    Falls back to first 2 lowercase letters if country not found.
+
+    Args:
+        country_input (str or list[str] or pd.Series): Country name(s).
+
+    Returns:
+        str or list[str] or pd.Series: Lowercase ISO alpha-2 code(s).
+    """
+
+    def get_alpha2_code(name: str) -> str:
+        country = _lookup_country(name) if name else None
+        if country is not None:
+            return country.alpha_2.lower()
+        return name[:2].lower() if name else ""
+
+    return _map_countries(country_input, get_alpha2_code)
+
+
 def iso3_country(country_input):
     """
-    Maps a country name or list of country names to lowercase ISO alpha-3 codes using pycountry.
-    Falls back to first 3 lowercase letters if country not found.
+    Maps country names to uppercase ISO alpha-3 codes using a precomputed index.
+    Falls back to first 3 uppercase letters if country not found.
 
     Args:
-        country_input (str or list[str]): A single country name or list of country names.
+        country_input (str or list[str] or pd.Series): Country name(s).
 
     Returns:
-        str or list[str]: A single lowercase ISO alpha-3 code or list of codes.
+        str or list[str] or pd.Series: Uppercase ISO alpha-3 code(s).
     """
 
     def get_alpha3_code(name: str) -> str:
-        try:
-            return pycountry.countries.lookup(name).alpha_3.upper()
-        except LookupError:
-            return name[:3].upper() if name else ""
+        country = _lookup_country(name) if name else None
+        if country is not None:
+            return country.alpha_3.upper()
+        return name[:3].upper() if name else ""
 
-    if isinstance(country_input, str):
-        return get_alpha3_code(country_input)
-    elif isinstance(country_input, list):
-        return [get_alpha3_code(name) for name in country_input]
-    return ""
+    return _map_countries(country_input, get_alpha3_code)
 
 
 def slugify_location(location):
@@ -68,67 +192,26 @@ def slugify_location(location):
     return f"{slug}-gp"
 
 
-def nationality_to_country_code(nationality: str) -> str:
+def nationality_to_country_code(nationality):
     """
-    Maps a nationality to lowercase ISO alpha-2 codes using pycountry.
+    Maps a nationality to lowercase ISO alpha-2 codes using precomputed tables.
 
     Args:
-        nationality (str): Nationality of a driver.
+        nationality (str or pd.Series): Nationality of a driver or constructor.
 
     Returns:
-        str: A single lowercase ISO alpha-2 code.
+        str or pd.Series: Lowercase ISO alpha-2 code(s), empty if unknown.
     """
 
-    try:
-        country = pycountry.countries.get(name=nationality)
-        if country:
-            return country.alpha_2.lower()
-        country = pycountry.countries.get(common_name=nationality)
-        if country:
-            return country.alpha_2.lower()
-        mapping = {
-            "American": "us",
-            "Argentine": "ar",
-            "Australian": "au",
-            "Austrian": "at",
-            "Belgian": "be",
-            "Brazilian": "br",
-            "British": "gb",
-            "Canadian": "ca",
-            "Chilean": "cl",
-            "Chinese": "cn",
-            "Colombian": "co",
-            "Czech": "cz",
-            "Danish": "dk",
-            "Dutch": "nl",
-            "Finnish": "fi",
-            "French": "fr",
-            "German": "de",
-            "Hungarian": "hu",
-            "Indian": "in",
-            "Indonesian": "id",
-            "Irish": "ie",
-            "Italian": "it",
-            "Japanese": "jp",
-            "Luxembourgish": "lu",
-            "Malaysian": "my",
-            "Mexican": "mx",
-            "Monegasque": "mc",
-            "New Zealander": "nz",
-            "Polish": "pl",
-            "Portuguese": "pt",
-            "Russian": "ru",
-            "Saudi": "sa",
-            "Singaporean": "sg",
-            "South African": "za",
-            "South Korean": "kr",
-            "Spanish": "es",
-            "Swedish": "se",
-            "Swiss": "ch",
-            "Thai": "th",
-            "Turkish": "tr",
-            "Venezuelan": "ve",
-        }
-        return mapping.get(nationality, "")
-    except:
-        return ""
\ No newline at end of file
+    def get_code(name: str) -> str:
+        if not isinstance(name, str) or not name:
+            return ""
+        code = NATIONALITY_CODES.get(name)
+        if code is not None:
+            return code
+        country = _lookup_country(name, fuzzy=False)
+        return country.alpha_2.lower() if country is not None else ""
+
+    if isinstance(nationality, pd.Series):
+        return _map_countries(nationality, get_code)
+    return get_code(nationality)
@@ -0,0 +1,160 @@
+import logging
+import os
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+from cache import get_event_schedule_cached
+from materialize import SETTLE_WINDOW, invalidate
+from season import completed_rounds, invalidate_season_results, session_events
+from store import load_season_results, reload_season_results, stored_rounds
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------
+# Background cache warmer
+# ------------------------------------------------------------------
+
+# How long after a session starts the warmer refreshes, plus random jitter
+WARM_DELAY = timedelta(minutes=int(os.environ.get("F1_WARM_DELAY_MINUTES", "30")))
+WARM_JITTER = timedelta(minutes=int(os.environ.get("F1_WARM_JITTER_MINUTES", "10")))
+
+# Retry policy while upstream has not published the session's results yet
+RETRY_BASE = timedelta(minutes=5)
+RETRY_MAX = timedelta(hours=2)
+RETRY_WINDOW = timedelta(hours=24)
+
+# How often the schedule is re-read when no session is coming up
+IDLE_INTERVAL = timedelta(hours=6)
+
+# Endpoints derived from the whole season, refreshed after every race
+SEASON_PATHS = [
+    "/api/f1/get_driver_points/{year}",
+    "/api/f1/get_constructor_points/{year}",
+    "/api/f1/get_driver_stats",
+    "/api/f1/get_constructor_stats",
+    "/api/f1/get_driver_stats/{year}",
+    "/api/f1/get_constructor_stats/{year}",
+    "/api/f1/get_driver_standings",
+    "/api/f1/get_constructor_standings",
+    "/api/f1/get_recent_rWinners",
+    "/api/f1/get_drivers",
+]
+
+# Per-round endpoints refreshed after the matching session
+SESSION_PATHS = {
+    "Qualifying": ["/api/f1/get_qualifying_results/{year}/{round}"],
+    "Sprint": ["/api/f1/get_sprint_results/{year}/{round}"],
+    "Race": ["/api/f1/get_race_results/{year}/{round}"],
+}
+
+
+def settled_events(events):
+    """
+    Adds a "Settled" event SETTLE_WINDOW after every race, when its results
+    are reloaded to pick up amendments such as post-race penalties.
+
+    Args:
+        events (list[tuple[datetime, int, str]]): Sessions from session_events.
+
+    Returns:
+        list[tuple[datetime, int, str]]: The sessions and settle events, sorted by time.
+    """
+
+    settled = [(start + SETTLE_WINDOW, round_, "Settled") for start, round_, session in events if session == "Race"]
+    return sorted(events + settled)
+
+
+class CacheWarmer:
+    """
+    Refreshes results, standings and derived payloads shortly after each
+    session of the current season, so user traffic does not hit a cold path.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="cache-warmer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _jitter(self):
+        return timedelta(seconds=random.uniform(0, WARM_JITTER.total_seconds()))
+
+    def _run(self):
+        # Sessions that started less than WARM_DELAY ago are still warmed
+        last_warmed = datetime.now(timezone.utc) - WARM_DELAY
+
+        while not self._stop.is_set():
+            now = datetime.now(timezone.utc)
+            try:
+                events = settled_events(session_events(get_event_schedule_cached(now.year, include_testing=False)))
+            except Exception:
+                logger.exception("Cache warmer could not read the %s schedule", now.year)
+                events = []
+
+            upcoming = [event for event in events if event[0] > last_warmed]
+            if not upcoming:
+                self._stop.wait(IDLE_INTERVAL.total_seconds())
+                continue
+
+            start, round_, session = upcoming[0]
+            due = start + WARM_DELAY + self._jitter()
+            if self._stop.wait(max((due - now).total_seconds(), 0)):
+                break
+
+            self._warm_with_backoff(start.year, round_, session)
+            last_warmed = start
+
+    def _warm_with_backoff(self, year, round_, session):
+        delay = RETRY_BASE
+        deadline = datetime.now(timezone.utc) + RETRY_WINDOW
+
+        while not self._stop.is_set():
+            try:
+                if self.warm(year, round_, session):
+                    logger.info("Warmed caches after %s %s round %s", year, session, round_)
+                    return
+            except Exception:
+                logger.exception("Cache warmer failed for %s %s round %s", year, session, round_)
+
+            if datetime.now(timezone.utc) + delay > deadline:
+                logger.warning("Giving up warming %s %s round %s", year, session, round_)
+                return
+            self._stop.wait((delay + self._jitter()).total_seconds())
+            delay = min(delay * 2, RETRY_MAX)
+
+    def warm(self, year, round_, session):
+        """
+        Refreshes everything affected by one session.
+
+        Returns:
+            bool: True once the session's results were available upstream.
+        """
+
+        session_paths = [p.format(year=year, round=round_) for p in SESSION_PATHS.get(session, [])]
+        season_paths = []
+
+        if session == "Race":
+            schedule = get_event_schedule_cached(year, include_testing=False)
+            load_season_results(year, completed_rounds(schedule))
+            if round_ not in stored_rounds(year):
+                return False
+        elif session == "Settled":
+            # Results stored right after the race may have been amended since
+            reload_season_results(year, [round_])
+            session_paths = [p.format(year=year, round=round_) for p in SESSION_PATHS["Race"]]
+
+        if session in ("Race", "Settled"):
+            invalidate()
+            invalidate_season_results(year)
+            season_paths = [p.format(year=year) for p in SEASON_PATHS]
+
+        with self.app.test_client() as client:
+            statuses = [client.get(path).status_code for path in session_paths]
+            for path in season_paths:
+                client.get(path)
+        return all(status == 200 for status in statuses)
@@ -0,0 +1,34 @@
+import logging
+import os
+from datetime import datetime, timezone
+
+# Routes must be imported before the workers fork, not in a background thread
+os.environ.pop("F1_LAZY_INIT", None)
+
+from app import app  # noqa: E402
+from cache import get_event_schedule_cached  # noqa: E402
+from ttl import refresh_expiry_policy  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------
+# Production entry point: gunicorn -c gunicorn.conf.py wsgi:app
+# ------------------------------------------------------------------
+
+
+def preload():
+    """
+    Loads the current season's schedule and Ergast expiry policy in the
+    master process, so every forked worker starts with them in memory
+    (shared copy-on-write) instead of loading them on its first request.
+    """
+
+    year = datetime.now(timezone.utc).year
+    try:
+        get_event_schedule_cached(year, include_testing=False)
+        refresh_expiry_policy()
+    except Exception:
+        logger.warning("Could not preload the %d schedule", year, exc_info=True)
+
+
+preload()
@@ -0,0 +1,75 @@
+"""
+Imports the API once per test run in a scratch directory, wired to a stub
+Ergast server and the made-up season recorded in benchmarks/fixtures/synthetic,
+so no test touches the network.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "src"), str(ROOT / "benchmarks")]
+
+from fixtures import FastF1Stub, Fixtures, StubErgast  # noqa: E402
+
+FIXTURES = Fixtures.load("synthetic")
+
+# Set by pytest_configure, before any test module imports the API
+ergast = None
+loaders = None
+
+
+def pytest_configure(config):
+    global ergast, loaders
+
+    os.chdir(tempfile.mkdtemp(prefix="f1-tests-"))
+    os.makedirs("cache/fastf1")
+
+    ergast = StubErgast(FIXTURES).start()
+    os.environ["ERGAST_BASE_URL"] = ergast.base_url
+    os.environ.pop("F1_LAZY_INIT", None)
+    os.environ.pop("F1_CACHE_URL", None)
+
+    import fastf1
+
+    loaders = FastF1Stub(FIXTURES).install(fastf1)
+
+
+@pytest.fixture
+def year():
+    """The recorded season."""
+    return FIXTURES.year
+
+
+@pytest.fixture
+def stub_ergast():
+    return ergast
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(tmp_path, monkeypatch):
+    """
+    Every test starts with an empty season store, and no memoized season
+    frames, materialized responses or ETag versions.
+    """
+    import materialize
+    import season
+    import store
+
+    monkeypatch.setattr(store, "STORE_DIR", tmp_path / "seasons")
+    materialize.invalidate()
+    season.invalidate_season_results()
+    yield
+    materialize.invalidate()
+    season.invalidate_season_results()
+
+
+@pytest.fixture
+def client():
+    from app import app
+
+    return app.test_client()
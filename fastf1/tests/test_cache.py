@@ -0,0 +1,43 @@
+import pandas as pd
+
+import cache
+
+
+class Page:
+    """One page of a season-wide Ergast response."""
+
+    def __init__(self, races, rest=(), complete=None):
+        self.description = pd.DataFrame({"round": [rnd for rnd, _ in races]})
+        self.content = [pd.DataFrame({"driverId": drivers}) for _, drivers in races]
+        self.is_complete = not rest if complete is None else complete
+        self._rest = list(rest)
+        self._complete = complete
+
+    def get_next_result_page(self):
+        if not self._rest:
+            raise ValueError("no more pages")
+        return Page(self._rest[0], self._rest[1:], complete=self._complete)
+
+
+def test_stitches_every_page_of_a_season_query():
+    # Round 2 is split across the first and second page
+    first = Page(
+        [(1, ["max", "lando"]), (2, ["max"])],
+        rest=[[(2, ["lando"]), (3, ["max", "lando"])], [(4, [])]],
+    )
+
+    results = cache._all_pages(first)
+
+    assert list(results["round"]) == [1, 1, 2, 2, 3, 3]
+    assert results.groupby("round")["driverId"].apply(list).to_dict() == {
+        1: ["max", "lando"],
+        2: ["max", "lando"],
+        3: ["max", "lando"],
+    }
+
+
+def test_stops_past_the_last_page_when_the_total_is_off():
+    # Never flagged complete, e.g. Ergast reported more rows than it serves
+    first = Page([(1, ["max"])], rest=[[(2, ["lando"])]], complete=False)
+
+    assert list(cache._all_pages(first)["round"]) == [1, 2]
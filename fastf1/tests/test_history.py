@@ -0,0 +1,80 @@
+import pytest
+
+import history
+from season import build_season_results
+from store import load_season_results, read_frame
+
+
+@pytest.fixture(autouse=True)
+def history_dir(tmp_path, monkeypatch):
+    """Every test starts with an empty index of its own."""
+    root = tmp_path / "history"
+    monkeypatch.setattr(history, "HISTORY_DIR", root)
+    monkeypatch.setattr(history, "MANIFEST", root / history.MANIFEST.name)
+    monkeypatch.setattr(history, "_index", None)
+    monkeypatch.setattr(history, "_version", None)
+    return root
+
+
+def _expected(kind, year, rounds):
+    table = history.compact_results(year, build_season_results(year, rounds))
+    return history._by_points(history.season_aggregates(year, table, history.FLAGS[kind]))
+
+
+def test_indexes_a_season_and_writes_its_results_table(year, history_dir):
+    index = history.index_season(year, [1, 2, 3], complete=True)
+
+    assert index.rounds(year) == [1, 2, 3]
+    assert index.is_complete(year)
+    assert not hasattr(index, "results")
+
+    table = read_frame(history_dir / "results" / str(year))
+    assert sorted(table["round"].unique()) == [1, 2, 3]
+    assert set(table["year"]) == {year}
+
+    # Another worker loads the same aggregates from disk
+    history._index = None
+    loaded = history.get_index()
+    assert loaded.is_complete(year)
+    for kind in history.FLAGS:
+        assert loaded.season(kind, year).to_dict("records") == _expected(kind, year, [1, 2, 3]).to_dict("records")
+    assert loaded.careers["drivers"]["races"].max() == 3
+
+
+def test_only_rewrites_a_season_that_gained_rounds(year, history_dir):
+    # The recorded set holds round 3 as part of the season-wide queries only
+    load_season_results(year, [1, 2, 3])
+    history.index_season(year, [1, 2], complete=False)
+    version = history._manifest_version()
+
+    assert history.index_season(year, [1, 2], complete=False).rounds(year) == [1, 2]
+    assert history._manifest_version() == version
+
+    index = history.index_season(year, [1, 2, 3], complete=False)
+    assert index.rounds(year) == [1, 2, 3]
+    assert history._manifest_version() != version
+
+
+def test_season_stats_fall_back_to_the_store_while_rounds_are_missing(year):
+    # The index lags behind: round 3 of the finished season is not in yet
+    load_season_results(year, [1, 2, 3])
+    history.index_season(year, [1, 2], complete=False)
+    assert history.get_index().season("drivers", year)["races"].max() == 2
+
+    stats = history.season_stats("drivers", year)
+
+    assert stats.to_dict("records") == _expected("drivers", year, [1, 2, 3]).to_dict("records")
+    assert stats["races"].max() == 3
+
+
+def test_season_stats_come_from_the_index_once_complete(year, monkeypatch):
+    history.index_season(year, [1, 2, 3], complete=True)
+
+    def unreachable(*args, **kwargs):
+        raise AssertionError("a complete season is answered from the index")
+
+    monkeypatch.setattr(history, "get_season_results", unreachable)
+    monkeypatch.setattr(history, "season_rounds", unreachable)
+
+    stats = history.season_stats("constructors", year)
+    assert stats.to_dict("records") == _expected("constructors", year, [1, 2, 3]).to_dict("records")
@@ -0,0 +1,111 @@
+import pytest
+
+import httpcache
+import materialize
+from backend import backend
+
+CIRCUITS = "/api/f1/get_circuits"
+
+
+@pytest.fixture
+def view_calls(client, monkeypatch):
+    """Counts how often the circuits view actually runs."""
+
+    app = client.application
+    view = app.view_functions["circuits.get_circuits"]
+    calls = []
+
+    def counted(*args, **kwargs):
+        calls.append(1)
+        return view(*args, **kwargs)
+
+    monkeypatch.setitem(app.view_functions, "circuits.get_circuits", counted)
+    return calls
+
+
+def test_responses_carry_validators(client):
+    response = client.get(CIRCUITS)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+    assert "max-age=" in response.headers["Cache-Control"]
+
+
+def test_matching_etag_gets_304_without_running_the_view(client, view_calls):
+    etag = client.get(CIRCUITS).headers["ETag"]
+
+    response = client.get(CIRCUITS, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.get_data() == b""
+    assert response.headers["ETag"] == etag
+    assert view_calls == [1]
+
+
+def test_other_etag_gets_the_full_response(client, view_calls):
+    client.get(CIRCUITS)
+
+    response = client.get(CIRCUITS, headers={"If-None-Match": '"something-else"'})
+
+    assert response.status_code == 200
+    assert response.get_data()
+    assert view_calls == [1, 1]
+
+
+def test_expired_version_runs_the_view_again(client, view_calls):
+    etag = client.get(CIRCUITS).headers["ETag"]
+    etag, last_modified, _, _ = httpcache._version(f"{CIRCUITS}?")
+    httpcache._set_version(f"{CIRCUITS}?", etag, last_modified, last_modified)
+
+    response = client.get(CIRCUITS, headers={"If-None-Match": etag})
+
+    # The payload did not change, so the view's response is still a 304
+    assert response.status_code == 304
+    assert view_calls == [1, 1]
+
+
+def test_compressed_representation_revalidates(client, year):
+    path = f"/api/f1/get_race_calendar/{year}"
+    response = client.get(path, headers={"Accept-Encoding": "gzip"})
+    etag = response.headers["ETag"]
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert etag.endswith('-gzip"')
+
+    conditional = client.get(path, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+
+    assert conditional.status_code == 304
+    assert conditional.headers["ETag"] == etag
+
+
+def test_materialized_route_answers_from_the_stored_etag(client, year):
+    path = f"/api/f1/get_race_calendar/{year}"
+    etag = client.get(path).headers["ETag"]
+    backend.delete_prefix(httpcache.VERSION_PREFIX)
+
+    response = client.get(path, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+
+
+def test_invalidate_stops_answering_from_the_old_version(client, view_calls):
+    etag = client.get(CIRCUITS).headers["ETag"]
+
+    materialize.invalidate()
+
+    # The view runs again; its payload did not change, so it is still a 304
+    response = client.get(CIRCUITS, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert view_calls == [1, 1]
+
+
+def test_versions_stored_before_another_worker_invalidated_are_ignored(client, view_calls):
+    etag = client.get(CIRCUITS).headers["ETag"]
+    assert httpcache._version(f"{CIRCUITS}?") is not None
+
+    # Another worker invalidated: only the shared marker file moved
+    httpcache._mark_invalidated()
+
+    assert httpcache._version(f"{CIRCUITS}?") is None
+    client.get(CIRCUITS, headers={"If-None-Match": etag})
+    assert view_calls == [1, 1]
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import materialize
+from backend import backend
+from cache import get_event_schedule_cached
+from season import race_boundaries
+from ttl import MAX_TTL
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Lets a test set the time materialize sees."""
+
+    class Clock(datetime):
+        current = None
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.current
+
+    monkeypatch.setattr(materialize, "datetime", Clock)
+    return Clock
+
+
+@pytest.fixture
+def second_race(year):
+    """Start of the recorded season's second race."""
+    schedule = get_event_schedule_cached(year, include_testing=False)
+    return race_boundaries(schedule, datetime(year, 3, 12, tzinfo=timezone.utc))[1]
+
+
+def _entry(year, path):
+    return backend.get(f"{materialize.KEY_PREFIX}{path}?#{year}")
+
+
+def test_finished_season_expires_after_max_ttl(year):
+    now = datetime(year + 2, 1, 10, tzinfo=timezone.utc)
+    assert materialize._expires_at(year, now) == now + MAX_TTL
+
+
+def test_expires_when_the_next_race_starts(year, second_race):
+    now = datetime(year, 3, 12, tzinfo=timezone.utc)
+    assert materialize._expires_at(year, now) == second_race
+
+
+def test_expiry_is_capped_at_max_ttl(year):
+    now = datetime(year, 1, 1, tzinfo=timezone.utc)
+    assert materialize._expires_at(year, now) == now + MAX_TTL
+
+
+def test_expires_soon_right_after_a_race(year, second_race):
+    now = second_race + timedelta(hours=2)
+    assert materialize._expires_at(year, now) == now + materialize.SETTLE_TTL
+
+
+def test_serves_the_stored_body_until_it_expires(year, client, clock, second_race):
+    path = f"/api/f1/get_race_calendar/{year}"
+    clock.current = datetime(year, 3, 12, tzinfo=timezone.utc)
+
+    first = client.get(path)
+    entry = _entry(year, path)
+    assert first.status_code == 200
+    assert entry is not None and entry[3] == second_race
+
+    # Still valid: answered from the same stored entry
+    clock.current = second_race - timedelta(minutes=1)
+    assert client.get(path).get_data() == first.get_data()
+    assert _entry(year, path) == entry
+
+    # Past the next race: rendered and stored again with a new expiry
+    clock.current = second_race + timedelta(days=2)
+    assert client.get(path).status_code == 200
+    assert _entry(year, path)[3] > entry[3]
+
+
+def test_invalidate_drops_stored_entries(year, client, clock):
+    path = f"/api/f1/get_race_calendar/{year}"
+    clock.current = datetime(year, 3, 12, tzinfo=timezone.utc)
+    client.get(path)
+    entry = _entry(year, path)
+    assert materialize._lookup(f"{path}?#{year}", clock.current) == entry
+
+    materialize.invalidate()
+
+    assert _entry(year, path) is None
+    assert materialize._lookup(f"{path}?#{year}", clock.current) is None
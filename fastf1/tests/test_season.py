@@ -0,0 +1,67 @@
+import warnings
+
+import season
+import store
+from backend import backend
+
+
+def _cached_keys():
+    return [key for key in backend._entries.keys() if key.startswith(season.SEASON_RESULTS_PREFIX)]
+
+
+def test_does_not_cache_a_frame_missing_a_round(year, monkeypatch):
+    load = season.load_season_results
+
+    def unpublished_round_3(year, rounds):
+        # Ergast has not published round 3 yet
+        return {session: df[df["round"].astype(int) != 3] for session, df in load(year, rounds).items()}
+
+    monkeypatch.setattr(season, "load_season_results", unpublished_round_3)
+    partial = season.get_season_results(year, (1, 2, 3))
+    assert set(partial["round"].astype(int)) == {1, 2}
+    assert _cached_keys() == []
+
+    monkeypatch.setattr(season, "load_season_results", load)
+    # Built while filling the store, so cached from the next build on
+    season.get_season_results(year, (1, 2, 3))
+    complete = season.get_season_results(year, (1, 2, 3))
+    assert set(complete["round"].astype(int)) == {1, 2, 3}
+    assert len(_cached_keys()) == 1
+    assert season.get_season_results(year, (1, 2, 3)) is complete
+
+
+def test_rewritten_store_yields_a_fresh_frame(year):
+    store.load_season_results(year, [1, 2, 3])
+    first = season.get_season_results(year, (1, 2, 3))
+    version = store.store_version(year)
+    assert version != "0"
+    assert season.get_season_results(year, (1, 2, 3)) is first
+
+    # E.g. amended results written back after post-race penalties
+    base = store.STORE_DIR / str(year) / "race"
+    store.write_frame(store.read_frame(base), base)
+
+    assert store.store_version(year) != version
+    assert season.get_season_results(year, (1, 2, 3)) is not first
+
+
+def test_invalidate_drops_memoized_frames(year):
+    store.load_season_results(year, [1, 2, 3])
+    season.get_season_results(year, (1, 2, 3))
+    assert _cached_keys()
+
+    season.invalidate_season_results(year)
+
+    assert _cached_keys() == []
+
+
+def test_builds_the_long_frame_without_pandas_warnings(year):
+    sessions = store.load_season_results(year, [1, 2, 3])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", FutureWarning)
+        results = season.build_season_results(year, [1, 2, 3])
+
+    # Columns all-NA in some session are kept
+    assert {column for df in sessions.values() for column in df.columns} <= set(results.columns)
+    assert set(results["session"]) == {"race", "sprint", "qualifying"}
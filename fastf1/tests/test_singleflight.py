@@ -0,0 +1,70 @@
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def _run_concurrently(flights, key, fn, count=5):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flights.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_concurrent_callers_share_one_call():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(10)
+        return object()
+
+    threads, results, errors = _run_concurrently(flights, "key", compute)
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert not errors
+    assert len(results) == 5 and all(result is results[0] for result in results)
+
+
+def test_waiters_get_the_leaders_exception():
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(10)
+        raise ValueError("upstream failed")
+
+    threads, results, errors = _run_concurrently(flights, "key", fail)
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert not results
+    assert len(errors) == 5 and all(isinstance(e, ValueError) for e in errors)
+
+
+def test_nothing_is_cached_once_the_call_finished():
+    flights = SingleFlight()
+    calls = []
+
+    assert flights.do("key", lambda: calls.append(1) or len(calls)) == 1
+    assert flights.do("key", lambda: calls.append(1) or len(calls)) == 2
+    with pytest.raises(KeyError):
+        flights.do("key", lambda: {}["missing"])
@@ -0,0 +1,154 @@
+import threading
+import time
+from functools import wraps
+
+import pytest
+
+import store
+
+
+def _gated(fetch, barrier, in_flight):
+    """Wraps a session fetcher so it only proceeds once every fetcher is in flight."""
+
+    @wraps(fetch)
+    def wrapper(year, round_):
+        in_flight.append(fetch.__name__)
+        barrier.wait()
+        return fetch(year, round_)
+
+    return wrapper
+
+
+def test_fetches_the_sessions_of_a_round_concurrently(year, monkeypatch):
+    barrier = threading.Barrier(len(store.SESSION_FETCHERS), timeout=10)
+    in_flight = []
+    fetchers = {name: _gated(fetch, barrier, in_flight) for name, fetch in store.SESSION_FETCHERS.items()}
+    monkeypatch.setattr(store, "SESSION_FETCHERS", fetchers)
+
+    fetched, failed = store._fetch_rounds(year, [1])
+
+    assert not failed
+    assert sorted(in_flight) == sorted(fetch.__wrapped__.__name__ for fetch in fetchers.values())
+    # Round 1 is not a sprint weekend
+    assert {session: len(frames) for session, frames in fetched.items()} == {"race": 1, "sprint": 0, "qualifying": 1}
+    assert {int(df["round"].iloc[0]) for frames in fetched.values() for df in frames} == {1}
+
+
+def test_uses_season_queries_only_when_they_take_fewer_requests(year, monkeypatch):
+    used = []
+
+    def recorder(kind):
+        def fetch(*args):
+            used.append(kind)
+            raise ConnectionError("not recorded")
+
+        return fetch
+
+    monkeypatch.setattr(store, "SESSION_FETCHERS", dict.fromkeys(store.SESSION_FETCHERS, recorder("round")))
+    monkeypatch.setattr(store, "SEASON_FETCHERS", dict.fromkeys(store.SEASON_FETCHERS, recorder("season")))
+
+    # A cold season: one page per session type beats nine per-round requests
+    store._fetch_rounds(year, [1, 2, 3])
+    assert used == ["season"] * 3
+
+    # The last two of 24 rounds: 3 x 5 pages against 6 per-round requests
+    used.clear()
+    store._fetch_rounds(year, [23, 24])
+    assert used == ["round"] * 6
+
+
+def test_stores_fetched_rounds_and_serves_them_from_disk(year, stub_ergast, monkeypatch):
+    first = store.load_season_results(year, [1, 2, 3])
+    assert store.stored_rounds(year) == {1, 2, 3}
+    assert sorted(first["race"]["round"].astype(int).unique()) == [1, 2, 3]
+
+    def unreachable(*args, **kwargs):
+        raise AssertionError("stored rounds must not be fetched again")
+
+    monkeypatch.setattr(store, "SESSION_FETCHERS", dict.fromkeys(store.SESSION_FETCHERS, unreachable))
+    monkeypatch.setattr(store, "SEASON_FETCHERS", dict.fromkeys(store.SEASON_FETCHERS, unreachable))
+    calls = stub_ergast.calls
+
+    second = store.load_season_results(year, [1, 2, 3])
+
+    assert stub_ergast.calls == calls
+    assert len(second["race"]) == len(first["race"])
+    assert len(second["qualifying"]) == len(first["qualifying"])
+
+
+def test_keeps_a_round_with_a_failed_session_out_of_the_store(year, monkeypatch):
+    qualifying = store.SESSION_FETCHERS["qualifying"]
+    attempts = []
+
+    @wraps(qualifying)
+    def flaky(year, round_):
+        attempts.append(round_)
+        if len(attempts) == 1:
+            raise ConnectionError("Ergast is down")
+        return qualifying(year, round_)
+
+    monkeypatch.setitem(store.SESSION_FETCHERS, "qualifying", flaky)
+
+    with pytest.raises(RuntimeError, match=r"round\(s\) \[1\]"):
+        store.load_season_results(year, [1])
+    assert store.stored_rounds(year) == set()
+
+    results = store.load_season_results(year, [1])
+
+    assert attempts == [1, 1]
+    assert store.stored_rounds(year) == {1}
+    assert not results["qualifying"].empty
+
+
+def test_reload_replaces_amended_rounds_from_upstream(year, stub_ergast, monkeypatch):
+    store.load_season_results(year, [1, 2, 3])
+    version = store.store_version(year)
+    race = store.SESSION_FETCHERS["race"]
+
+    @wraps(race)
+    def penalized(year, round_):
+        response = race(year, round_)
+        response.content[0] = response.content[0].assign(status="Disqualified")
+        return response
+
+    monkeypatch.setitem(store.SESSION_FETCHERS, "race", penalized)
+    calls = stub_ergast.calls
+
+    assert store.reload_season_results(year, [1]) == {1}
+
+    # Every session of the round went to Ergast despite the cached responses
+    assert stub_ergast.calls == calls + len(store.SESSION_FETCHERS)
+    assert store.store_version(year) != version
+    results = store.load_season_results(year, [1, 2, 3])["race"]
+    assert sorted(results["round"].astype(int).unique()) == [1, 2, 3]
+    assert (results.loc[results["round"].astype(int) == 1, "status"] == "Disqualified").all()
+    assert not (results.loc[results["round"].astype(int) != 1, "status"] == "Disqualified").any()
+
+
+def test_coalesces_concurrent_loads_of_a_season(year, monkeypatch):
+    fetch_rounds = store._fetch_rounds
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch(year, rounds):
+        calls.append(rounds)
+        release.wait(10)
+        return fetch_rounds(year, rounds)
+
+    monkeypatch.setattr(store, "_fetch_rounds", slow_fetch)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(store.load_season_results(year, [1, 2, 3])))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [[1, 2, 3]]
+    assert len(results) == 5
+    assert all(result is results[0] for result in results)
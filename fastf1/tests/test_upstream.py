@@ -0,0 +1,126 @@
+import inspect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests_cache
+from requests_cache.session import CacheMixin
+
+import upstream
+
+
+class Origin:
+    """Local server counting requests, optionally holding or failing them."""
+
+    def __init__(self):
+        self.calls = 0
+        self.status = 200
+        self.release = threading.Event()
+        self.release.set()
+        origin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                origin.calls += 1
+                origin.release.wait(10)
+                body = f'{{"call": {origin.calls}}}'.encode()
+                self.send_response(origin.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/data.json"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+@pytest.fixture
+def origin():
+    server = Origin()
+    yield server
+    server.release.set()
+    server.server.shutdown()
+
+
+EXPIRE_AFTER = 1
+
+
+@pytest.fixture
+def session():
+    # Cached responses expire after a second and are then served stale while refreshed
+    return requests_cache.CachedSession(backend="memory", expire_after=EXPIRE_AFTER, stale_while_revalidate=60)
+
+
+def _expire():
+    time.sleep(EXPIRE_AFTER + 0.1)
+
+
+def _results(wrapper):
+    return upstream.stats().get(wrapper, {})
+
+
+def _wait_for_refreshes():
+    deadline = time.monotonic() + 10
+    while upstream._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not upstream._refreshing
+
+
+def test_requests_cache_internals_are_still_patched():
+    # Fails when a requests-cache upgrade renames or reshapes what install() replaces
+    assert CacheMixin.send.__wrapped__ is not None
+    assert CacheMixin._resend_async.__wrapped__ is not None
+    assert list(inspect.signature(CacheMixin._send_and_cache).parameters) == [
+        "self", "request", "actions", "cached_response", "kwargs",
+    ]
+    assert "force_refresh" in inspect.signature(CacheMixin.send.__wrapped__).parameters
+
+
+def test_serves_stale_while_one_refresh_runs(origin, session):
+    with upstream.attributed("test_serves_stale"):
+        assert session.get(origin.url).json() == {"call": 1}
+
+        # Hold the refresh so every following hit finds it in flight
+        _expire()
+        origin.release.clear()
+        stale = [session.get(origin.url) for _ in range(3)]
+        assert all(response.from_cache and response.json() == {"call": 1} for response in stale)
+        assert len(upstream._refreshing) == 1
+
+        origin.release.set()
+        _wait_for_refreshes()
+
+    assert origin.calls == 2
+    assert session.get(origin.url).json() == {"call": 2}
+    results = _results("test_serves_stale")
+    assert (results["miss"], results["hit"], results["stale"], results["stale_error"]) == (2, 0, 3, 0)
+
+
+def test_failed_refresh_is_served_as_an_upstream_error(origin, session):
+    with upstream.attributed("test_failed_refresh"):
+        session.get(origin.url)
+
+        _expire()
+        origin.status = 500
+        assert session.get(origin.url).from_cache
+        _wait_for_refreshes()
+        assert len(upstream._failing) == 1
+
+        # The key is still failing: the stale response is an upstream error now
+        assert session.get(origin.url).json() == {"call": 1}
+        _wait_for_refreshes()
+
+        # Still flagged until a refresh succeeds
+        origin.status = 200
+        session.get(origin.url)
+        _wait_for_refreshes()
+        assert not upstream._failing
+        assert session.get(origin.url).json() == {"call": 4}
+
+    results = _results("test_failed_refresh")
+    assert (results["stale"], results["stale_error"], results["error"], results["hit"]) == (1, 2, 2, 1)
@@ -0,0 +1,36 @@
+import season
+import store
+import warmer
+from backend import backend
+from cache import get_event_schedule_cached
+from materialize import SETTLE_WINDOW
+from season import session_events
+from warmer import settled_events
+
+
+def test_reloads_every_race_once_it_settled(year):
+    events = session_events(get_event_schedule_cached(year, include_testing=False))
+    races = [(start, round_) for start, round_, session in events if session == "Race"]
+
+    with_settled = settled_events(events)
+
+    assert [(start - SETTLE_WINDOW, round_) for start, round_, session in with_settled if session == "Settled"] == races
+    assert [event for event in with_settled if event[2] != "Settled"] == events
+    assert with_settled == sorted(with_settled)
+
+
+def test_settled_race_is_reloaded_and_season_payloads_rebuilt(year, monkeypatch):
+    from app import app
+
+    store.load_season_results(year, [1, 2, 3])
+    season.get_season_results(year, (1, 2, 3))
+    memoized = [key for key in backend._entries.keys() if key.startswith(season.SEASON_RESULTS_PREFIX)]
+    assert memoized
+    reloaded = []
+    reload = warmer.reload_season_results
+    monkeypatch.setattr(warmer, "reload_season_results", lambda year, rounds: reloaded.append(rounds) or reload(year, rounds))
+
+    assert warmer.CacheWarmer(app).warm(year, 1, "Settled")
+
+    assert reloaded == [[1]]
+    assert not set(memoized) & set(backend._entries.keys())